@@ -1,25 +1,61 @@
 from contextlib import asynccontextmanager
-from datetime import datetime
+from functools import partial
+from typing import Literal
 
 import numpy as np
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.params import Depends
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError
 from pydantic import BaseModel
 
-from data.functionalities.inflation_projection import InflationProjection
+from data.functionalities.finite_differences import career_sensitivities
 from data.functionalities.fun_facts import FunFacts
+from data.functionalities.fund_balance import fund_engine, fund_payload
+from data.functionalities.goal_solver import GoalSolver
+from data.functionalities.life_tables import compiled_life_tables
+from data.functionalities.macro_scenarios import macro_analyzer
+from data.functionalities.monte_carlo import MonteCarloEngine
 from data.functionalities.pension_calculator import PensionCalculator
-from data.functionalities.pension_delay import PensionDelayCalculator
-from data.functionalities.sick_leave_adjustment import SickLeaveAdjustment
+from data.functionalities.pension_delay import (
+    PensionDelayCalculator,
+    PensionDelayResult,
+)
+from data.functionalities.pension_profiles import PensionProfiles, default_profile_table
+from data.functionalities.pension_surrogate import PensionSurrogate, default_surrogate
+from data.functionalities.result_cache import ResultCache, SpeculativeScheduler
+from data.functionalities.scenario_grid import DELAYS, default_scenario_grid
+from data.functionalities.sensitivity import default_sensitivity
+from data.functionalities.simulation_pipeline import (
+    CareerBatch,
+    Prices,
+    default_pipeline,
+)
 from db import Base, engine, get_session
 from db.repositories.report import ReportRepository
 from schemas.auth import RefreshRequest, TokenPair
 from schemas.report import ReportCreate, ReportOut
-from schemas.simulations import RetirementCalcInput, RetirementCalcOutput, RetirementExpectations, RetirementPlan
+from schemas.simulations import (
+    FanChartOut,
+    MacroScenariosOutput,
+    MonteCarloInput,
+    MonteCarloOutput,
+    ProfileComparisonInput,
+    ProfileComparisonOutput,
+    ProfilePensionOut,
+    RetirementCalcInput,
+    RetirementCalcOutput,
+    RetirementExpectations,
+    RetirementPlan,
+    ScenarioLookup,
+    ScenarioQuery,
+    SensitivityBarOut,
+    SensitivityInput,
+    SensitivityOutput,
+)
 
 load_dotenv()  # załaduj zmienne środowiskowe z pliku .env (jeśli istnieje)
 
@@ -36,14 +72,35 @@ from auth import (
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+SPECULATIVE_AGE_OFFSETS = (1, -1, 2, -2, 5)
+SIMULATION_ROUTES = frozenset(
+    {
+        "/generate_retirement_plan",
+        "/calc_retirement_income",
+        "/scenario_lookup",
+        "/compare_to_profiles",
+        "/monte_carlo",
+        "/sensitivity",
+    }
+)
+plan_cache = ResultCache()
+speculator = SpeculativeScheduler(plan_cache)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    default_surrogate()  # load (or refit) the approximate-mode table before serving
+    default_scenario_grid()  # memory-map the precomputed scenario grid
+    compiled_life_tables()  # life tables workbook compiled to arrays once
+    default_profile_table()  # typical pensioners by variant, sex and retirement year
+    fund_payload()  # FUS tables and derived metrics
 
     yield
 
+    speculator.cancel_pending()
+
     await engine.dispose()
 
 
@@ -58,19 +115,88 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def count_simulation_load(request: Request, call_next):
+    """Count every simulation request in flight so speculative work yields to it."""
+    if request.url.path not in SIMULATION_ROUTES:
+        return await call_next(request)
+    with speculator.foreground():
+        return await call_next(request)
+
+
 @app.get("/")
 async def read_root():
     return {"Hello": "World"}
 
 
-@app.post("/generate_retirement_plan", response_model=RetirementPlan)
-async def retirement_plan(expectations: RetirementExpectations, db=Depends(get_session)):
-    expected_life_expectancy_years = 82 if expectations.sex == "f" else 78
-    years_to_collect = expected_life_expectancy_years - expectations.expected_retirement_age
-    months_to_collect = max(60, years_to_collect * 12)
+def compute_retirement_plan(
+    expectations: RetirementExpectations, prices: Prices = "nominal"
+) -> dict:
+    pipeline = default_pipeline()
+    retirement_time = (
+        pipeline.current_year - expectations.age + expectations.expected_retirement_age
+    )
+    months_to_collect = float(
+        pipeline.divisor_months(
+            expectations.sex, expectations.expected_retirement_age, retirement_time
+        )[0]
+    )
     total_funds = expectations.expected_retirement_income * months_to_collect
     funds_left_to_collect = max(0, total_funds - expectations.funds)
 
+    # accumulated funds already cover the past career, so contributions count from now on
+    start_year = pipeline.current_year if expectations.funds > 0 else expectations.start_year
+    career = CareerBatch.build(
+        age=expectations.age,
+        sex=expectations.sex,
+        salary=expectations.salary or 0.0,
+        start_year=start_year,
+        retirement_age=expectations.expected_retirement_age,
+        funds=expectations.funds,
+    )
+    solver = GoalSolver(pipeline, prices=prices)
+    target = expectations.expected_retirement_income
+    plan = {}
+    if expectations.salary:
+        plan["forecasted_pension"] = pipeline.run(career, prices=prices).pension[0]
+        plan["required_retirement_age"] = solver.required_retirement_age(career, target)[0]
+        plan["required_extra_contribution"] = solver.required_extra_contribution(career, target)[0]
+    else:
+        plan["required_salary"] = solver.required_salary(career, target)[0]
+    plan = {k: None if np.isnan(v) else round(float(v), 2) for k, v in plan.items()}
+    return {
+        "expected_total_funds": total_funds,
+        "funds_left_to_collect": funds_left_to_collect,
+        **plan,
+    }
+
+
+def schedule_neighbour_plans(expectations: RetirementExpectations, prices: Prices = "nominal"):
+    """Precompute the retirement ages users usually try next (+-1-2 years, next delay options)."""
+    for offset in SPECULATIVE_AGE_OFFSETS:
+        retirement_age = expectations.expected_retirement_age + offset
+        if not expectations.age <= retirement_age <= 120:
+            continue
+        neighbour = expectations.model_copy(update={"expected_retirement_age": retirement_age})
+        speculator.schedule(
+            cache_key(neighbour, prices), partial(compute_retirement_plan, neighbour, prices)
+        )
+
+
+def cache_key(model: BaseModel, *options) -> tuple:
+    return (type(model).__name__,) + tuple(sorted(model.model_dump().items())) + options
+
+
+@app.post("/generate_retirement_plan", response_model=RetirementPlan)
+async def retirement_plan(
+    expectations: RetirementExpectations, prices: Prices = "nominal", db=Depends(get_session)
+):
+    key = cache_key(expectations, prices)
+    plan = plan_cache.get(key)
+    if plan is None:
+        plan = await run_in_threadpool(compute_retirement_plan, expectations, prices)
+        plan_cache.put(key, plan)
+
     report_repo = ReportRepository(db)
 
     report_data = ReportCreate(
@@ -83,35 +209,71 @@ async def retirement_plan(expectations: RetirementExpectations, db=Depends(get_s
         expected_retirement_age=expectations.expected_retirement_age,
     )
     new_report = await report_repo.create(report_data)
-    return RetirementPlan(
-        expected_total_funds=total_funds,
-        funds_left_to_collect=funds_left_to_collect,
-    )
+    schedule_neighbour_plans(expectations, prices)
+    return RetirementPlan(**plan)
+
+
+@app.get("/cache_metrics")
+def cache_metrics():
+    """Result cache counters, including how often speculative entries get used."""
+    return {**plan_cache.metrics.as_dict(), "entries": len(plan_cache), "load": speculator.load}
 
 
 @app.post("/calc_retirement_income")
-async def calc_retirement_income(data: RetirementCalcInput, db=Depends(get_session)):
+async def calc_retirement_income(
+    data: RetirementCalcInput,
+    mode: Literal["exact", "approx"] = "exact",
+    sensitivities: bool = False,
+    prices: Prices = "nominal",
+    db=Depends(get_session),
+):
     salaries = [block.gross_income for block in data.work_blocks]
     weights = [block.years for block in data.work_blocks]
     weighted_avg = np.average(salaries, weights=weights)
-    total_capital = sum(block.gross_income * block.contribution_rate * block.years * 12 for block in data.work_blocks)
 
-    if data.sex == "f":
-        life_expectancy_years = 82
-        retirement_age = 60
-    else:
-        life_expectancy_years = 78
-        retirement_age = 65
-
-    months_to_live = max(60, life_expectancy_years - retirement_age) * 12
+    pipeline = default_pipeline()
+    retirement_age = 60 if data.sex == "f" else 65
+    year_of_retirement = pipeline.current_year + (retirement_age - data.age)
+    months_to_live = float(
+        pipeline.divisor_months(data.sex, retirement_age, year_of_retirement)[0]
+    )
 
-    year_of_retirement = datetime.now().year + (retirement_age - data.age)
-    total_capital = SickLeaveAdjustment().calculate(total_capital).adjusted_pension
+    # deflator of the retirement date: nominal PLN of the last working year -> `prices`
+    price_factor = float(pipeline.price_factor(2, year_of_retirement, prices))
+    rates = [block.contribution_rate for block in data.work_blocks]
+    error_bound = None
+    if mode == "approx" and not PensionSurrogate.covers(
+        pipeline, data.age, data.sex, weights, salaries, rates
+    ):
+        mode = "exact"  # several salaries, other rates or pre-1999 service: not in the table
+    if mode == "approx":
+        estimate = default_surrogate().predict(data.age, data.sex, weighted_avg, sum(weights))
+        healthy_capital = float(estimate.pension[0]) * months_to_live * price_factor
+        sick_capital = healthy_capital * float(estimate.sick_leave_factor[0])
+        error_bound = estimate.max_relative_error
+    else:
+        # the career without and with sick leave (absence curves on the contributions)
+        n = len(data.work_blocks)
+        person = np.repeat([0, 1], n)
+        blocks = pipeline.blocks_to_batch(
+            person=person,
+            age=data.age,
+            sex=data.sex,
+            years=np.tile(weights, 2),
+            salary=np.tile(salaries, 2),
+            contribution_rate=np.tile(rates, 2),
+            sick_leave=person,
+        )
+        grouped = pipeline.run_grouped(blocks, person, prices)
+        healthy_capital, sick_capital = grouped.capital.tolist()
 
+    total_capital = sick_capital if data.include_sick else healthy_capital
     actual_retirement_income = PensionCalculator.calculate_pension(months_to_live, total_capital)
 
     realistic_retirement_income = actual_retirement_income * 0.6
-    replacement_rate = (realistic_retirement_income / weighted_avg) * 100 if weighted_avg > 0 else 0
+    replacement_rate = (
+        (realistic_retirement_income / weighted_avg) * 100 if weighted_avg > 0 else 0
+    )
     report_repo = ReportRepository(db)
     report_data = ReportCreate(
         sim_type="PENSION_CALC",
@@ -121,28 +283,204 @@ async def calc_retirement_income(data: RetirementCalcInput, db=Depends(get_sessi
         actual_retirement_income=actual_retirement_income,
         salary=weighted_avg,
     )
-    sick_salary = SickLeaveAdjustment().calculate(actual_retirement_income).adjusted_pension
+    sick_salary = PensionCalculator.calculate_pension(months_to_live, sick_capital)
+    healthy_salary = PensionCalculator.calculate_pension(months_to_live, healthy_capital)
 
     new_report = await report_repo.create(report_data)
-    inflation_rate = InflationProjection().cumulative_inflation(start_year=datetime.now().year,end_year=year_of_retirement, variant=2 )
+    # price level of the last working year, the same index the real results are deflated by
+    inflation_rate = 1.0 / float(pipeline.price_factor(2, year_of_retirement, "real"))
+    delays = PensionDelayCalculator(pipeline).delay_grid(
+        base_capital=total_capital / price_factor,  # valorized further in nominal PLN
+        monthly_contribution=weighted_avg * 0.195,  # 19.5% składka emerytalna
+        sex=data.sex,
+        retirement_age=retirement_age,
+        retirement_time=year_of_retirement,
+        delays=[0, 1, 2, 5],
+        prices=prices,
+    )
     result = {
         "actual_pension": actual_retirement_income,
         "realistic_pension": realistic_retirement_income,
         "replacement_rate": replacement_rate,
-        "average_pension": 4045.20,
+        "average_pension": round(fund_engine().average_pension(pipeline.current_year), 2),
         "salary_with_sickness": sick_salary,
-        "salary_without_sickness": actual_retirement_income,
-        "pension_increase": PensionDelayCalculator.calculate_pension_delay(
-            base_capital=total_capital,
-            monthly_contribution=weighted_avg * 0.195,  # 19.5% składka emerytalna
-            life_expectancy_months=months_to_live,
-        ),
+        "salary_without_sickness": healthy_salary,
+        "pension_increase": PensionDelayResult(pensions=delays.as_dict()),
         "inflation_rate": inflation_rate,
+        "mode": mode,
+        "error_bound": error_bound,
+        "prices": prices,
     }
+    if sensitivities:
+        # d(actual_pension) / d(input), sick leave included when requested
+        derivatives = career_sensitivities(
+            pipeline,
+            age=data.age,
+            sex=data.sex,
+            years=weights,
+            salary=salaries,
+            contribution_rate=rates,
+            retirement_age=retirement_age,
+            sick_leave=float(data.include_sick),
+        )
+        result["sensitivities"] = derivatives.as_dict(price_factor)
 
     return result
 
 
+@app.post("/scenario_lookup", response_model=ScenarioLookup)
+def scenario_lookup(query: ScenarioQuery, prices: Prices = "nominal"):
+    """Precomputed outcome for a standard career (constant salary from age 25)."""
+    pipeline = default_pipeline()
+    found = default_scenario_grid().lookup(
+        query.age, query.sex, query.salary, query.retirement_age, query.variant
+    )
+    retirement_time = pipeline.current_year - query.age + query.retirement_age
+    pensions = np.array(
+        [found["pension"].item()] + [found[f"pension_delay_{d}"].item() for d in DELAYS]
+    )
+    pensions *= pipeline.price_factor(
+        query.variant, retirement_time, prices, years_after=(0, *DELAYS)
+    )
+    return ScenarioLookup(
+        pension=round(pensions[0], 2),
+        replacement_rate=round(found["replacement_rate"].item(), 2),
+        pension_delays={d: round(p, 2) for d, p in zip(DELAYS, pensions[1:])},
+        interpolated=not found["on_grid"].item(),
+    )
+
+
+@app.post("/compare_to_profiles", response_model=ProfileComparisonOutput)
+def compare_to_profiles(data: ProfileComparisonInput, prices: Prices = "nominal"):
+    """
+    How the user's pension (given in `prices`) compares to typical pensioners retiring
+    the same year.
+    """
+    table = default_profile_table()
+    registry = PensionProfiles()
+    year = table.clip_year(data.retirement_year)
+    column = 1 if prices == "real" else 0
+    pensions = sorted(
+        table.pensions(data.variant, data.sex, year).items(), key=lambda item: item[1][0]
+    )
+    return ProfileComparisonOutput(
+        retirement_year=year,
+        profiles=[
+            ProfilePensionOut(
+                key=key,
+                description=registry.get_profile(key).description,
+                pension=round(values[column], 2),
+                pension_real=round(values[1], 2),
+                user_ratio=round(data.pension / values[column] * 100, 2),
+            )
+            for key, values in pensions
+        ],
+        above=[key for key, values in pensions if data.pension > values[column]],
+    )
+
+
+@app.get("/fund_balance")
+def fund_balance(request: Request, response: Response):
+    """FUS revenues, expenditure, balance and derived metrics per variant; ETag = data version."""
+    payload = fund_payload()
+    etag = '"{}"'.format(payload["version"])
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return payload
+
+
+@app.get("/macro_scenarios", response_model=MacroScenariosOutput)
+def macro_scenarios(
+    indicator: list[str] | None = Query(None),
+    first_year: int | None = None,
+    last_year: int | None = None,
+):
+    """Yearly macro indicators of the three variants with min / max / mean / spread across them."""
+    try:
+        return macro_analyzer().summary(indicator, first_year, last_year)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@app.post("/monte_carlo", response_model=MonteCarloOutput)
+def monte_carlo(data: MonteCarloInput, prices: Prices = "nominal"):
+    """Percentile bands of the pension over sampled macro paths around the variants."""
+    pipeline = default_pipeline()
+    career = CareerBatch.build(
+        age=data.age,
+        sex=data.sex,
+        salary=data.salary,
+        start_year=data.start_year,
+        retirement_age=data.retirement_age,
+        variant=data.variant or 2,
+        funds=data.funds,
+    )
+    if pipeline.retirement_time(career)[0] <= pipeline.current_year:
+        raise HTTPException(
+            status_code=422, detail="Wiek emerytalny musi być wyższy niż obecny wiek"
+        )
+    weights = None if data.variant else (1 / 3, 1 / 3, 1 / 3)
+    engine = MonteCarloEngine(pipeline, sampling=data.sampling, prices=prices)
+    deterministic_pension = round(float(pipeline.run(career, prices=prices).pension[0]), 2)
+    if not data.fan_chart:
+        result = engine.simulate(career, data.paths, data.seed, weights)
+        return MonteCarloOutput(
+            paths=len(result),
+            percentiles=result.percentiles(),
+            deterministic_pension=deterministic_pension,
+        )
+
+    fan = engine.simulate_fan(career, data.paths, data.seed, weights)
+    return MonteCarloOutput(
+        paths=fan.paths,
+        percentiles=fan.outcomes,
+        deterministic_pension=deterministic_pension,
+        fan_chart=FanChartOut(
+            years=fan.years.tolist(),
+            balance={p: np.round(v, 2).tolist() for p, v in fan.balance.items()},
+            balance_real={p: np.round(v, 2).tolist() for p, v in fan.balance_real.items()},
+            chunk_size=fan.chunk_size,
+            peak_memory_bytes=fan.peak_bytes,
+        ),
+    )
+
+
+@app.post("/sensitivity", response_model=SensitivityOutput)
+def sensitivity(data: SensitivityInput, prices: Prices = "nominal"):
+    """Tornado chart: the pension under +-1pp changes of the macro parameters (mortality +-5%)."""
+    pipeline = default_pipeline()
+    career = CareerBatch.build(
+        age=data.age,
+        sex=data.sex,
+        salary=data.salary,
+        start_year=data.start_year,
+        retirement_age=data.retirement_age,
+        variant=data.variant,
+        funds=data.funds,
+    )
+    if pipeline.retirement_time(career)[0] <= pipeline.current_year:
+        raise HTTPException(
+            status_code=422, detail="Wiek emerytalny musi być wyższy niż obecny wiek"
+        )
+    tornado = default_sensitivity().tornado(career, prices)
+    return SensitivityOutput(
+        pension=round(tornado.pension, 2),
+        pension_real=round(tornado.pension_real, 2),
+        retirement_year=tornado.retirement_year,
+        bars=[
+            SensitivityBarOut(
+                parameter=bar.parameter,
+                change=bar.change,
+                pension={k: round(v, 2) for k, v in bar.pension.items()},
+                pension_real={k: round(v, 2) for k, v in bar.pension_real.items()},
+                fund_balance_bn=bar.fund_balance_bn,
+            )
+            for bar in tornado.bars
+        ],
+    )
+
+
 @app.get("/reports", response_model=list[ReportOut])
 async def get_reports(db=Depends(get_session)):
     report_repo = ReportRepository(db)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+
+from data.functionalities.life_tables import (
+    EXCEL_PATH,
+    LifeTables,
+    compiled_life_tables,
+)
+
+# Annuity divisor ("średnie dalsze trwanie życia") by retirement year, age in months and sex.
+#
+# Like ZUS, the divisor is the remaining life expectancy in months from the life table of
+# the retirement year; ages between whole years are interpolated linearly in months. The
+# observed 1990-2022 tables are extended with `LifeTables.project`, so retirements up to
+# `life_tables.PROJECTION_LAST_YEAR` have their own table; earlier / later years use the
+# first / last one.
+
+
+class DivisorTable:
+    """Dense [retirement year, age in months, sex] table of divisors (months)."""
+
+    def __init__(self, years: np.ndarray, divisor: np.ndarray):
+        self.years = years
+        self.divisor = divisor
+
+    @classmethod
+    def from_life_tables(cls, tables: LifeTables) -> DivisorTable:
+        months = np.arange((len(tables.ages) - 1) * 12 + 1)
+        age, month = np.divmod(months, 12)
+        upper = np.minimum(age + 1, len(tables.ages) - 1)
+        weight = (month / 12)[None, :, None]
+        ex = tables.ex[:, age] * (1 - weight) + tables.ex[:, upper] * weight
+        return cls(tables.years, 12 * ex)
+
+    def months(self, sex, age, year) -> np.ndarray:
+        """Divisor for arrays of sex codes, ages (years, counted in whole months) and years."""
+        year = np.clip(np.floor(np.asarray(year)), self.years[0], self.years[-1])
+        month = np.floor(np.round(np.asarray(age, dtype=float) * 12, 6))
+        month = np.clip(month, 0, self.divisor.shape[1] - 1)
+        return self.divisor[
+            (year - self.years[0]).astype(np.intp), month.astype(np.intp), np.asarray(sex)
+        ]
+
+
+@lru_cache(maxsize=4)
+def projected_divisors(excel_path: str = EXCEL_PATH) -> DivisorTable:
+    return DivisorTable.from_life_tables(compiled_life_tables(excel_path).project())
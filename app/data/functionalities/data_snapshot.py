@@ -0,0 +1,29 @@
+import hashlib
+import os
+from functools import lru_cache
+
+from data.functionalities.valorization_engine import DATA_DIR
+
+
+@lru_cache(maxsize=16)
+def _snapshot(data_dir: str, stamp: tuple) -> str:
+    digest = hashlib.sha1()
+    for name, _, _ in stamp:
+        digest.update(name.encode())
+        with open(os.path.join(data_dir, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def data_snapshot(data_dir: str = DATA_DIR) -> str:
+    """
+    Short content hash of all input tables in `data_dir`.
+    Precomputed artifacts and caches are keyed by it, so they are rebuilt when the data
+    changes. Files are only re-hashed when their size or mtime changes.
+    """
+    stamp = tuple(
+        (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+        for entry in sorted(os.scandir(data_dir), key=lambda e: e.name)
+        if entry.is_file()
+    )
+    return _snapshot(data_dir, stamp)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from data.functionalities.data_snapshot import data_snapshot
+from data.functionalities.valorization_engine import DATA_DIR
+
+# Ministry of Finance population projections (2019 and 2022 vintages) on one schema.
+#
+# The two files name their columns differently and only have milestone years (2022, 2025,
+# 2030, 2040, ...). Both are mapped onto GROUPS (thousands of people), interpolated
+# linearly onto one yearly grid and stacked into a [vintage, year, group] array. Shares,
+# dependency ratios and the revision between vintages (latest - earlier) are computed
+# once from it; every lookup by year is a single index. `demography` keeps one
+# projection per data snapshot.
+
+GROUPS = ("total", "pre_working", "working", "post_working")  # thousands
+VINTAGES = {
+    2019: (
+        "prognoza_demograficzna_MF_2019.csv",
+        ("populacja_ogolna", "przedprodukcyjny", "produkcyjny", "poprodukcyjny"),
+    ),
+    2022: (
+        "prognoza_demograficzna_MF_2022.csv",
+        (
+            "populacja_ogolna_tys",
+            "wiek_przedprodukcyjny_tys",
+            "wiek_produkcyjny_tys",
+            "wiek_poprodukcyjny_tys",
+        ),
+    ),
+}
+RATIOS = ("old_age_dependency", "total_dependency")
+
+
+@dataclass
+class DemographicProjection:
+    vintages: tuple
+    years: np.ndarray
+    values: np.ndarray  # [vintage, year, group]
+
+    @classmethod
+    def load(cls, data_dir: str = DATA_DIR) -> DemographicProjection:
+        frames = {
+            vintage: pd.read_csv(f"{data_dir}/{file}")[["rok", *columns]]
+            for vintage, (file, columns) in VINTAGES.items()
+        }
+        first = min(int(df["rok"].min()) for df in frames.values())
+        last = max(int(df["rok"].max()) for df in frames.values())
+        years = np.arange(first, last + 1)
+        values = np.empty((len(frames), len(years), len(GROUPS)))
+        for v, df in enumerate(frames.values()):
+            rok = df["rok"].to_numpy()
+            for g, column in enumerate(df.columns[1:]):
+                values[v, :, g] = np.interp(years, rok, df[column].to_numpy(float))
+        return cls(tuple(frames), years, values)
+
+    def __post_init__(self):
+        total, pre, working, post = np.moveaxis(self.values, -1, 0)
+        self.shares = self.values / total[..., None]
+        self.ratios = np.stack([post / working, (pre + post) / working], axis=-1)
+        # revision of the latest vintage against the earliest one, [year, group / ratio]
+        self.value_deltas = self.values[-1] - self.values[0]
+        self.ratio_deltas = self.ratios[-1] - self.ratios[0]
+
+    def _pos(self, year):
+        pos = np.clip(np.asarray(year) - self.years[0], 0, len(self.years) - 1)
+        return pos.astype(np.intp)
+
+    def _vintage(self, vintage) -> int:
+        if vintage is None:
+            return len(self.vintages) - 1
+        if vintage not in self.vintages:
+            raise ValueError(f"Unknown projection vintage: {vintage}")
+        return self.vintages.index(vintage)
+
+    def population(self, group: str, year, vintage=None) -> np.ndarray:
+        """Thousands of people in `group` (latest vintage by default); years are clamped."""
+        return self.values[self._vintage(vintage), self._pos(year), GROUPS.index(group)]
+
+    def ratio(self, name: str, year, vintage=None) -> np.ndarray:
+        """old_age_dependency = post-working / working age, total_dependency adds pre-working."""
+        return self.ratios[self._vintage(vintage), self._pos(year), RATIOS.index(name)]
+
+    def revision(self, name: str, year) -> np.ndarray:
+        """Latest minus earliest vintage for a group or a ratio."""
+        if name in RATIOS:
+            return self.ratio_deltas[self._pos(year), RATIOS.index(name)]
+        return self.value_deltas[self._pos(year), GROUPS.index(name)]
+
+
+@lru_cache(maxsize=4)
+def _projection(data_dir: str, snapshot: str) -> DemographicProjection:
+    return DemographicProjection.load(data_dir)
+
+
+def demography(data_dir: str = DATA_DIR) -> DemographicProjection:
+    """Projection over the shipped CSVs; rebuilt only when the data snapshot changes."""
+    return _projection(data_dir, data_snapshot(data_dir))
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from data.functionalities.simulation_pipeline import (
+    CONTRIBUTION_RATE,
+    CareerBatch,
+    SimulationPipeline,
+)
+
+# Per-person sensitivities of the pension to its inputs, by forward differences.
+#
+# The base career (a list of work blocks) and one bumped copy per input are stacked as
+# separate persons of a single batch and evaluated with one `run_grouped` call, so the
+# cost grows with the width of the arrays, not with the number of pipeline calls.
+#
+# Units of the derivatives (PLN of monthly pension per ...):
+#   salary             - 1 PLN more monthly income in every block,
+#   block_income[b]    - 1 PLN more monthly income in block b,
+#   contribution_rate  - 1 percentage point higher rate in every block,
+#   retirement_age     - 1 year later retirement; the last block is extended, i.e. the
+#                        person keeps working until the new retirement date.
+# The pension is linear in incomes and rates, so those steps are exact. Retirement age is
+# bumped by a whole year: valorization is credited in whole years, so a one-month step
+# would mostly measure the jump at the year boundary.
+
+SALARY_STEP = 1.0  # PLN
+CONTRIBUTION_RATE_STEP = 1e-4
+RETIREMENT_AGE_STEP = 1.0
+
+
+@dataclass
+class CareerSensitivities:
+    pension: float  # base monthly pension (PLN, nominal)
+    salary: float
+    retirement_age: float
+    contribution_rate: float
+    block_income: np.ndarray  # one derivative per work block
+
+    def as_dict(self, scale: float = 1.0) -> Dict[str, object]:
+        """Rounded derivatives; `scale` applies a proportional adjustment of the pension."""
+        return {
+            "salary": round(self.salary * scale, 4),
+            "retirement_age": round(self.retirement_age * scale, 2),
+            "contribution_rate": round(self.contribution_rate * scale, 2),
+            "block_income": [round(float(d) * scale, 4) for d in self.block_income],
+        }
+
+
+def career_sensitivities(
+    pipeline: SimulationPipeline,
+    age: float,
+    sex,
+    years,
+    salary,
+    contribution_rate=CONTRIBUTION_RATE,
+    retirement_age: Optional[float] = None,
+    variant: int = 2,
+    sick_leave: float = 0.0,
+) -> CareerSensitivities:
+    """Base pension and its derivatives for one career given as consecutive work blocks."""
+    years = np.atleast_1d(np.asarray(years, dtype=float))
+    blocks = len(years)
+    base = CareerBatch.build(age, sex, 0.0, 0.0, retirement_age, variant)
+    retirement = base.retirement_age[0]
+
+    # scenarios: base, salary, contribution rate, retirement age, one per block income
+    scenarios = 4 + blocks
+    salaries = np.tile(np.broadcast_to(np.asarray(salary, dtype=float), blocks), (scenarios, 1))
+    rates = np.tile(
+        np.broadcast_to(np.asarray(contribution_rate, dtype=float), blocks), (scenarios, 1)
+    )
+    durations = np.tile(years, (scenarios, 1))
+    retirement_ages = np.full(scenarios, retirement)
+
+    salaries[1] += SALARY_STEP
+    rates[2] += CONTRIBUTION_RATE_STEP
+    retirement_ages[3] += RETIREMENT_AGE_STEP
+    durations[3, -1] += RETIREMENT_AGE_STEP
+    salaries[4 + np.arange(blocks), np.arange(blocks)] += SALARY_STEP
+
+    person = np.repeat(np.arange(scenarios), blocks)
+    batch = pipeline.blocks_to_batch(
+        person=person,
+        age=age,
+        sex=base.sex[0],
+        years=durations.ravel(),
+        salary=salaries.ravel(),
+        contribution_rate=rates.ravel(),
+        retirement_age=np.repeat(retirement_ages, blocks),
+        variant=variant,
+        sick_leave=sick_leave,
+    )
+    pension = pipeline.run_grouped(batch, person).pension
+    change = pension[1:] - pension[0]
+    return CareerSensitivities(
+        pension=float(pension[0]),
+        salary=float(change[0] / SALARY_STEP),
+        contribution_rate=float(change[1] / CONTRIBUTION_RATE_STEP / 100),
+        retirement_age=float(change[2] / RETIREMENT_AGE_STEP),
+        block_income=change[3:] / SALARY_STEP,
+    )
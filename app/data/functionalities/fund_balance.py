@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from data.functionalities.data_snapshot import data_snapshot
+from data.functionalities.demography import DemographicProjection, demography
+from data.functionalities.valorization_engine import DATA_DIR
+
+# FUS (Fundusz Ubezpieczeń Społecznych) projection tables as aligned yearly arrays.
+#
+# Every table has the layout rok, wariant_1, wariant_2, wariant_3 with the usual gaps
+# (2032 -> 2035 -> ...). They are interpolated linearly onto one yearly grid and stacked
+# into a [table, variant, year] array; derived metrics are elementwise arithmetic on it:
+#   average_pension      - expenditure / pensioners / 12 (PLN a month),
+#   revenue_per_insured  - contribution revenues / insured / 12 (PLN a month),
+#   coverage_ratio       - revenues / expenditure,
+#   deficit_ratio        - -balance / expenditure (share of spending not covered),
+#   insured_share        - insured / working-age population (latest MF projection).
+# Expenditure covers all benefits paid by the fund, so the average pension is the fund's
+# spending per pensioner, not the ZUS average old-age pension.
+#
+# `fund_payload` is cached per data snapshot and carries a version string (snapshot +
+# FUND_ENGINE_VERSION), which the API returns as an ETag.
+
+FUND_ENGINE_VERSION = 2  # bump when the tables or metrics change
+VARIANTS = (1, 2, 3)
+TABLES = {
+    "revenues": "wplywy_skladkowe_mln_zl.csv",
+    "expenditure": "wydatki_funduszu_mln_zl.csv",
+    "balance": "saldo_roczne_mln_zl.csv",
+    "revenues_discounted": "wplywy_zdyskontowane_2021_mln_zl.csv",
+    "expenditure_discounted": "wydatki_zdyskontowane_2021_mln_zl.csv",
+    "balance_discounted": "saldo_zdyskontowane_2021_mln_zl.csv",
+    "revenues_pct_gdp": "wplywy_proc_PKB.csv",
+    "expenditure_pct_gdp": "wydatki_proc_PKB.csv",
+    "balance_pct_gdp": "saldo_proc_PKB.csv",
+    "revenues_pct_base": "wplywy_proc_podstaw_skladek.csv",
+    "expenditure_pct_base": "wydatki_proc_podstaw_skladek.csv",
+    "balance_pct_base": "saldo_proc_podstaw_skladek.csv",
+    "pensioners": "liczba_emerytow_tys.csv",
+    "insured": "liczba_ubezpieczonych_tys.csv",
+    "dependency_ratio": "wspolczynnik_obciazenia.csv",
+}
+METRICS = (
+    "average_pension",
+    "revenue_per_insured",
+    "coverage_ratio",
+    "deficit_ratio",
+    "insured_share",
+)
+MLN_PER_THOUSAND = 1_000  # (mln PLN) / (thousand people) -> PLN per person
+
+
+@dataclass
+class FundTables:
+    years: np.ndarray
+    names: tuple
+    values: np.ndarray  # [table, variant, year]
+
+    @classmethod
+    def load(cls, data_dir: str = DATA_DIR) -> FundTables:
+        frames = {name: pd.read_csv(f"{data_dir}/{file}") for name, file in TABLES.items()}
+        first = min(int(df["rok"].min()) for df in frames.values())
+        last = max(int(df["rok"].max()) for df in frames.values())
+        years = np.arange(first, last + 1)
+        values = np.empty((len(frames), len(VARIANTS), len(years)))
+        for t, df in enumerate(frames.values()):
+            rok = df["rok"].to_numpy()
+            for v in VARIANTS:
+                values[t, v - 1] = np.interp(years, rok, df[f"wariant_{v}"].to_numpy(float))
+        return cls(years, tuple(frames), values)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """[variant, year] array of one table."""
+        return self.values[self.names.index(name)]
+
+
+class FundBalanceEngine:
+    """Fund tables and the metrics derived from them, all [variant, year]."""
+
+    def __init__(self, tables: FundTables, demography: Optional[DemographicProjection] = None):
+        self.tables = tables
+        self.years = tables.years
+        monthly = MLN_PER_THOUSAND / 12
+        self.metrics = {
+            "average_pension": tables["expenditure"] / tables["pensioners"] * monthly,
+            "revenue_per_insured": tables["revenues"] / tables["insured"] * monthly,
+            "coverage_ratio": tables["revenues"] / tables["expenditure"],
+            "deficit_ratio": -tables["balance"] / tables["expenditure"],
+        }
+        if demography is not None:
+            working = demography.population("working", self.years)
+            self.metrics["insured_share"] = tables["insured"] / working
+
+    def metric(self, name: str, variant: int = 2, year=None) -> np.ndarray:
+        """Metric for a variant, at `year` (clamped to the tables) or for all years."""
+        if name not in self.metrics:
+            raise ValueError(f"Unknown fund metric: {name}")
+        series = self.metrics[name][variant - 1]
+        if year is None:
+            return series
+        pos = np.clip(np.asarray(year) - self.years[0], 0, len(self.years) - 1)
+        return series[pos.astype(np.intp)]
+
+    def average_pension(self, year: int, variant: int = 2) -> float:
+        return float(self.metric("average_pension", variant, year))
+
+    def payload(self, version: str) -> Dict[str, object]:
+        """JSON-ready tables and metrics per variant, tagged with `version`."""
+        series = {**dict(zip(self.tables.names, self.tables.values)), **self.metrics}
+        return {
+            "version": version,
+            "years": self.years.tolist(),
+            "variants": {
+                v: {name: np.round(values[v - 1], 4).tolist() for name, values in series.items()}
+                for v in VARIANTS
+            },
+        }
+
+
+@lru_cache(maxsize=4)
+def _engine(data_dir: str, snapshot: str) -> FundBalanceEngine:
+    return FundBalanceEngine(FundTables.load(data_dir), demography(data_dir))
+
+
+@lru_cache(maxsize=4)
+def _payload(data_dir: str, snapshot: str) -> Dict[str, object]:
+    return _engine(data_dir, snapshot).payload(f"{snapshot}-v{FUND_ENGINE_VERSION}")
+
+
+def fund_engine(data_dir: str = DATA_DIR) -> FundBalanceEngine:
+    """Engine over the shipped tables; rebuilt only when the data snapshot changes."""
+    return _engine(data_dir, data_snapshot(data_dir))
+
+
+def fund_payload(data_dir: str = DATA_DIR) -> Dict[str, object]:
+    """Dashboard payload, built once per data snapshot."""
+    return _payload(data_dir, data_snapshot(data_dir))
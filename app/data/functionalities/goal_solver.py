@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from data.functionalities.simulation_pipeline import (
+    FEMALE,
+    MALE,
+    RETIREMENT_AGE,
+    CareerBatch,
+    Prices,
+    SimulationPipeline,
+)
+
+MAX_RETIREMENT_AGE = 75
+
+
+class GoalSolver:
+    """
+    Finds the input needed to reach a target monthly pension with the real simulation
+    pipeline (retirement age, extra monthly contribution or salary level).
+
+    Vectorized k-section search: every round evaluates a whole grid of `grid_size`
+    candidates per person in one pipeline call and keeps the bracket where the pension
+    crosses the target. Each round shrinks the bracket (grid_size - 1) times, so a
+    15-year age range is solved to a month in two batched evaluations.
+    The pension must be non-decreasing in the solved input. Targets are in `prices`
+    (nominal PLN of the retirement year, or current-year prices).
+    """
+
+    def __init__(
+        self,
+        pipeline: SimulationPipeline,
+        grid_size: int = 16,
+        max_rounds: int = 6,
+        prices: Prices = "nominal",
+    ):
+        if grid_size < 3:
+            raise ValueError("grid_size must be at least 3")
+        self.pipeline = pipeline
+        self.grid_size = grid_size
+        self.max_rounds = max_rounds
+        self.prices = prices
+        self.evaluations = 0  # batched pipeline calls made by the last solve
+
+    def _pension(self, batch: CareerBatch, column: str, candidates: np.ndarray) -> np.ndarray:
+        """Pension for each person (rows) and candidate value (columns) in one call."""
+        n, k = candidates.shape
+        stacked = batch.repeat(k).with_values(**{column: candidates.ravel()})
+        self.evaluations += 1
+        return self.pipeline.run(stacked, prices=self.prices).pension.reshape(n, k)
+
+    def solve(
+        self,
+        batch: CareerBatch,
+        target,
+        column: str,
+        lower,
+        upper,
+        tolerance: float,
+        expand_upper: bool = False,
+        max_expansions: int = 8,
+    ) -> np.ndarray:
+        """
+        Smallest value of `column` in [lower, upper] giving pension >= target, per person.
+        Returns NaN where the target is out of reach. With `expand_upper` the upper bound
+        is multiplied by 4 (batched, for unresolved rows only) until it brackets the target.
+        """
+        n = len(batch)
+        self.evaluations = 0
+        target = np.broadcast_to(np.asarray(target, dtype=float), (n,))
+        lo = np.broadcast_to(np.asarray(lower, dtype=float), (n,)).copy()
+        hi = np.maximum(np.broadcast_to(np.asarray(upper, dtype=float), (n,)), lo)
+
+        if expand_upper:
+            for _ in range(max_expansions):
+                short = self._pension(batch, column, hi[:, None])[:, 0] < target
+                if not short.any():
+                    break
+                lo = np.where(short, hi, lo)
+                hi = np.where(short, hi * 4, hi)
+
+        rows = np.arange(n)
+        steps = np.linspace(0.0, 1.0, self.grid_size)
+        reachable = np.ones(n, dtype=bool)
+        for round_no in range(self.max_rounds):
+            candidates = lo[:, None] + (hi - lo)[:, None] * steps[None, :]
+            reached = self._pension(batch, column, candidates) >= target[:, None]
+            if round_no == 0:
+                reachable = reached[:, -1]
+
+            # new bracket: last candidate below the target .. first candidate reaching it
+            first = np.argmax(reached, axis=1)
+            new_hi = candidates[rows, first]
+            new_lo = np.where(first > 0, candidates[rows, np.maximum(first - 1, 0)], new_hi)
+            lo = np.where(reachable, new_lo, lo)
+            hi = np.where(reachable, new_hi, hi)
+
+            if np.all((hi - lo <= tolerance) | ~reachable):
+                break
+
+        return np.where(reachable, hi, np.nan)
+
+    def required_retirement_age(
+        self, batch: CareerBatch, target, max_age: float = MAX_RETIREMENT_AGE
+    ) -> np.ndarray:
+        """Earliest retirement age (years, month precision) with pension >= target."""
+        statutory = np.where(batch.sex == FEMALE, RETIREMENT_AGE[FEMALE], RETIREMENT_AGE[MALE])
+        lower = np.maximum(batch.age, statutory)
+        return self.solve(batch, target, "retirement_age", lower, max_age, tolerance=1 / 12)
+
+    def required_extra_contribution(
+        self, batch: CareerBatch, target, upper: Optional[float] = None
+    ) -> np.ndarray:
+        """Extra monthly contribution (PLN, current prices) needed on top of the salary."""
+        upper = np.asarray(target, dtype=float) if upper is None else upper
+        return self.solve(
+            batch, target, "extra_contribution", 0.0, upper, tolerance=1.0, expand_upper=True
+        )
+
+    def required_salary(
+        self, batch: CareerBatch, target, upper: Optional[float] = None
+    ) -> np.ndarray:
+        """Monthly gross salary (PLN, current prices) needed to reach the target."""
+        upper = np.asarray(target, dtype=float) if upper is None else upper
+        return self.solve(batch, target, "salary", 0.0, upper, tolerance=1.0, expand_upper=True)
@@ -0,0 +1,52 @@
+from itertools import product
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+def locate(axis: np.ndarray, points) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Left grid index and interpolation weight of each point on a sorted axis.
+    Points outside the axis are clamped to its ends (no extrapolation).
+    """
+    points = np.clip(np.asarray(points, dtype=float), axis[0], axis[-1])
+    if len(axis) == 1:
+        return np.zeros(points.shape, dtype=np.intp), np.zeros(points.shape)
+    left = np.clip(np.searchsorted(axis, points, side="right") - 1, 0, len(axis) - 2)
+    weight = (points - axis[left]) / (axis[left + 1] - axis[left])
+    return left, weight
+
+
+def multilinear(
+    values: np.ndarray,
+    axes: Sequence[np.ndarray],
+    points: Sequence,
+    prefix: Tuple = (),
+) -> np.ndarray:
+    """
+    Multilinear interpolation on a regular (not necessarily uniform) grid.
+
+    `values` has shape (*discrete, *[len(a) for a in axes], *outputs); `prefix` holds integer
+    indices into the leading discrete dimensions (e.g. variant, sex), `points` the coordinates
+    on the continuous axes. Trailing output dimensions are interpolated together. Everything
+    is broadcast and all 2**len(axes) corners are fetched in a single gather.
+    """
+    located = [locate(np.asarray(axis, dtype=float), p) for axis, p in zip(axes, points)]
+    lefts = np.broadcast_arrays(*prefix, *(left for left, _ in located))
+    weights = np.broadcast_arrays(*(w for _, w in located))
+    shape = lefts[0].shape
+
+    corners = np.array(list(product((0, 1), repeat=len(axes))), dtype=np.intp)  # [2**d, d]
+    index = [np.asarray(p, dtype=np.intp)[..., None] for p in lefts[: len(prefix)]]
+    for k, axis in enumerate(axes):
+        index.append(np.minimum(lefts[len(prefix) + k][..., None] + corners[:, k], len(axis) - 1))
+    grid_dims = len(prefix) + len(axes)
+    outputs = values.shape[grid_dims:]
+    flat = np.ravel_multi_index(tuple(index), values.shape[:grid_dims])
+
+    weight = np.ones(shape + (len(corners),))
+    for k, w in enumerate(weights):
+        weight *= np.where(corners[:, k], w[..., None], 1.0 - w[..., None])
+    corner_values = values.reshape((-1,) + outputs)[flat]
+    weight = weight.reshape(weight.shape + (1,) * len(outputs))
+    return (corner_values * weight).sum(axis=len(shape))
@@ -1,16 +1,37 @@
+from functools import lru_cache
+from typing import Dict, Literal, Optional, Tuple
+
+import numpy as np
 import pandas as pd
-from typing import Literal
+
+from data.functionalities.valorization_engine import (
+    DataPaths,
+    _interpolate_yearly_factors,
+)
 
 Variant = Literal[1, 2, 3]
 
+# Skumulowana inflacja z iloczynów prefiksowych.
+#
+# Prognoza makro ma luki (2030, 2035, 2040, ...). Wskaźniki inflacji są raz na wariant
+# interpolowane liniowo na siatkę roczną (jak w valorization_engine) i zapisywane jako
+# iloczyny prefiksowe P[i] = f(first) * ... * f(first + i - 1), P[0] = 1. Mnożnik dla lat
+# start..end (włącznie) to wtedy jedno dzielenie: P[end - first + 1] / P[start - first].
+# Zakres wychodzący poza dane jest przycinany do lat z prognozy.
+
+
 class InflationProjection:
-    def __init__(self):
-        self.macro_paths = {
-            1: "data/dane_emerytalne/parametry_makroekonomiczne_wariant_1.csv",
-            2: "data/dane_emerytalne/parametry_makroekonomiczne_wariant_2.csv",
-            3: "data/dane_emerytalne/parametry_makroekonomiczne_wariant_3.csv"
-        }
+    def __init__(self, macro_paths: Optional[Dict[int, str]] = None):
+        if macro_paths is None:
+            paths = DataPaths.default()
+            macro_paths = {
+                1: paths.macro_variant_1,
+                2: paths.macro_variant_2,
+                3: paths.macro_variant_3,
+            }
+        self.macro_paths = macro_paths
         self._data = {}
+        self._prefix = {}
 
     def load_data(self, variant: Variant) -> pd.DataFrame:
         """Wczytuje dane o inflacji dla wybranego wariantu (1, 2, 3)."""
@@ -23,35 +44,58 @@ class InflationProjection:
         self._data[variant] = df
         return df
 
+    def prefix_products(self, variant: Variant) -> Tuple[int, np.ndarray]:
+        """Pierwszy rok siatki i iloczyny prefiksowe rocznych wskaźników inflacji."""
+        if variant not in self._prefix:
+            df = self.load_data(variant)[["rok", "inflation_factor"]]
+            yearly = _interpolate_yearly_factors(df, "rok", ("inflation_factor",))
+            factors = yearly["inflation_factor"].to_numpy(dtype=float)
+            self._prefix[variant] = (int(yearly["rok"].iloc[0]), np.r_[1.0, np.cumprod(factors)])
+        return self._prefix[variant]
+
+    def cumulative_inflation_batch(self, variant: Variant, start_years, end_years) -> np.ndarray:
+        """
+        Mnożniki inflacji dla tablic par (start_year, end_year), lata włącznie.
+        Błąd, jeśli któraś para nie ma żadnego roku z danymi.
+        """
+        first, prefix = self.prefix_products(variant)
+        last = first + len(prefix) - 2
+        start, end = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(start_years)), np.atleast_1d(np.asarray(end_years))
+        )
+        lo = np.maximum(start, first)
+        hi = np.minimum(end, last)
+        if (lo > hi).any():
+            bad = int(np.argmax(lo > hi))
+            raise ValueError(
+                f"No inflation data for range {start[bad]}-{end[bad]} (variant {variant})"
+            )
+        return prefix[(hi - first + 1).astype(np.intp)] / prefix[(lo - first).astype(np.intp)]
+
     def cumulative_inflation(self, variant: Variant, start_year: int, end_year: int) -> float:
         """
         Zwraca łączną inflację między start_year a end_year (jako mnożnik).
         Np. 1.127 oznacza wzrost o 12,7%.
         """
-        df = self.load_data(variant)
-        df = df[(df["rok"] >= start_year) & (df["rok"] <= end_year)].copy()
-
-        if df.empty:
-            raise ValueError(f"No inflation data for range {start_year}-{end_year} (variant {variant})")
-
-        cumulative = df["inflation_factor"].prod()
-        return cumulative
+        return float(self.cumulative_inflation_batch(variant, start_year, end_year)[0])
 
-    def project_price(self, variant: Variant, start_year: int, end_year: int, amount: float) -> float:
+    def project_price(
+        self, variant: Variant, start_year: int, end_year: int, amount: float
+    ) -> float:
         """Oblicza wartość nominalną kwoty po uwzględnieniu inflacji."""
         factor = self.cumulative_inflation(variant, start_year, end_year)
         return round(amount * factor, 2)
 
 
+@lru_cache(maxsize=1)
+def default_inflation_projection() -> InflationProjection:
+    """Projekcja na domyślnych plikach makro, współdzielona przez endpointy API."""
+    return InflationProjection()
+
+
 # === przykład użycia ===
 if __name__ == "__main__":
-    macro_paths = {
-        1: "data/dane_emerytalne/parametry_makroekonomiczne_wariant_1.csv",
-        2: "data/dane_emerytalne/parametry_makroekonomiczne_wariant_2.csv",
-        3: "data/dane_emerytalne/parametry_makroekonomiczne_wariant_3.csv"
-    }
-
-    infl = InflationProjection(macro_paths)
+    infl = InflationProjection()
 
     start = 2024
     end = 2030
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from data.functionalities.sex_codes import FEMALE, MALE, sex_code
+
+if TYPE_CHECKING:  # the pipeline applies the conversion itself, see below
+    from data.functionalities.simulation_pipeline import CareerBatch, SimulationPipeline
+
+# Kapitał początkowy: service before REFORM_YEAR, valued as of January 1st 1999.
+#
+# Following art. 174 of the ustawa o emeryturach i rentach z FUS, the capital is a
+# hypothetical old-age pension at the end of 1998 times the 1999 life expectancy at 62:
+#     P  = SP * min(1, service / required service)            social part
+#        + 1.3% * base * contributory years
+#        + 0.7% * base * non-contributory years (at most a third of the contributory ones)
+#     KP = P * LIFE_EXPECTANCY_MONTHS
+# with SP = 24% of the 1999 kwota bazowa and base = wage ratio (own wage / average wage,
+# capped at 250%) * kwota bazowa. The required service is 20 years for women and 25 for
+# men. The capital is then valorized with the account index from 1999 up to retirement,
+# like the `initial_capital_index` of `ValorizationIndexBuilder`.
+#
+# Everything is elementwise over arrays of people. `convert_pre_reform_service` turns the
+# pre-1999 part of the rows of a `CareerBatch` into its `initial_capital` column and starts
+# their account contributions in 1999; rows of one person (work blocks) share the social
+# part in proportion to their pre-1999 years, so `run_grouped` adds up to the person's KP.
+# `SimulationPipeline` applies it to every batch: `blocks_to_batch` converts the blocks of
+# each person together, `capital` converts any remaining row on its own (a no-op for rows
+# already converted), and the Monte Carlo engine converts its career before simulating.
+
+REFORM_YEAR = 1999  # accounts opened; earlier service is initial capital as of Jan 1
+BASE_AMOUNT = 1220.89  # kwota bazowa 1999 (PLN)
+SOCIAL_PART = 0.24
+CONTRIBUTORY_RATE = 0.013
+NON_CONTRIBUTORY_RATE = 0.007
+MAX_WAGE_RATIO = 2.5
+LIFE_EXPECTANCY_MONTHS = 209  # average life expectancy at 62 (GUS tables used for 1999)
+REQUIRED_SERVICE_YEARS = {MALE: 25.0, FEMALE: 20.0}
+
+
+def _social_part(sex, service) -> np.ndarray:
+    code = sex_code(sex)
+    required = np.where(
+        code == FEMALE, REQUIRED_SERVICE_YEARS[FEMALE], REQUIRED_SERVICE_YEARS[MALE]
+    )
+    return SOCIAL_PART * BASE_AMOUNT * np.minimum(1.0, service / required)
+
+
+def _base(wage_ratio) -> np.ndarray:
+    return np.minimum(np.asarray(wage_ratio, dtype=float), MAX_WAGE_RATIO) * BASE_AMOUNT
+
+
+def initial_capital(sex, contributory_years, wage_ratio, non_contributory_years=0.0) -> np.ndarray:
+    """Initial capital as of Jan 1 1999 (PLN); arguments broadcast like NumPy arrays."""
+    contributory = np.asarray(contributory_years, dtype=float)
+    non_contributory = np.minimum(
+        np.asarray(non_contributory_years, dtype=float), contributory / 3
+    )
+    base = _base(wage_ratio)
+    pension = (
+        _social_part(sex, contributory + non_contributory)
+        + CONTRIBUTORY_RATE * base * contributory
+        + NON_CONTRIBUTORY_RATE * base * non_contributory
+    )
+    return pension * LIFE_EXPECTANCY_MONTHS
+
+
+def convert_pre_reform_service(
+    pipeline: SimulationPipeline, batch: CareerBatch, groups: Optional[np.ndarray] = None
+) -> CareerBatch:
+    """
+    Copy of the batch in which the part of each row before REFORM_YEAR is initial capital
+    instead of account contributions. The wage ratio is the row's salary over the average
+    wage of the current year (salaries move with the average wage). `groups` marks rows of
+    the same person, e.g. work blocks from `blocks_to_batch`; default: one person per row.
+    """
+    groups = np.arange(len(batch)) if groups is None else np.asarray(groups)
+    end = np.minimum(batch.end_year, pipeline.retirement_time(batch))
+    years = np.clip(np.minimum(end, REFORM_YEAR) - batch.start_year, 0.0, None)
+    if not years.any():
+        return batch
+
+    service = np.bincount(groups, years)[groups]
+    share = np.divide(years, service, out=np.zeros_like(years), where=service > 0)
+    base = _base(batch.salary / pipeline.average_wage()[batch.variant - 1])
+    # the person's social part is split over the rows by their pre-reform years
+    pension = _social_part(batch.sex, service) * share + CONTRIBUTORY_RATE * base * years
+    capital = pension * LIFE_EXPECTANCY_MONTHS
+    return batch.with_values(
+        start_year=np.maximum(batch.start_year, REFORM_YEAR),
+        initial_capital=batch.initial_capital + capital,
+    )
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from data.functionalities.sex_codes import FEMALE, MALE, sex_code
+from data.functionalities.valorization_engine import DATA_DIR
+
+# GUS life tables compiled into dense arrays.
+#
+# `tablice_trwania_zycia_w_latach_1990-2022.xlsx` has one sheet per year with both sexes
+# stacked (column "sex": 1 = men, 2 = women) and the usual columns x, lx, qx, dx, Lx, Tx,
+# ex under a row of these symbols. Every sheet is parsed once - the symbol row is located
+# once per sheet - into [year, age, sex] arrays, which are cached as an .npz keyed by the
+# workbook's content hash. Lookups are then plain array indexing.
+#
+# `project` extends the tables to future years with a log-linear trend of the death
+# probabilities, fitted per (age, sex) in one least-squares pass over FIT_YEARS:
+#   log qx(t) = a(x, s) + b(x, s) * t
+# 2020-2022 (COVID excess mortality) are left out of the fit. lx and ex of the projected
+# years follow from qx with deaths spread evenly within a year of age; the last age is an
+# open interval with constant mortality.
+
+EXCEL_PATH = f"{DATA_DIR}/tablice_trwania_zycia_w_latach_1990-2022.xlsx"
+DEFAULT_PATH = "data/artifacts/life_tables.npz"
+COLUMNS = ("lx", "qx", "ex")
+SEX_CODES = {1: MALE, 2: FEMALE}  # codes used in the workbook
+FIT_YEARS = (2000, 2019)
+PROJECTION_LAST_YEAR = 2080
+RADIX = 100_000
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+def _parse_sheet(raw: pd.DataFrame) -> pd.DataFrame:
+    """Rows below the symbol row (x, lx, ..., ex); the first column holds the sex code."""
+    symbols = raw.apply(lambda row: {str(v).strip() for v in row}, axis=1)
+    header = next(i for i, cells in enumerate(symbols) if {"x", "ex"} <= cells)
+    names = [str(v).strip() for v in raw.iloc[header]]
+    names[0] = "sex"
+    table = raw.iloc[header + 1 :].set_axis(names, axis=1)
+    table = table[["sex", "x", *COLUMNS]].apply(pd.to_numeric, errors="coerce")
+    return table.dropna()
+
+
+def life_table_from_qx(qx: np.ndarray, axis: int = 1) -> tuple:
+    """lx (out of RADIX) and ex from death probabilities along the age `axis`."""
+    qx = np.moveaxis(qx, axis, -1)
+    survival = np.cumprod(1 - qx, axis=-1)
+    lx = np.concatenate([np.ones_like(qx[..., :1]), survival[..., :-1]], axis=-1)
+    person_years = lx * (1 - qx / 2)
+    person_years[..., -1] = lx[..., -1] * (1 - qx[..., -1] / 2) / qx[..., -1]
+    total = np.cumsum(person_years[..., ::-1], axis=-1)[..., ::-1]
+    ex = total / lx
+    return np.moveaxis(lx * RADIX, -1, axis), np.moveaxis(ex, -1, axis)
+
+
+@dataclass
+class LifeTables:
+    years: np.ndarray  # calendar years of the tables
+    ages: np.ndarray  # 0..max age
+    lx: np.ndarray  # survivors out of 100 000 births, [year, age, sex]
+    qx: np.ndarray  # probability of dying within the year of age
+    ex: np.ndarray  # life expectancy at exact age (years)
+    source: str = ""  # content hash of the workbook
+
+    @classmethod
+    def compile(cls, excel_path: str = EXCEL_PATH) -> LifeTables:
+        xl = pd.ExcelFile(excel_path)
+        sheets = {
+            int(s): _parse_sheet(xl.parse(s, header=None)) for s in xl.sheet_names if s.isdigit()
+        }
+        years = np.array(sorted(sheets))
+        ages = np.arange(int(max(t["x"].max() for t in sheets.values())) + 1)
+        values = {c: np.full((len(years), len(ages), 2), np.nan) for c in COLUMNS}
+        for y, year in enumerate(years):
+            table = sheets[year]
+            sex = table["sex"].astype(int).map(SEX_CODES).to_numpy()
+            age = table["x"].astype(int).to_numpy()
+            for column in COLUMNS:
+                values[column][y, age, sex] = table[column].to_numpy(float)
+        if any(np.isnan(v).any() for v in values.values()):
+            raise ValueError(f"Incomplete life tables in {excel_path}")
+        return cls(years, ages, **values, source=_file_digest(excel_path))
+
+    def _index(self, year, age, sex) -> tuple:
+        year = np.asarray(year)
+        age = np.asarray(age)
+        if (year < self.years[0]).any() or (year > self.years[-1]).any():
+            raise ValueError(f"Brak tablic trwania życia dla roku {year}")
+        if (age < 0).any() or (age > self.ages[-1]).any():
+            raise ValueError(f"Brak danych dla wieku {age}")
+        sex = sex_code(sex)[0] if isinstance(sex, str) else np.asarray(sex, dtype=np.intp)
+        return year.astype(np.intp) - self.years[0], age.astype(np.intp), sex
+
+    def life_expectancy(self, year, age, sex) -> np.ndarray:
+        """ex for arrays of (year, age, sex); sex as MALE / FEMALE codes or 'm' / 'k'."""
+        return self.ex[self._index(year, age, sex)]
+
+    def death_probability(self, year, age, sex) -> np.ndarray:
+        return self.qx[self._index(year, age, sex)]
+
+    def survivors(self, year, age, sex) -> np.ndarray:
+        return self.lx[self._index(year, age, sex)]
+
+    def project(
+        self, last_year: int = PROJECTION_LAST_YEAR, fit_years: tuple = FIT_YEARS
+    ) -> LifeTables:
+        """Observed tables followed by trend-projected ones up to `last_year`."""
+        fit = (self.years >= fit_years[0]) & (self.years <= fit_years[1])
+        t = self.years[fit] - self.years[fit].mean()
+        log_q = np.log(self.qx[fit])  # [fit year, age, sex]
+        intercept = log_q.mean(axis=0)
+        slope = np.tensordot(t, log_q - intercept, axes=1) / (t @ t)  # [age, sex]
+
+        future = np.arange(self.years[-1] + 1, last_year + 1)
+        elapsed = (future - self.years[fit].mean())[:, None, None]
+        qx = np.minimum(np.exp(intercept + slope * elapsed), 1.0)
+        lx, ex = life_table_from_qx(qx)
+        return LifeTables(
+            np.concatenate([self.years, future]),
+            self.ages,
+            np.concatenate([self.lx, lx]),
+            np.concatenate([self.qx, qx]),
+            np.concatenate([self.ex, ex]),
+            source=self.source,
+        )
+
+    def save(self, path: str = DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(
+            path,
+            years=self.years,
+            ages=self.ages,
+            **{c: getattr(self, c) for c in COLUMNS},
+            meta=json.dumps({"source": self.source}),
+        )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> Optional[LifeTables]:
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as f:
+            meta = json.loads(str(f["meta"]))
+            return cls(f["years"], f["ages"], *(f[c] for c in COLUMNS), source=meta["source"])
+
+
+@lru_cache(maxsize=4)
+def compiled_life_tables(excel_path: str = EXCEL_PATH, path: str = DEFAULT_PATH) -> LifeTables:
+    """Tables compiled by `scripts/compile_life_tables.py`; recompiled if stale or missing."""
+    tables = LifeTables.load(path)
+    if tables is None or tables.source != _file_digest(excel_path):
+        tables = LifeTables.compile(excel_path)
+        tables.save(path)
+    return tables
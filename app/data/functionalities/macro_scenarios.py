@@ -1,39 +1,134 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Sequence
+
+import numpy as np
 import pandas as pd
-from data.src.valorization_engine import ForecastData, DataPaths, _interpolate_yearly_factors
+
+from data.functionalities.data_snapshot import data_snapshot
+from data.functionalities.valorization_engine import (
+    DATA_DIR,
+    DataPaths,
+    ForecastData,
+    _interpolate_yearly_factors,
+)
+
+# Side-by-side view of the three macro variants.
+#
+# All indicators of `ForecastData.load_macro` are interpolated onto a yearly grid once
+# (the CSVs jump 2030 -> 2035 -> ...) and stacked into a [variant, year, indicator] cube.
+# Cross-variant statistics (min / max / mean / spread = max - min) are reductions over the
+# variant axis, computed once per analyzer; `macro_analyzer` keeps one analyzer per data
+# snapshot, so the dashboard endpoint never re-reads the CSVs.
+
+VARIANTS = (1, 2, 3)
+STATISTICS = ("min", "max", "mean", "spread")
+DEFAULT_INDICATORS = ("cpi_factor", "real_gdp_factor")
+
+
+@dataclass
+class MacroCube:
+    years: np.ndarray
+    indicators: tuple
+    values: np.ndarray  # [variant, year, indicator]
+
+    @classmethod
+    def build(cls, data: ForecastData) -> MacroCube:
+        frames = [data.load_macro(v) for v in VARIANTS]
+        indicators = tuple(c for c in frames[0].columns if c != "rok")
+        first = min(int(f["rok"].min()) for f in frames)
+        last = max(int(f["rok"].max()) for f in frames)
+        years = np.arange(first, last + 1)
+        values = np.empty((len(VARIANTS), len(years), len(indicators)))
+        for v, frame in enumerate(frames):
+            yearly = _interpolate_yearly_factors(frame[["rok", *indicators]], "rok", indicators)
+            rok = yearly["rok"].to_numpy()
+            for i, name in enumerate(indicators):
+                values[v, :, i] = np.interp(years, rok, yearly[name].to_numpy(dtype=float))
+        return cls(years, indicators, values)
+
+    def columns(self, indicators: Sequence[str]) -> list:
+        unknown = set(indicators) - set(self.indicators)
+        if unknown:
+            raise ValueError(f"Unknown macro indicators: {sorted(unknown)}")
+        return [self.indicators.index(name) for name in indicators]
+
 
 class MacroScenarioAnalyzer:
-    def __init__(self, forecast_data: ForecastData):
+    def __init__(self, forecast_data: ForecastData, cube: Optional[MacroCube] = None):
         self.data = forecast_data
+        self.cube = cube or MacroCube.build(forecast_data)
+        values = self.cube.values
+        low, high = values.min(axis=0), values.max(axis=0)
+        # [statistic, year, indicator], statistics in STATISTICS order
+        self.statistics = np.stack([low, high, values.mean(axis=0), high - low])
 
-    def compare_inflation_scenarios(self) -> pd.DataFrame:
-        dfs = []
-        for variant in [1, 2, 3]:
-            df = self.data.load_macro(variant)[["rok", "cpi_factor", "real_gdp_factor"]].copy()
-            df["variant"] = variant
-            dfs.append(df)
-        merged = pd.concat(dfs).sort_values(["rok", "variant"]).reset_index(drop=True)
-        return merged
-
-    def summarize_by_year(self) -> pd.DataFrame:
-        df = self.compare_inflation_scenarios()
-        summary = (
-            df.groupby("rok")[["cpi_factor", "real_gdp_factor"]]
-            .agg(["min", "max", "mean"])
-            .round(3)
-        )
-        summary.columns = ["_".join(c) for c in summary.columns]
-        return summary.reset_index()
+    def compare_inflation_scenarios(
+        self, indicators: Sequence[str] = DEFAULT_INDICATORS
+    ) -> pd.DataFrame:
+        """Yearly values of every variant in long format (rok, indicators..., variant)."""
+        columns = self.cube.columns(indicators)
+        years = self.cube.years
+        table = self.cube.values[:, :, columns].transpose(1, 0, 2).reshape(-1, len(columns))
+        df = pd.DataFrame(table, columns=list(indicators))
+        df.insert(0, "rok", np.repeat(years, len(VARIANTS)))
+        df["variant"] = np.tile(VARIANTS, len(years))
+        return df
+
+    def summarize_by_year(self, indicators: Sequence[str] = DEFAULT_INDICATORS) -> pd.DataFrame:
+        """Min / max / mean across variants per year, columns `<indicator>_<stat>`."""
+        columns = self.cube.columns(indicators)
+        summary = pd.DataFrame({"rok": self.cube.years})
+        for name, i in zip(indicators, columns):
+            for s, stat in enumerate(STATISTICS[:3]):
+                summary[f"{name}_{stat}"] = self.statistics[s, :, i].round(3)
+        return summary
+
+    def spread(self, indicator: str) -> np.ndarray:
+        """Max - min across variants per year."""
+        (i,) = self.cube.columns([indicator])
+        return self.statistics[STATISTICS.index("spread"), :, i]
+
+    def summary(
+        self,
+        indicators: Optional[Sequence[str]] = None,
+        first_year: Optional[int] = None,
+        last_year: Optional[int] = None,
+    ) -> Dict[str, object]:
+        """Dashboard payload: per indicator, the variant paths and their statistics."""
+        indicators = indicators or self.cube.indicators
+        columns = self.cube.columns(indicators)
+        years = self.cube.years
+        rows = (years >= (first_year or years[0])) & (years <= (last_year or years[-1]))
+        return {
+            "years": years[rows].tolist(),
+            "indicators": {
+                name: {
+                    "variants": {
+                        v: self.cube.values[k, rows, i].tolist() for k, v in enumerate(VARIANTS)
+                    },
+                    **{
+                        stat: self.statistics[s, rows, i].tolist()
+                        for s, stat in enumerate(STATISTICS)
+                    },
+                }
+                for name, i in zip(indicators, columns)
+            },
+        }
 
-if __name__ == "__main__":
-    paths = DataPaths(
-        macro_variant_1="data/dane_emerytalne/parametry_makroekonomiczne_wariant_1.csv",
-        macro_variant_2="data/dane_emerytalne/parametry_makroekonomiczne_wariant_2.csv",
-        macro_variant_3="data/dane_emerytalne/parametry_makroekonomiczne_wariant_3.csv",
-        revenues="data/dane_emerytalne/wplywy_skladkowe_mln_zl.csv",
-    )
 
-    data = ForecastData(paths)
-    analyzer = MacroScenarioAnalyzer(data)
+@lru_cache(maxsize=4)
+def _analyzer(data_dir: str, snapshot: str) -> MacroScenarioAnalyzer:
+    return MacroScenarioAnalyzer(ForecastData(DataPaths.default(data_dir)))
 
-    summary = analyzer.summarize_by_year()
+
+def macro_analyzer(data_dir: str = DATA_DIR) -> MacroScenarioAnalyzer:
+    """Analyzer over the shipped CSVs; rebuilt only when the data snapshot changes."""
+    return _analyzer(data_dir, data_snapshot(data_dir))
+
+
+if __name__ == "__main__":
+    summary = macro_analyzer().summarize_by_year()
     print(summary.head(10))
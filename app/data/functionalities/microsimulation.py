@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from data.functionalities.fund_balance import FundTables
+from data.functionalities.life_tables import compiled_life_tables
+from data.functionalities.simulation_pipeline import (
+    FEMALE,
+    MALE,
+    RETIREMENT_AGE,
+    CareerBatch,
+    SimulationPipeline,
+)
+
+# Synthetic cohort microsimulation of today's insured population.
+#
+# Calibration (`PopulationModel.calibrate`):
+#   - age and sex: stationary population of the latest observed life table, i.e. density
+#     proportional to lx over working ages ENTRY_AGE .. statutory retirement age - 1,
+#   - wage: lognormal with WAGE_SIGMA as the dispersion of log wages and the current-year
+#     contribution base per insured as its mean, i.e. revenues / (revenues as % of the
+#     base) / insured - the national average wage would overstate it by ~60%, since many
+#     insured work part-time or pay on a reduced base; the wage index moves it onwards,
+#   - career: contributions since ENTRY_AGE, retirement at the statutory age,
+#   - scale: each synthetic person stands for insured[current year] / persons people
+#     (liczba_ubezpieczonych_tys.csv of the chosen variant).
+#
+# Each chunk of persons is drawn from its own SeedSequence child, pushed through the
+# career pipeline and folded into per-year totals (contributors, contributions, new
+# retirees, surviving pensioners, pension expenditure), so memory is bounded by the chunk
+# size whatever the population. Pensions are indexed with prices and paid from the first
+# full year after retirement to survivors of the retirement year's (projected) life table.
+#
+# The cohort is closed - no new entrants and no pensioners retired before the current
+# year - so `validate` reports ratios to the fund tables rather than expecting equality:
+# contributors / insured starts at 1 and falls as the cohort retires, expenditure is the
+# cohort's growing share of fund spending. `ShardedRunner.microsimulate` runs the chunks
+# on a process pool.
+
+ENTRY_AGE = 22
+WAGE_SIGMA = 0.6
+CHUNK_SIZE = 50_000
+LAST_YEAR = 2080
+TOTALS = ("contributors", "contributions", "retirees", "pensioners", "expenditure")
+MLN = 1e6
+
+
+@dataclass
+class CohortTotals:
+    years: np.ndarray
+    values: np.ndarray  # [total, year]; people, or mln PLN (nominal) for money
+    persons: int  # synthetic persons simulated
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.values[TOTALS.index(name)]
+
+    def merge(self, other: CohortTotals) -> CohortTotals:
+        self.values += other.values
+        self.persons += other.persons
+        return self
+
+
+@dataclass
+class MicrosimulationReport:
+    totals: CohortTotals
+    elapsed: float  # seconds
+    workers: int
+
+    @property
+    def persons_per_second(self) -> float:
+        return self.totals.persons / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+@dataclass
+class PopulationModel:
+    year: int  # base year of the draws (the pipeline's current year)
+    variant: int
+    years: np.ndarray  # years of the totals
+    ages: np.ndarray  # whole ages that can be drawn
+    age_sex_pmf: np.ndarray  # [sex, age] draw probabilities
+    mean_wage: float  # PLN a month, current year
+    wage_sigma: float
+    weight: float  # insured people per synthetic person
+    lx: np.ndarray  # survivors of the projected life tables, [year, age, sex]
+    lx_first_year: int
+
+    @classmethod
+    def calibrate(
+        cls,
+        pipeline: SimulationPipeline,
+        persons: int,
+        variant: int = 2,
+        fund: Optional[FundTables] = None,
+        wage_sigma: float = WAGE_SIGMA,
+    ) -> PopulationModel:
+        data_dir = os.path.dirname(pipeline.data.paths.revenues)
+        fund = fund or FundTables.load(data_dir)
+        tables = compiled_life_tables(pipeline.data.paths.life_tables)
+        last_observed = len(tables.years) - 1
+        projected = tables.project()
+
+        ages = np.arange(ENTRY_AGE, RETIREMENT_AGE[MALE])
+        pmf = np.zeros((2, len(ages)))
+        for sex in (MALE, FEMALE):
+            working = ages < RETIREMENT_AGE[sex]
+            pmf[sex, working] = tables.lx[last_observed, ages[working], sex]
+        pmf /= pmf.sum()
+
+        pos = np.clip(pipeline.current_year - fund.years[0], 0, len(fund.years) - 1)
+        insured = fund["insured"][variant - 1, pos] * 1_000
+        base = (
+            fund["revenues"][variant - 1, pos]
+            * MLN
+            / (fund["revenues_pct_base"][variant - 1, pos] / 100)
+        )
+        mean_wage = base / insured / 12
+        return cls(
+            year=pipeline.current_year,
+            variant=variant,
+            years=np.arange(pipeline.current_year, LAST_YEAR + 1),
+            ages=ages,
+            age_sex_pmf=pmf,
+            mean_wage=float(mean_wage),
+            wage_sigma=wage_sigma,
+            weight=float(insured / persons),
+            lx=projected.lx,
+            lx_first_year=int(projected.years[0]),
+        )
+
+    def draw(self, n: int, rng: np.random.Generator) -> CareerBatch:
+        cell = rng.choice(self.age_sex_pmf.size, n, p=self.age_sex_pmf.ravel())
+        sex, age_pos = np.divmod(cell, len(self.ages))
+        age = self.ages[age_pos] + rng.random(n)
+        log_wage = rng.normal(-self.wage_sigma**2 / 2, self.wage_sigma, n)
+        return CareerBatch.build(
+            age=age,
+            sex=sex,
+            salary=self.mean_wage * np.exp(log_wage),
+            start_year=self.year - (age - ENTRY_AGE),
+            variant=self.variant,
+        )
+
+    def _survival(self, batch: CareerBatch, first_paid: np.ndarray) -> np.ndarray:
+        """Probability of being alive in each year of `years`, given alive at retirement."""
+        table = np.clip(first_paid - 1 - self.lx_first_year, 0, len(self.lx) - 1)[:, None]
+        at_retirement = np.floor(batch.retirement_age).astype(np.intp)[:, None]
+        age = at_retirement + np.maximum(self.years[None, :] - first_paid[:, None], 0)
+        age = np.minimum(age, self.lx.shape[1] - 1)
+        sex = batch.sex[:, None].astype(np.intp)
+        return self.lx[table, age, sex] / self.lx[table, at_retirement, sex]
+
+    def simulate_chunk(
+        self, pipeline: SimulationPipeline, n: int, seed: np.random.SeedSequence
+    ) -> CohortTotals:
+        batch = self.draw(n, np.random.default_rng(seed))
+        years = pipeline._year_pos(self.years)
+        window = slice(int(years[0]), int(years[-1]) + 1)
+        contributions = pipeline.contribution_timeline(batch, window)
+        result = pipeline.run(batch)
+
+        first_paid = np.ceil(pipeline.retirement_time(batch)).astype(int)
+        paid = self.years[None, :] >= first_paid[:, None]
+        alive = np.where(paid, self._survival(batch, first_paid), 0.0)
+        prices = pipeline.price_index[self.variant - 1]
+        indexation = prices[years][None, :] / prices[pipeline._year_pos(first_paid - 1)][:, None]
+        yearly_pension = result.pension[:, None] * 12 * indexation
+
+        values = np.stack(
+            [
+                (contributions > 0).sum(axis=0),
+                contributions.sum(axis=0) / MLN,
+                (first_paid[:, None] == self.years[None, :]).sum(axis=0),
+                alive.sum(axis=0),
+                (alive * yearly_pension).sum(axis=0) / MLN,
+            ]
+        )
+        return CohortTotals(self.years, values * self.weight, n)
+
+    def validate(self, totals: CohortTotals, fund: FundTables) -> Dict[str, np.ndarray]:
+        """Ratios of the cohort totals to the fund tables over their common years."""
+        years = totals.years[totals.years <= fund.years[-1]]
+        cols = years - fund.years[0]
+        rows = np.searchsorted(totals.years, years)
+        v = self.variant - 1
+        return {
+            "years": years,
+            "contributors_to_insured": totals["contributors"][rows]
+            / (fund["insured"][v, cols] * 1_000),
+            "contributions_to_revenues": totals["contributions"][rows] / fund["revenues"][v, cols],
+            "expenditure_share": totals["expenditure"][rows] / fund["expenditure"][v, cols],
+        }
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from data.functionalities.initial_capital import convert_pre_reform_service
+from data.functionalities.quantile_sketch import QuantileSketch
+from data.functionalities.samplers import NormalSampler, SamplingMethod
+from data.functionalities.simulation_pipeline import (
+    REFORM_YEAR,
+    CareerBatch,
+    Prices,
+    SimulationPipeline,
+)
+
+# Monte Carlo around the deterministic macro variants.
+#
+# Every path picks a variant (fixed, or drawn with `variant_weights`) and perturbs its
+# forecast from the year after `current_year` on with persistent log-space shocks:
+#
+#   - CPI (inflacja_ogolna) and real GDP growth: independent AR(1) shocks,
+#   - real wage growth: loads on the GDP shock (WAGE_GDP_LOADING) plus its own AR(1) shock,
+#   - contribution collection (sciagalnosc_skladek): AR(1) shock on the level, capped at 100%.
+#
+# Nominal wage growth of a path = variant forecast * exp(cpi + real wage shock); it drives
+# the salary path. Account valorization follows contribution revenues, so the variant's
+# index is scaled by the same wage shock and by the change in collection, floored at 1.0.
+# With all sigmas at 0 a path reproduces `SimulationPipeline.run` exactly.
+#
+# The normal draws come from `samplers.NormalSampler`: plain pseudo-random, antithetic
+# pairs or scrambled Halton points (`sampling`), the latter two reaching a given
+# percentile accuracy with far fewer paths.
+#
+# Paths are processed as [paths, years] arrays in chunks of `chunk_size` paths, which keeps
+# the intermediates at a few hundred MB for 100k paths over a full career. The streaming
+# mode (`simulate_fan`) sizes chunks from a memory budget instead and folds each chunk into
+# per-year quantile sketches, so memory stays constant however many paths are requested.
+#
+# With `prices="real"` the pension, capital and balances of every path are deflated with
+# the path's own CPI; `pension_real` / `balance_real` are in current-year prices either way.
+
+INDICATORS = ("cpi", "real_wage", "real_gdp", "collection")
+SIGMA = {"cpi": 0.015, "real_wage": 0.012, "real_gdp": 0.02, "collection": 0.01}
+PERSISTENCE = 0.6  # AR(1) coefficient of all shocks
+WAGE_GDP_LOADING = 0.7
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+OUTCOMES = ("pension", "pension_real", "replacement_rate", "capital")
+MAX_MEMORY_BYTES = 64 * 2**20  # working-set cap of one streaming simulation
+BYTES_PER_PATH_YEAR = 8 * 28  # float64 [paths, years] temporaries alive at the peak, with headroom
+
+
+@dataclass
+class MonteCarloResult:
+    pension: np.ndarray  # monthly pension per path (PLN, in the engine's prices)
+    pension_real: np.ndarray  # same in current-year prices (deflated with the path's CPI)
+    replacement_rate: np.ndarray  # pension / last wage (%)
+    capital: np.ndarray  # capital at retirement (PLN, in the engine's prices)
+    variant: np.ndarray  # macro variant of each path
+
+    def __len__(self) -> int:
+        return len(self.pension)
+
+    def percentiles(self, q: Sequence[float] = PERCENTILES) -> Dict[str, Dict[int, float]]:
+        bands = {}
+        for name in OUTCOMES:
+            values = np.percentile(getattr(self, name), q)
+            bands[name] = {int(p): float(v) for p, v in zip(q, values)}
+        return bands
+
+
+@dataclass
+class FanChart:
+    years: np.ndarray  # calendar years from now to the last year before retirement
+    balance: Dict[int, np.ndarray]  # percentile -> account balance per year (engine's prices)
+    balance_real: Dict[int, np.ndarray]  # same in current-year prices
+    outcomes: Dict[str, Dict[int, float]]  # percentile bands of the final outcomes
+    mean: Dict[str, float]  # mean of the final outcomes
+    paths: int
+    chunk_size: int
+    peak_bytes: int  # estimated working set: one chunk plus the sketches
+
+
+@dataclass
+class FanSketches:
+    """Streaming state of a fan-chart simulation; partial results merge by addition."""
+
+    years: np.ndarray
+    balance: QuantileSketch
+    balance_real: QuantileSketch
+    outcomes: QuantileSketch
+    totals: np.ndarray  # sum of each outcome over the paths
+    paths: int = 0
+    chunk_size: int = 0
+    peak_bytes: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.balance.nbytes + self.balance_real.nbytes + self.outcomes.nbytes
+
+    def merge(self, other: FanSketches) -> FanSketches:
+        self.balance.merge(other.balance)
+        self.balance_real.merge(other.balance_real)
+        self.outcomes.merge(other.outcomes)
+        self.totals += other.totals
+        self.paths += other.paths
+        self.chunk_size = max(self.chunk_size, other.chunk_size)
+        self.peak_bytes = max(self.peak_bytes, other.peak_bytes)
+        return self
+
+    def chart(self, q: Sequence[float] = PERCENTILES) -> FanChart:
+        levels = np.asarray(q, dtype=float) / 100
+        outcome_values = self.outcomes.quantiles(levels)
+        return FanChart(
+            years=self.years,
+            balance=dict(zip(map(int, q), self.balance.quantiles(levels))),
+            balance_real=dict(zip(map(int, q), self.balance_real.quantiles(levels))),
+            outcomes={
+                name: {int(p): float(v) for p, v in zip(q, outcome_values[:, k])}
+                for k, name in enumerate(OUTCOMES)
+            },
+            mean={name: float(t / self.paths) for name, t in zip(OUTCOMES, self.totals)},
+            paths=self.paths,
+            chunk_size=self.chunk_size,
+            peak_bytes=self.peak_bytes,
+        )
+
+
+class MonteCarloEngine:
+    def __init__(
+        self,
+        pipeline: SimulationPipeline,
+        sigma: Optional[Dict[str, float]] = None,
+        persistence: float = PERSISTENCE,
+        chunk_size: int = 25_000,
+        sampling: SamplingMethod = "pseudo",
+        prices: Prices = "nominal",
+    ):
+        self.pipeline = pipeline
+        self.sigma = np.array([(sigma or SIGMA)[name] for name in INDICATORS])
+        self.persistence = persistence
+        self.chunk_size = chunk_size
+        self.sampling = sampling
+        self.prices = prices
+        self.cpi_growth = pipeline.price_growth  # [variant, year]
+        self.collection = pipeline.macro_series("collection_rate")
+
+    def sampler(self, batch: CareerBatch, rng: np.random.Generator) -> NormalSampler:
+        """Normal draws for one simulation: one dimension per (indicator, shock component)."""
+        _, future, _ = self._window(batch)
+        return NormalSampler(self.sampling, int(future.sum()) * len(INDICATORS), rng)
+
+    def shock_factors(self, horizon: int) -> tuple:
+        """
+        Principal-component construction of the AR(1) shocks: the stationary covariance
+        sigma^2 * rho^|i - j| of each indicator is factored as V sqrt(L), and the factors
+        of all indicators are ordered by variance. Shocks = normals @ factors reproduce the
+        AR(1) law exactly, while the leading sampler dimensions carry most of the variance,
+        which is what quasi-random points integrate best.
+        """
+        lag = np.abs(np.subtract.outer(np.arange(horizon), np.arange(horizon)))
+        eigval, eigvec = np.linalg.eigh(self.persistence**lag)
+        factors = eigvec * np.sqrt(np.maximum(eigval, 0.0))  # [year, component]
+        variance = self.sigma[:, None] ** 2 * eigval[None, :]  # [indicator, component]
+        order = np.argsort(-variance, axis=None, kind="stable")
+        return factors, order
+
+    def sample_shocks(self, n: int, horizon: int, sampler: NormalSampler) -> np.ndarray:
+        """Stationary AR(1) log shocks, shape [indicator, paths, years]."""
+        factors, order = self.shock_factors(horizon)
+        z = np.empty((len(INDICATORS) * horizon, n))
+        z[order] = sampler.draw(n).T  # dimension k drives the k-th largest component
+        z = z.reshape(len(INDICATORS), horizon, n).transpose(0, 2, 1)
+        return (z @ factors.T) * self.sigma[:, None, None]
+
+    def simulate(
+        self,
+        batch: CareerBatch,
+        paths: int = 10_000,
+        seed=None,
+        variant_weights: Optional[Sequence[float]] = None,
+    ) -> MonteCarloResult:
+        """
+        Outcome distribution for a single career. Paths use the batch's variant unless
+        `variant_weights` (probabilities of variants 1, 2, 3) is given.
+        """
+        if len(batch) != 1:
+            raise ValueError("Monte Carlo simulation takes a single career")
+        batch = convert_pre_reform_service(self.pipeline, batch)
+        rng = np.random.default_rng(seed)
+        sampler = self.sampler(batch, rng)
+        parts, variants = [], []
+        for lo in range(0, paths, self.chunk_size):
+            variants.append(
+                self._variants(batch, min(self.chunk_size, paths - lo), variant_weights, rng)
+            )
+            parts.append(self._simulate_chunk(batch, variants[-1], sampler)[0])
+        return MonteCarloResult(
+            *(np.concatenate([part[k] for part in parts]) for k in range(len(OUTCOMES))),
+            variant=np.concatenate(variants),
+        )
+
+    def _window(self, batch: CareerBatch):
+        """Grid columns from the career start (or now) to the last year before retirement."""
+        pipeline = self.pipeline
+        now = pipeline.current_year
+        first = pipeline._year_pos(min(np.floor(batch.start_year[0]), now))
+        last = pipeline._year_pos(np.ceil(pipeline.retirement_time(batch)[0]) - 1)
+        window = slice(int(first), int(last) + 1)
+        future = pipeline.years[window] > now
+        return window, future, int(pipeline._year_pos(now)) - window.start
+
+    def chunk_paths(self, batch: CareerBatch, max_memory_bytes: int) -> int:
+        """Largest chunk whose working set stays within the budget."""
+        window, _, _ = self._window(batch)
+        per_path = BYTES_PER_PATH_YEAR * (window.stop - window.start)
+        return max(1, int(max_memory_bytes // per_path))
+
+    def simulate_fan(
+        self,
+        batch: CareerBatch,
+        paths: int = 10_000,
+        seed=None,
+        variant_weights: Optional[Sequence[float]] = None,
+        max_memory_bytes: int = MAX_MEMORY_BYTES,
+        q: Sequence[float] = PERCENTILES,
+    ) -> FanChart:
+        """
+        Streaming mode: per-year balance percentiles (fan chart) and outcome percentiles.
+        Chunks are sized from `max_memory_bytes` and folded into quantile sketches, so
+        memory does not grow with the number of paths.
+        """
+        rng = np.random.default_rng(seed)
+        return self.fan_sketches(batch, paths, rng, variant_weights, max_memory_bytes).chart(q)
+
+    def fan_sketches(
+        self,
+        batch: CareerBatch,
+        paths: int,
+        rng: np.random.Generator,
+        variant_weights: Optional[Sequence[float]] = None,
+        max_memory_bytes: int = MAX_MEMORY_BYTES,
+    ) -> FanSketches:
+        """Mergeable partial result of `simulate_fan` (one shard of a sharded run)."""
+        if len(batch) != 1:
+            raise ValueError("Monte Carlo simulation takes a single career")
+        batch = convert_pre_reform_service(self.pipeline, batch)
+        sampler = self.sampler(batch, rng)
+        window, _, now_col = self._window(batch)
+        years = self.pipeline.years[window][now_col:]
+        partial = FanSketches(
+            years=years,
+            balance=QuantileSketch(len(years)),
+            balance_real=QuantileSketch(len(years)),
+            outcomes=QuantileSketch(len(OUTCOMES)),
+            totals=np.zeros(len(OUTCOMES)),
+        )
+        budget = max_memory_bytes - partial.nbytes
+        partial.chunk_size = min(paths, self.chunk_paths(batch, budget))
+        partial.peak_bytes = (
+            partial.chunk_size * BYTES_PER_PATH_YEAR * (window.stop - window.start)
+            + partial.nbytes
+        )
+
+        for lo in range(0, paths, partial.chunk_size):
+            n = min(partial.chunk_size, paths - lo)
+            variants = self._variants(batch, n, variant_weights, rng)
+            values, balances = self._simulate_chunk(batch, variants, sampler, balances=True)
+            values = np.column_stack(values)
+            partial.outcomes.add(values)
+            partial.totals += values.sum(axis=0)
+            partial.balance.add(balances[0])
+            partial.balance_real.add(balances[1])
+            partial.paths += n
+        return partial
+
+    def _variants(self, batch: CareerBatch, n: int, variant_weights, rng) -> np.ndarray:
+        if variant_weights is None:
+            return np.full(n, batch.variant[0], dtype=np.int8)
+        if self.sampling == "antithetic":  # both paths of a pair share the variant
+            half = rng.choice(np.array([1, 2, 3], dtype=np.int8), (n + 1) // 2, p=variant_weights)
+            return np.concatenate([half, half])[:n]
+        return rng.choice(np.array([1, 2, 3], dtype=np.int8), n, p=variant_weights)
+
+    def _simulate_chunk(
+        self,
+        batch: CareerBatch,
+        variants: np.ndarray,
+        sampler: NormalSampler,
+        balances: bool = False,
+    ) -> tuple:
+        pipeline = self.pipeline
+        window, future, now_col = self._window(batch)
+        last = window.stop - 1
+        # deterministic contributions of the career under each variant, picked per path
+        by_variant = batch.repeat(3).with_values(variant=[1, 2, 3])
+        rows = variants - 1
+        timeline = pipeline.contribution_timeline(by_variant, window)[rows]
+
+        shocks = self.sample_shocks(len(variants), int(future.sum()), sampler)
+        cpi, own_wage, gdp, collection = shocks
+        real_wage = WAGE_GDP_LOADING * gdp + np.sqrt(1 - WAGE_GDP_LOADING**2) * own_wage
+
+        shape = (len(variants), len(future))
+        wage_shock = np.ones(shape)
+        wage_shock[:, future] = np.exp(cpi + real_wage)
+        wage_ratio = np.cumprod(wage_shock, axis=1)  # path wage index / variant wage index
+        timeline *= wage_ratio
+
+        base_collection = self.collection[rows][:, window]
+        collected = np.ones(shape)
+        path_collection = np.minimum(base_collection[:, future] * np.exp(collection), 1.0)
+        collected[:, future] = path_collection / base_collection[:, future]
+        collection_change = collected / np.concatenate([collected[:, :1], collected[:, :-1]], 1)
+
+        valorization = pipeline.valorization[rows][:, window] * wage_shock * collection_change
+        valorization = np.maximum(valorization, 1.0)
+        index = np.cumprod(valorization, axis=1)
+        before = index / valorization
+        at_retirement = index[:, -1]
+        accumulated = np.cumsum(timeline / before, axis=1)
+        capital = accumulated[:, -1] * at_retirement
+        capital += batch.funds[0] * at_retirement / before[:, now_col]
+        # initial capital: forecast valorization from REFORM_YEAR up to the window start
+        reform = pipeline._year_pos(REFORM_YEAR)
+        initial = batch.initial_capital[0] * (
+            pipeline.valorization_before[rows, window.start]
+            / pipeline.valorization_before[rows, reform]
+        )
+        capital += initial * at_retirement
+
+        retirement_time = pipeline.retirement_time(batch)
+        divisor = pipeline.divisor_months(batch.sex, batch.retirement_age, retirement_time)[0]
+        pension = capital / divisor
+
+        prices = np.ones(shape)
+        prices[:, future] = self.cpi_growth[rows][:, window][:, future] * np.exp(cpi)
+        prices = np.cumprod(prices, axis=1)
+        pension_real = pension / prices[:, -1]
+
+        last_wage = batch.salary[0] * pipeline.wage_index[rows, last] * wage_ratio[:, -1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            replacement = np.where(last_wage > 0, pension / last_wage * 100, 0.0)
+        factor = 1.0 / prices[:, -1] if self.prices == "real" else 1.0
+        outcomes = (pension * factor, pension_real, replacement, capital * factor)
+        if not balances:
+            return outcomes, None
+
+        # account balance at the end of each year from now on (nominal and in today's prices)
+        balance = accumulated[:, now_col:] * index[:, now_col:]
+        balance += batch.funds[0] * index[:, now_col:] / before[:, [now_col]]
+        balance += initial[:, None] * index[:, now_col:]
+        balance_real = balance / prices[:, now_col:]
+        return outcomes, (balance_real if self.prices == "real" else balance, balance_real)
@@ -1,45 +1,132 @@
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional, Sequence, Union
 
+import numpy as np
 from pydantic import BaseModel, ConfigDict
 
-class Delay(BaseModel):
-    years: int
-    pension: float
+from data.functionalities.simulation_pipeline import Prices, SimulationPipeline
+
+# Pension after delaying retirement by d years, for whole grids of delays and people.
+#
+# Working one more year adds that year's contributions and valorizes the account with the
+# index of the year: K[k+1] = (K[k] + c[k]) * v[k]. With P[k] = v[0] * ... * v[k-1] this
+# unrolls to the closed form
+#     K[d] = P[d] * (K[0] + S[d]),    S[d] = c[0] / P[0] + ... + c[d-1] / P[d-1],
+# so one cumprod and one cumsum over the horizon give the capital for every whole delay.
+# A fractional delay n + f (e.g. monthly steps) pays f of year n's contributions and
+# valorizes with v[n] ** f. Dividing by the life-table divisor at the delayed age and date
+# gives the pension.
+#
+# `delay_grid` takes v from the pipeline's valorization index and moves contributions with
+# its wage index (c[k] = 12 * monthly contribution in current-year PLN * W[year]).
+# `calculate_pension_delay` keeps the flat-rate form for callers without a pipeline:
+# v = 1 + annual_valorization, constant contributions and life expectancy minus 12 months
+# per year of delay.
+
 
 class PensionDelayResult(BaseModel):
     model_config = ConfigDict(from_attributes=True)
-    pensions: list[Delay]
+    pensions: Dict[Union[int, float], float]  # delay (years) -> pension
+
+
+@dataclass
+class DelayGrid:
+    delays: np.ndarray  # [delay] years
+    capital: np.ndarray  # [person, delay]
+    divisor_months: np.ndarray  # [person, delay]
+    pension: np.ndarray  # [person, delay], in the requested prices
+
+    def as_dict(self, row: int = 0) -> Dict[Union[int, float], float]:
+        """Delay -> pension (rounded) of one person; whole-year delays as int keys."""
+        return {_key(d): round(float(p), 2) for d, p in zip(self.delays, self.pension[row])}
+
+
+def _key(delay: float):
+    return int(delay) if float(delay).is_integer() else float(delay)
+
+
+def _accumulate(capital, contributions, valorization, delays) -> np.ndarray:
+    """Capital after each delay; contributions and valorization are [person, year of horizon]."""
+    people = len(capital)
+    prefix = np.concatenate([np.ones((people, 1)), np.cumprod(valorization, axis=1)], axis=1)
+    paid = np.concatenate(
+        [np.zeros((people, 1)), np.cumsum(contributions / prefix[:, :-1], axis=1)], axis=1
+    )
+    whole = np.floor(delays).astype(np.intp)
+    part = delays - whole
+    at_whole = prefix[:, whole] * (capital[:, None] + paid[:, whole])
+    return valorization[:, whole] ** part * (at_whole + part * contributions[:, whole])
 
 
 class PensionDelayCalculator:
-    @staticmethod
-    def calculate_pension_delay(
-        base_capital: float, #initial accumulated capital (PLN)
-        monthly_contribution: float, #current monthly contribution added to account (PLN)
-        life_expectancy_months: int, #remaining life expectancy at normal retirement age (months)
-        annual_valorization: float=0.03, #yearly valorization rate, e.g. 0.03 = 3%
-        delays: list = [0, 1, 2, 5] #list of delays in years to evaluate (default: [0,1,2,5])
-    ) -> PensionDelayResult:
+    def __init__(self, pipeline: SimulationPipeline):
+        self.pipeline = pipeline
+
+    def delay_grid(
+        self,
+        base_capital,
+        monthly_contribution,
+        sex,
+        retirement_age,
+        retirement_time,
+        delays: Sequence[float] = (0, 1, 2, 5),
+        variant=2,
+        prices: Prices = "nominal",
+    ) -> DelayGrid:
         """
-        Calculate pension amounts depending on delay in retirement.
+        Pensions of many people (arguments broadcast to [person]) for every delay in
+        `delays` (years, fractions allowed). `base_capital` is the capital at the planned
+        `retirement_time` (calendar time), `monthly_contribution` in current-year PLN.
         """
+        pipeline = self.pipeline
+        delays = np.asarray(delays, dtype=float)
+        capital, contribution, age, time, variant = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (
+                base_capital, monthly_contribution, retirement_age, retirement_time, variant,
+            ))
+        )  # fmt: skip
+        sex = np.broadcast_to(np.atleast_1d(np.asarray(sex)), capital.shape)
+        variant = variant.astype(np.intp)
 
-        results = []
-        for d in delays:
-            # Start with base capital
-            capital = base_capital
-            months = life_expectancy_months - (12 * d)
+        horizon = int(np.ceil(delays.max())) + 1
+        year = np.floor(time)[:, None] + np.arange(horizon)
+        rows = variant[:, None] - 1
+        cols = pipeline._year_pos(year)
+        contributions = 12.0 * contribution[:, None] * pipeline.wage_index[rows, cols]
+        total = _accumulate(capital, contributions, pipeline.valorization[rows, cols], delays)
 
-            # Simulate additional years of work
-            for year in range(d):
-                # Add contributions for 12 months
-                capital += monthly_contribution * 12
-                # Apply valorization
-                capital *= (1 + annual_valorization)
+        divisor = pipeline.divisor_months(
+            sex[:, None], age[:, None] + delays, time[:, None] + delays
+        )
+        factor = pipeline.price_factor(variant[:, None], time[:, None], prices, years_after=delays)
+        return DelayGrid(delays, total, divisor, total / divisor * factor)
 
-            # Calculate pension
-            pension = capital / months if months > 0 else 0
-            results.append(Delay(years=d, pension=round(pension, 2)))
-
-        return PensionDelayResult(pensions=results)
+    @staticmethod
+    def calculate_pension_delay(
+        base_capital: float,  # initial accumulated capital (PLN)
+        monthly_contribution: float,  # current monthly contribution added to account (PLN)
+        life_expectancy_months: int,  # remaining life expectancy at normal retirement age (months)
+        annual_valorization: float = 0.03,  # yearly valorization rate, e.g. 0.03 = 3%
+        delays: Sequence[float] = (0, 1, 2, 5),  # delays in years to evaluate
+        price_factors: Optional[
+            Sequence[float]
+        ] = None,  # per delay: nominal PLN -> requested prices
+    ) -> PensionDelayResult:
+        """
+        Calculate pension amounts depending on delay in retirement (flat valorization).
+        """
+        delays = np.asarray(delays, dtype=float)
+        horizon = int(np.ceil(delays.max())) + 1
+        capital = _accumulate(
+            np.array([float(base_capital)]),
+            np.full((1, horizon), 12.0 * monthly_contribution),
+            np.full((1, horizon), 1.0 + annual_valorization),
+            delays,
+        )[0]
+        months = life_expectancy_months - 12 * delays
+        factors = np.ones(len(delays)) if price_factors is None else np.asarray(price_factors)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pension = np.where(months > 0, capital / months * factors, 0.0)
+        return PensionDelayResult(
+            pensions={_key(d): round(float(p), 2) for d, p in zip(delays, pension)}
+        )
@@ -3,179 +3,282 @@ Zawiera definicje typowych profili emerytalnych wykorzystywanych
 w symulacjach ZUS — od osób poniżej minimum po najwyższe świadczenia.
 
 Każdy profil określa:
-- szacunkowy czas pracy (years_of_work)
-- względny poziom wynagrodzenia (wage_factor)
-- stabilność zatrudnienia (stability)
-- opis tekstowy (description)
+- szacunkowy czas pracy (years_worked)
+- względny poziom wynagrodzenia (wage_factor, 1.0 = przeciętne wynagrodzenie)
+- stabilność zatrudnienia (stability) - udział miesięcy kariery z opłaconą składką
+- opis krótki (description) i dłuższy (details)
 
-Plik ten stanowi punkt wyjścia dla symulacji emerytalnych
-w module `pension_profile_forecast.py`.
+`PensionProfiles` trzyma profile kolumnowo (tablice NumPy) i liczy emerytury
+wszystkich profili dla każdej kombinacji wariant × płeć × rok przejścia na emeryturę
+jednym przebiegiem `SimulationPipeline.run`. Wynik (`ProfileTable`) jest zapisywany
+w data/artifacts i przeliczany tylko przy zmianie danych (data_snapshot), wersji
+pipeline'u lub bieżącego roku - panel "jak wypadasz na tle typowych emerytów" czyta
+gotową tablicę.
+
+Założenia symulacji profilu:
+- emerytura od 1 stycznia danego roku, w powszechnym wieku emerytalnym,
+- kariera `years_worked` lat zakończona w dniu przejścia na emeryturę,
+- wynagrodzenie = wage_factor × przeciętne wynagrodzenie (rośnie razem z nim),
+- składka pomnożona przez `stability` (przerwy rozłożone równomiernie w karierze).
 """
 
-from dataclasses import dataclass
-from typing import Dict
+from __future__ import annotations
 
+import json
+import os
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
 
-@dataclass
+import numpy as np
+
+from data.functionalities.data_snapshot import data_snapshot
+from data.functionalities.simulation_pipeline import (
+    CONTRIBUTION_RATE,
+    FEMALE,
+    MALE,
+    PIPELINE_VERSION,
+    RETIREMENT_AGE,
+    CareerBatch,
+    SimulationPipeline,
+    default_pipeline,
+    sex_code,
+)
+
+DEFAULT_PATH = "data/artifacts/pension_profiles.npz"
+LAST_RETIREMENT_YEAR = 2080
+VARIANTS = (1, 2, 3)
+SEXES = (MALE, FEMALE)
+
+
+@dataclass(frozen=True)
 class PensionProfile:
     """Opis pojedynczego profilu emerytalnego."""
-    name: str
-    years_of_work: int
-    wage_factor: float  # w stosunku do średniego wynagrodzenia (1.0 = średnia krajowa)
-    stability: float    # stabilność zatrudnienia w [0–1]
+
+    key: str
     description: str
+    years_worked: int
+    wage_factor: float  # w stosunku do przeciętnego wynagrodzenia
+    stability: float  # udział kariery z opłaconą składką, [0–1]
+    details: str = ""
 
 
-class PensionProfileSimulator:
-    """
-    Udostępnia zestaw predefiniowanych profili emerytalnych,
-    które mogą być wykorzystane do prognoz świadczeń.
-    """
+PROFILES = (
+    PensionProfile(
+        key="below_minimum",
+        description="Poniżej minimalnej",
+        years_worked=15,
+        wage_factor=0.6,
+        stability=0.4,
+        details=(
+            "Osoby, które nie przepracowały wymaganego stażu (25 lat mężczyźni, 20 lat kobiety). "
+            "Często nieregularne zatrudnienie lub przerwy zawodowe. Emerytura poniżej minimum ustawowego."
+        ),
+    ),
+    PensionProfile(
+        key="minimum",
+        description="Minimalna",
+        years_worked=25,
+        wage_factor=0.8,
+        stability=0.6,
+        details=(
+            "Spełnione warunki stażowe, ale niskie zarobki. "
+            "Świadczenie równe minimalnej emeryturze gwarantowanej przez ZUS."
+        ),
+    ),
+    PensionProfile(
+        key="below_average",
+        description="Poniżej średniej",
+        years_worked=30,
+        wage_factor=0.9,
+        stability=0.7,
+        details=(
+            "Emerytury wyższe niż minimalne, ale niższe od średniej. "
+            "Typowe dla osób o średnich karierach zawodowych z przerwami."
+        ),
+    ),
+    PensionProfile(
+        key="average",
+        description="Średnia (przeciętna)",
+        years_worked=35,
+        wage_factor=1.0,
+        stability=0.85,
+        details=(
+            "Świadczenia zbliżone do średniej krajowej. "
+            "Stabilne zatrudnienie przez większość kariery."
+        ),
+    ),
+    PensionProfile(
+        key="above_average",
+        description="Powyżej średniej",
+        years_worked=40,
+        wage_factor=1.3,
+        stability=0.9,
+        details=(
+            "Długi staż pracy i stabilne zatrudnienie. "
+            "Emerytury wyższe od średniej, typowe dla specjalistów i sektora publicznego."
+        ),
+    ),
+    PensionProfile(
+        key="top",
+        description="Najwyższe emerytury (top 5–10%)",
+        years_worked=42,
+        wage_factor=2.5,
+        stability=0.95,
+        details=(
+            "Emerytury kilkukrotnie wyższe od średniej. "
+            "Dotyczy osób o bardzo wysokich zarobkach i długim stażu pracy."
+        ),
+    ),
+)
 
-    def __init__(self):
-        self.profiles: Dict[str, PensionProfile] = {
-            "below_minimum": PensionProfile(
-                name="Poniżej minimalnej",
-                years_of_work=15,
-                wage_factor=0.5,
-                stability=0.4,
-                description=(
-                    "Osoby, które nie przepracowały wymaganego stażu (25 lat mężczyźni, 20 lat kobiety). "
-                    "Często nieregularne zatrudnienie lub przerwy zawodowe. Emerytura poniżej minimum ustawowego."
-                ),
-            ),
-            "minimum": PensionProfile(
-                name="Minimalna",
-                years_of_work=25,
-                wage_factor=0.7,
-                stability=0.6,
-                description=(
-                    "Spełnione warunki stażowe, ale niskie zarobki. "
-                    "Świadczenie równe minimalnej emeryturze gwarantowanej przez ZUS."
-                ),
-            ),
-            "below_average": PensionProfile(
-                name="Poniżej średniej",
-                years_of_work=30,
-                wage_factor=0.85,
-                stability=0.7,
-                description=(
-                    "Emerytury wyższe niż minimalne, ale niższe od średniej. "
-                    "Typowe dla osób o średnich karierach zawodowych z przerwami."
-                ),
-            ),
-            "average": PensionProfile(
-                name="Średnia",
-                years_of_work=35,
-                wage_factor=1.0,
-                stability=0.85,
-                description=(
-                    "Świadczenia zbliżone do średniej krajowej. "
-                    "Stabilne zatrudnienie przez większość kariery."
-                ),
-            ),
-            "above_average": PensionProfile(
-                name="Powyżej średniej",
-                years_of_work=40,
-                wage_factor=1.3,
-                stability=0.9,
-                description=(
-                    "Długi staż pracy i stabilne zatrudnienie. "
-                    "Emerytury wyższe od średniej, typowe dla specjalistów i sektora publicznego."
-                ),
-            ),
-            "top_earners": PensionProfile(
-                name="Najwyższe emerytury (top 5%)",
-                years_of_work=42,
-                wage_factor=2.0,
-                stability=0.95,
-                description=(
-                    "Emerytury kilkukrotnie wyższe od średniej. "
-                    "Dotyczy osób o bardzo wysokich zarobkach i długim stażu pracy."
-                ),
-            ),
-        }
 
-    def list_profiles(self):
-        """Zwraca listę nazw dostępnych profili."""
-        return list(self.profiles.keys())
+@dataclass
+class ProfileTable:
+    """Emerytury profili, [profile, wariant, płeć, rok przejścia na emeryturę]."""
+
+    keys: np.ndarray
+    retirement_years: np.ndarray
+    pension: np.ndarray  # miesięcznie, PLN nominalnie
+    pension_real: np.ndarray  # w cenach bieżącego roku
+    meta: dict
 
-    def get_profile(self, profile_name: str) -> PensionProfile:
-        """Zwraca obiekt `PensionProfile` dla wybranego profilu."""
-        if profile_name not in self.profiles:
-            raise ValueError(f"Nieznany profil: {profile_name}")
-        return self.profiles[profile_name]
+    def clip_year(self, retirement_year: int) -> int:
+        """Najbliższy rok obecny w tablicy."""
+        return int(self.retirement_years[np.abs(self.retirement_years - retirement_year).argmin()])
 
-    def simulate_profile(self, profile_name: str) -> PensionProfile:
+    def pensions(self, variant: int, sex, retirement_year: int) -> Dict[str, tuple]:
         """
-        Zwraca profil gotowy do użycia w prognozie.
-        (Metoda alias — zgodna z konwencją reszty projektu.)
+        Klucz profilu -> (emerytura nominalna, realna); płeć jako kod MALE / FEMALE lub
+        'm' / 'k'; dla roku spoza tablicy - najbliższy (`clip_year`).
         """
-        return self.get_profile(profile_name)
+        sex = sex_code(sex)[0] if isinstance(sex, str) else sex
+        v, s = VARIANTS.index(variant), SEXES.index(sex)
+        y = int(np.abs(self.retirement_years - retirement_year).argmin())
+        return {
+            str(key): (float(nominal), float(real))
+            for key, nominal, real in zip(
+                self.keys, self.pension[:, v, s, y], self.pension_real[:, v, s, y]
+            )
+        }
+
+    def is_current(self, pipeline: SimulationPipeline, profiles: PensionProfiles) -> bool:
+        return (
+            self.meta.get("snapshot") == _snapshot(pipeline)
+            and self.meta.get("pipeline_version") == PIPELINE_VERSION
+            and self.meta.get("current_year") == pipeline.current_year
+            and self.meta.get("profiles") == profiles.fingerprint()
+        )
+
+    def save(self, path: str = DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(
+            path,
+            keys=self.keys,
+            retirement_years=self.retirement_years,
+            pension=self.pension,
+            pension_real=self.pension_real,
+            meta=json.dumps(self.meta),
+        )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> Optional[ProfileTable]:
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as f:
+            return cls(
+                f["keys"],
+                f["retirement_years"],
+                f["pension"],
+                f["pension_real"],
+                json.loads(str(f["meta"])),
+            )
+
+
+def _snapshot(pipeline: SimulationPipeline) -> str:
+    return data_snapshot(os.path.dirname(pipeline.data.paths.revenues))
 
-@dataclass
-class PensionProfile:
-    key: str
-    description: str
-    years_worked: int
-    wage_factor: float
 
 class PensionProfiles:
     """
-    Zbiór predefiniowanych profili emerytalnych
-    (np. poniżej minimalnej, średnia, top 5%, itd.)
+    Rejestr predefiniowanych profili emerytalnych
+    (np. poniżej minimalnej, średnia, top 5%, itd.).
     """
 
-    def __init__(self):
-        self.profiles = {
-            "below_minimum": PensionProfile(
-                key="below_minimum",
-                description="Poniżej minimalnej",
-                years_worked=15,
-                wage_factor=0.6
-            ),
-            "minimum": PensionProfile(
-                key="minimum",
-                description="Minimalna",
-                years_worked=25,
-                wage_factor=0.8
-            ),
-            "below_average": PensionProfile(
-                key="below_average",
-                description="Poniżej średniej",
-                years_worked=30,
-                wage_factor=0.9
-            ),
-            "average": PensionProfile(
-                key="average",
-                description="Średnia (przeciętna)",
-                years_worked=35,
-                wage_factor=1.0
-            ),
-            "above_average": PensionProfile(
-                key="above_average",
-                description="Powyżej średniej",
-                years_worked=40,
-                wage_factor=1.3
-            ),
-            "top": PensionProfile(
-                key="top",
-                description="Najwyższe emerytury (top 5–10%)",
-                years_worked=42,
-                wage_factor=2.5
-            ),
-        }
+    def __init__(self, profiles: Sequence[PensionProfile] = PROFILES):
+        self.profiles: Dict[str, PensionProfile] = {p.key: p for p in profiles}
+        self.keys = np.array([p.key for p in profiles])
+        self.years_worked = np.array([p.years_worked for p in profiles], dtype=float)
+        self.wage_factor = np.array([p.wage_factor for p in profiles])
+        self.stability = np.array([p.stability for p in profiles])
+
+    def list_profiles(self) -> List[str]:
+        """Zwraca listę kluczy dostępnych profili."""
+        return list(self.profiles)
 
     def get_by_key(self, key: str) -> PensionProfile | None:
         """Zwraca profil po kluczu lub None, jeśli nie istnieje."""
         return self.profiles.get(key)
 
+    def get_profile(self, key: str) -> PensionProfile:
+        """Zwraca profil po kluczu; nieznany klucz to ValueError."""
+        if key not in self.profiles:
+            raise ValueError(f"Nieznany profil: {key}")
+        return self.profiles[key]
+
+    def fingerprint(self) -> list:
+        """Definicje profili zapisywane przy tablicy wyników - zmiana wymusza przeliczenie."""
+        return [asdict(p) for p in self.profiles.values()]
+
+    def evaluate(
+        self, pipeline: SimulationPipeline, retirement_years: Optional[Sequence[int]] = None
+    ) -> ProfileTable:
+        """Wszystkie profile × warianty × płcie × lata jako jedna paczka `SimulationPipeline.run`."""
+        if retirement_years is None:
+            retirement_years = np.arange(pipeline.current_year, LAST_RETIREMENT_YEAR + 1)
+        years = np.asarray(retirement_years, dtype=float)
+        variants = np.array(VARIANTS)
+        sexes = np.array(SEXES)
+        retirement_age = np.where(sexes == FEMALE, RETIREMENT_AGE[FEMALE], RETIREMENT_AGE[MALE])
+        average_wage = pipeline.average_wage()  # [variant], bieżące ceny
+
+        p, v, s, y = np.ix_(np.arange(len(self.keys)), variants - 1, np.arange(len(sexes)), years)
+        shape = np.broadcast_shapes(p.shape, v.shape, s.shape, y.shape)
+        age = retirement_age[s] - (y - pipeline.current_year)
+        batch = CareerBatch.build(
+            age=np.broadcast_to(age, shape).ravel(),
+            sex=np.broadcast_to(sexes[s], shape).ravel(),
+            salary=np.broadcast_to(self.wage_factor[p] * average_wage[v], shape).ravel(),
+            start_year=np.broadcast_to(y - self.years_worked[p], shape).ravel(),
+            retirement_age=np.broadcast_to(retirement_age[s], shape).ravel(),
+            variant=np.broadcast_to(variants[v], shape).ravel(),
+            contribution_rate=np.broadcast_to(
+                CONTRIBUTION_RATE * self.stability[p], shape
+            ).ravel(),
+        )
+        result = pipeline.run(batch)
+        meta = {
+            "snapshot": _snapshot(pipeline),
+            "pipeline_version": PIPELINE_VERSION,
+            "current_year": pipeline.current_year,
+            "profiles": self.fingerprint(),
+        }
+        return ProfileTable(
+            self.keys,
+            years.astype(int),
+            result.pension.reshape(shape),
+            result.pension_real.reshape(shape),
+            meta,
+        )
 
-# === Przykład użycia ===
-if __name__ == "__main__":
-    sim = PensionProfileSimulator()
 
-    print("Dostępne profile:")
-    for name in sim.list_profiles():
-        p = sim.get_profile(name)
-        print(f"- {name}: {p.name} ({p.years_of_work} lat, {p.wage_factor}x średniej)")
+@lru_cache(maxsize=1)
+def default_profile_table() -> ProfileTable:
+    """Tablica profili dla pipeline'u API; przeliczana, gdy zapisana jest nieaktualna."""
+    pipeline = default_pipeline()
+    profiles = PensionProfiles()
+    table = ProfileTable.load()
+    if table is None or not table.is_current(pipeline, profiles):
+        table = profiles.evaluate(pipeline)
+        table.save()
+    return table
@@ -1,5 +1,12 @@
+from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Tuple
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from data.functionalities.valorization_engine import DATA_DIR
 
 
 class ForecastVariant(Enum):
@@ -8,125 +15,126 @@ class ForecastVariant(Enum):
     OPTIMISTIC = "optymistyczny"
 
 
-class PensionCalculator:
-    # Alpha coefficients for key years - static for all instances
-    alpha_coefficients: Dict[ForecastVariant, Dict[int, float]] = {
-        ForecastVariant.REALISTIC: {
-            2030: 0.66,
-            2040: 0.72,
-            2050: 0.73,
-            2060: 0.78,
-            2070: 0.87,
-            2080: 0.88,
-        },
-        ForecastVariant.PESSIMISTIC: {
-            2030: 0.60,
-            2040: 0.64,
-            2050: 0.63,
-            2060: 0.66,
-            2070: 0.72,
-            2080: 0.72,
-        },
-        ForecastVariant.OPTIMISTIC: {
-            2030: 0.71,
-            2040: 0.81,
-            2050: 0.84,
-            2060: 0.90,
-            2070: 1.03,
-            2080: 1.06,
-        },
-    }
+ALPHA_PATH = f"{DATA_DIR}/wydolnosc_systemu_proc.csv"
+FIRST_YEAR = 2023
+LAST_YEAR = 2150
+EXTRAPOLATION_SPAN = 10  # years behind the last data point used for the extrapolation trend
+VARIANT_COLUMNS = {
+    ForecastVariant.REALISTIC: "wariant_1",
+    ForecastVariant.PESSIMISTIC: "wariant_2",
+    ForecastVariant.OPTIMISTIC: "wariant_3",
+}
+
 
+def interpret_alpha(alpha: float) -> str:
+    if alpha < 1:
+        coverage_percent = round(alpha * 100, 1)
+        return (
+            f"System pokrywa {coverage_percent}% zobowiązań. "
+            f"Deficyt wynosi {100 - coverage_percent}%."
+        )
+    if alpha == 1:
+        return "System jest zrównoważony - pokrywa 100% zobowiązań."
+    surplus = round((alpha - 1) * 100, 1)
+    return f"System generuje nadwyżkę {surplus}% ponad zobowiązania."
+
+
+@dataclass
+class PensionForecast:
+    pension: Union[float, np.ndarray]
+    alpha: Union[float, np.ndarray]
+
+    @property
+    def interpretation(self) -> Union[str, List[str]]:
+        """Built only when asked for (one string per forecast for array input)."""
+        if np.ndim(self.alpha) == 0:
+            return interpret_alpha(float(self.alpha))
+        return [interpret_alpha(float(a)) for a in np.ravel(self.alpha)]
+
+    def __iter__(self) -> Iterator:
+        # unpacks like a (pension, interpretation) tuple
+        yield self.pension
+        yield self.interpretation
+
+
+@lru_cache(maxsize=4)
+def alpha_table(
+    path: str = ALPHA_PATH,
+) -> Tuple[Dict[ForecastVariant, Dict[int, float]], np.ndarray]:
+    """
+    Coefficients of the CSV per variant and the dense [variant, year] table for
+    FIRST_YEAR..LAST_YEAR: flat before the first data point, linear interpolation between
+    points and, after the last one, the trend of the last EXTRAPOLATION_SPAN years clamped
+    to [MIN_ALPHA, MAX_ALPHA].
+    """
+    df = pd.read_csv(path)
+    data_years = df["rok"].to_numpy()
+    years = np.arange(FIRST_YEAR, LAST_YEAR + 1)
+    coefficients = {}
+    table = np.empty((len(ForecastVariant), len(years)))
+    for row, variant in enumerate(ForecastVariant):
+        alphas = df[VARIANT_COLUMNS[variant]].to_numpy(float) / 100
+        coefficients[variant] = dict(zip(data_years.tolist(), alphas.tolist()))
+        last_year = data_years[-1]
+        slope = (alphas[-1] - np.interp(last_year - EXTRAPOLATION_SPAN, data_years, alphas)) / (
+            EXTRAPOLATION_SPAN
+        )
+        extrapolated = np.clip(
+            alphas[-1] + slope * (years - last_year),
+            PensionCalculator.MIN_ALPHA,
+            PensionCalculator.MAX_ALPHA,
+        )
+        table[row] = np.where(
+            years <= last_year, np.interp(years, data_years, alphas), extrapolated
+        )
+    return coefficients, np.round(table, 4)
+
+
+class PensionCalculator:
     # Constants for extrapolation bounds
     MIN_ALPHA = 0.5  # System covers minimum 50% of obligations
     MAX_ALPHA = 1.5  # System generates maximum 50% surplus
 
-    def _interpolate_alpha(self, variant: ForecastVariant, year: int) -> float:
-        """Linear interpolation or extrapolation of alpha coefficient for any year."""
-
-        coefficients = self.alpha_coefficients[variant]
-        years = sorted(coefficients.keys())
-
-        # If year is before first year in data
-        if year <= years[0]:
-            return coefficients[years[0]]
-
-        # If year is within the data range, interpolate normally
-        if year <= years[-1]:
-            # Find year interval for interpolation
-            for i in range(len(years) - 1):
-                if years[i] <= year <= years[i + 1]:
-                    t1, t2 = years[i], years[i + 1]
-                    alpha1 = coefficients[t1]
-                    alpha2 = coefficients[t2]
-
-                    # Linear interpolation
-                    alpha = alpha1 + (alpha2 - alpha1) * (year - t1) / (t2 - t1)
-                    return round(alpha, 4)
-
-        # Extrapolation beyond the last data point (2080)
-        # Use the trend from the last two data points (2070-2080)
-        t1, t2 = years[-2], years[-1]  # 2070, 2080
-        alpha1, alpha2 = coefficients[t1], coefficients[t2]
-
-        # Calculate slope from last two points
-        slope = (alpha2 - alpha1) / (t2 - t1)
-
-        # Extrapolate linearly
-        extrapolated_alpha = alpha2 + slope * (year - t2)
-
-        # Apply bounds to prevent nonsensical values
-        if extrapolated_alpha < self.MIN_ALPHA:
-            return self.MIN_ALPHA
-        elif extrapolated_alpha > self.MAX_ALPHA:
-            return self.MAX_ALPHA
-        else:
-            return round(extrapolated_alpha, 4)
-
-    def forecast_pension(
-        self, pension_amount: float, year: int, variant: ForecastVariant
-    ) -> Tuple[float, str]:
+    def __init__(self, alpha_path: str = ALPHA_PATH):
+        # alpha = system capacity (wydolnosc_systemu_proc) as a fraction
+        self.alpha_coefficients, self.alphas = alpha_table(alpha_path)
+        self._rows = {variant: row for row, variant in enumerate(ForecastVariant)}
+
+    def _interpolate_alpha(self, variant: ForecastVariant, year) -> Union[float, np.ndarray]:
+        """Alpha coefficient for any year(s): a lookup in the precomputed table."""
+        column = np.clip(np.asarray(year), FIRST_YEAR, LAST_YEAR) - FIRST_YEAR
+        alpha = self.alphas[self._rows[variant], column]
+        return float(alpha) if np.ndim(alpha) == 0 else alpha
+
+    def forecast_pension(self, pension_amount, year, variant: ForecastVariant) -> PensionForecast:
         """
-        Forecasts pension amount for given year and variant.
+        Forecasts pension amounts for the given year(s) and variant.
 
         Args:
-            pension_amount: Base pension amount (in PLN)
-            year: Forecast year (2023 or later)
+            pension_amount: Base pension amount(s) (in PLN)
+            year: Forecast year(s) (2023 or later)
             variant: Selected forecast variant (enum)
 
         Returns:
-            Tuple containing:
-            - forecasted pension amount
-            - interpretation of the result
+            PensionForecast with the forecasted pension(s); it unpacks as
+            (pension, interpretation) and builds the interpretation only when used
         """
+        amount = np.asarray(pension_amount, dtype=float)
+        years = np.asarray(year)
         # Year validation - allow extrapolation beyond 2080
-        if year < 2023:
-            raise ValueError(f"Rok {year} jest przed początkiem prognozy (2023)")
+        if (years < FIRST_YEAR).any():
+            first = int(years.min())
+            raise ValueError(f"Rok {first} jest przed początkiem prognozy ({FIRST_YEAR})")
 
         # Pension amount validation
-        if pension_amount <= 0:
+        if (amount <= 0).any():
             raise ValueError("Wysokość emerytury musi być większa od zera")
 
-        # Calculate alpha coefficient for given year and variant
-        alpha = self._interpolate_alpha(variant, year)
-
-        # Calculate forecasted pension
-        forecasted_pension = round(pension_amount * alpha, 2)
-
-        # Prepare interpretation
-        if alpha < 1:
-            coverage_percent = round(alpha * 100, 1)
-            interpretation = (
-                f"System pokrywa {coverage_percent}% zobowiązań. "
-                f"Deficyt wynosi {100 - coverage_percent}%."
-            )
-        elif alpha == 1:
-            interpretation = "System jest zrównoważony - pokrywa 100% zobowiązań."
-        else:
-            surplus = round((alpha - 1) * 100, 1)
-            interpretation = f"System generuje nadwyżkę {surplus}% ponad zobowiązania."
-
-        return forecasted_pension, interpretation
+        alpha = self._interpolate_alpha(variant, years)
+        pension = np.round(amount * alpha, 2)
+        if np.ndim(pension) == 0:
+            return PensionForecast(float(pension), alpha)
+        return PensionForecast(pension, np.broadcast_to(alpha, pension.shape))
 
 
 # Example usage:
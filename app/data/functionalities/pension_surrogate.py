@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from data.functionalities.data_snapshot import data_snapshot
+from data.functionalities.grid_interpolation import multilinear
+from data.functionalities.simulation_pipeline import (
+    CONTRIBUTION_RATE,
+    PIPELINE_VERSION,
+    REFORM_YEAR,
+    RETIREMENT_AGE,
+    CareerBatch,
+    SimulationPipeline,
+    default_pipeline,
+    sex_code,
+)
+
+# Fast approximate mode ("mode=approx").
+#
+# The full pipeline is evaluated offline on a grid of
+#   variant x sex x age x years worked x salary
+# (career of `years_worked` years ending at the statutory retirement age, constant salary
+# in current prices) and stored as pension / salary. A query is then 8 gathers and a few
+# multiplications - microseconds instead of a pipeline run. The sick-leave factor of the
+# same careers (`SimulationPipeline.sick_leave_factor`, independent of the salary) is a
+# second output of the table, so both come from the same gather.
+#
+# The table only represents such careers: one salary, the default contribution rate and
+# no service before REFORM_YEAR (initial capital is not proportional to the salary).
+# `covers` tells whether a work-block career is one of them; callers send the rest to
+# the exact pipeline.
+#
+# Error bounds are measured, not assumed: after fitting, the surrogate is compared with
+# the exact pipeline on random off-grid points of the covered domain and the max / p99
+# relative error is stored next to the table and returned with every estimate.
+
+DEFAULT_PATH = "data/artifacts/pension_surrogate.npz"
+
+
+@dataclass
+class SurrogateEstimate:
+    pension: np.ndarray
+    sick_leave_factor: np.ndarray  # share of the capital left with sick leave
+    max_relative_error: float  # measured bound over the validation sample
+
+
+class PensionSurrogate:
+    AGES = np.arange(18, 71, dtype=float)
+    YEARS_WORKED = np.arange(0, 51, dtype=float)
+    LOG_SALARIES = np.log(np.geomspace(1_000, 100_000, 12))
+
+    def __init__(self, table: np.ndarray, meta: dict):
+        # [variant, sex, age, years worked, log salary, output], outputs: pension / salary
+        # and the sick-leave factor
+        self.table = table
+        self.meta = meta
+
+    @property
+    def error_bounds(self) -> dict:
+        return self.meta.get("error_bounds", {})
+
+    @classmethod
+    def fit(cls, pipeline: SimulationPipeline, chunk_size: int = 50_000) -> PensionSurrogate:
+        grid = np.meshgrid(
+            [1, 2, 3], [0, 1], cls.AGES, cls.YEARS_WORKED, np.exp(cls.LOG_SALARIES), indexing="ij"
+        )
+        variant, sex, age, years_worked, salary = (g.ravel() for g in grid)
+        ratio = np.empty(variant.shape)
+        for lo in range(0, len(variant), chunk_size):
+            part = slice(lo, lo + chunk_size)
+            pension = cls._exact(
+                pipeline, age[part], sex[part], salary[part], years_worked[part], variant[part]
+            )
+            ratio[part] = pension / salary[part]
+
+        careers = np.meshgrid([1, 2, 3], [0, 1], cls.AGES, cls.YEARS_WORKED, indexing="ij")
+        variant, sex, age, years_worked = (g.ravel() for g in careers)
+        batch = CareerBatch.build(age=age, sex=sex, salary=1.0, start_year=0.0, variant=variant)
+        batch = batch.with_values(start_year=pipeline.retirement_time(batch) - years_worked)
+        sick_leave = pipeline.sick_leave_factor(batch).reshape(careers[0].shape)
+
+        meta = {
+            "snapshot": cls._snapshot(pipeline),
+            "pipeline_version": PIPELINE_VERSION,
+            "current_year": pipeline.current_year,
+        }
+        ratio = ratio.reshape(grid[0].shape)
+        sick_leave = np.broadcast_to(sick_leave[..., None], ratio.shape)
+        return cls(np.stack([ratio, sick_leave], axis=-1).astype(np.float32), meta)
+
+    @staticmethod
+    def _snapshot(pipeline: SimulationPipeline) -> str:
+        return data_snapshot(os.path.dirname(pipeline.data.paths.revenues))
+
+    @staticmethod
+    def _exact(
+        pipeline: SimulationPipeline, age, sex, salary, years_worked, variant
+    ) -> np.ndarray:
+        batch = CareerBatch.build(age=age, sex=sex, salary=salary, start_year=0.0, variant=variant)
+        batch = batch.with_values(start_year=pipeline.retirement_time(batch) - years_worked)
+        return pipeline.run(batch).pension
+
+    @classmethod
+    def covers(
+        cls, pipeline: SimulationPipeline, age, sex, years, salary, contribution_rate
+    ) -> bool:
+        """Whether the career given as work blocks is one the table represents."""
+        years = np.asarray(years, dtype=float)
+        retirement_age = RETIREMENT_AGE[int(sex_code(sex)[0])]
+        start = pipeline.current_year - age + retirement_age - years.sum()
+        return bool(
+            cls.AGES[0] <= age <= cls.AGES[-1]
+            and years.sum() <= cls.YEARS_WORKED[-1]
+            and start >= REFORM_YEAR
+            and np.unique(np.asarray(salary, dtype=float)).size == 1
+            and np.all(np.asarray(contribution_rate, dtype=float) == CONTRIBUTION_RATE)
+        )
+
+    def measure_error(
+        self, pipeline: SimulationPipeline, samples: int = 20_000, seed: int = 0
+    ) -> dict:
+        """Relative error against the exact pipeline on random off-grid covered points."""
+        rng = np.random.default_rng(seed)
+        age = rng.integers(self.AGES[0], self.AGES[-1] + 1, samples)
+        sex = rng.integers(0, 2, samples)
+        variant = rng.integers(1, 4, samples)
+        # careers starting in REFORM_YEAR or later, like the ones `covers` accepts
+        batch = CareerBatch.build(age=age, sex=sex, salary=0.0, start_year=0.0)
+        longest = np.minimum(pipeline.retirement_time(batch) - REFORM_YEAR, self.YEARS_WORKED[-1])
+        years_worked = rng.uniform(0.0, 1.0, samples) * longest
+        salary = np.exp(rng.uniform(self.LOG_SALARIES[0], self.LOG_SALARIES[-1], samples))
+
+        exact = self._exact(pipeline, age, sex, salary, years_worked, variant)
+        approx = self.predict(age, sex, salary, years_worked, variant).pension
+        valid = exact > 0
+        error = np.abs(approx[valid] / exact[valid] - 1.0)
+        bounds = {
+            "max": float(error.max()),
+            "p99": float(np.quantile(error, 0.99)),
+            "mean": float(error.mean()),
+            "samples": int(valid.sum()),
+        }
+        self.meta["error_bounds"] = bounds
+        return bounds
+
+    def predict(self, age, sex, salary, years_worked, variant=2) -> SurrogateEstimate:
+        salary = np.asarray(salary, dtype=float)
+        outputs = multilinear(
+            self.table,
+            (self.AGES, self.YEARS_WORKED, self.LOG_SALARIES),
+            (age, years_worked, np.log(np.maximum(salary, 1.0))),
+            prefix=(np.asarray(variant) - 1, sex_code(sex)),
+        )
+        return SurrogateEstimate(
+            pension=outputs[..., 0] * salary,
+            sick_leave_factor=outputs[..., 1],
+            max_relative_error=self.error_bounds.get("max", float("nan")),
+        )
+
+    def is_current(self, pipeline: SimulationPipeline) -> bool:
+        return (
+            self.meta.get("snapshot") == self._snapshot(pipeline)
+            and self.meta.get("pipeline_version") == PIPELINE_VERSION
+            and self.meta.get("current_year") == pipeline.current_year
+        )
+
+    def save(self, path: str = DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(path, table=self.table, meta=json.dumps(self.meta))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> Optional[PensionSurrogate]:
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as f:
+            if f["table"].ndim != 6:  # written before the sick-leave output
+                return None
+            return cls(f["table"], json.loads(str(f["meta"])))
+
+
+@lru_cache(maxsize=1)
+def default_surrogate() -> PensionSurrogate:
+    """Surrogate built by `scripts/build_pension_surrogate.py`; refitted if stale or missing."""
+    pipeline = default_pipeline()
+    surrogate = PensionSurrogate.load()
+    if surrogate is None or not surrogate.is_current(pipeline):
+        surrogate = PensionSurrogate.fit(pipeline)
+        surrogate.measure_error(pipeline)
+        surrogate.save()
+    return surrogate
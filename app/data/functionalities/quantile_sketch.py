@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    Streaming quantiles for many series at once (e.g. one per simulated year) in memory
+    that does not depend on the number of observations.
+
+    Log-spaced histogram with relative accuracy `alpha` (DDSketch): a value v lands in
+    bucket ceil(log_gamma(v)), gamma = (1 + alpha) / (1 - alpha), and every quantile is
+    returned within a relative error of alpha. Unlike P² or t-digest, adding a chunk is
+    one `bincount` over the whole [observations, series] block and sketches merge by
+    adding counts, so chunks and shards can be folded in any order.
+    Values below `min_value` (incl. zero) are counted as 0; values above `max_value` are
+    clamped to it.
+    """
+
+    def __init__(
+        self,
+        series: int,
+        alpha: float = 0.005,
+        min_value: float = 1e-2,
+        max_value: float = 1e12,
+    ):
+        self.series = series
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.offset = math.ceil(math.log(min_value) / self.log_gamma)
+        self.bins = math.ceil(math.log(max_value) / self.log_gamma) - self.offset + 1
+        self.min_value = min_value
+        self.counts = np.zeros((series, self.bins), dtype=np.int64)
+        self.zeros = np.zeros(series, dtype=np.int64)
+
+    @property
+    def count(self) -> np.ndarray:
+        return self.counts.sum(axis=1) + self.zeros
+
+    @property
+    def nbytes(self) -> int:
+        return self.counts.nbytes + self.zeros.nbytes
+
+    def add(self, values: np.ndarray):
+        """Fold a block of observations, shape [observations, series]."""
+        values = np.asarray(values, dtype=float).reshape(-1, self.series)
+        small = values < self.min_value
+        self.zeros += small.sum(axis=0)
+
+        with np.errstate(divide="ignore"):
+            bucket = np.ceil(np.log(np.maximum(values, self.min_value)) / self.log_gamma)
+        bucket = np.clip(bucket.astype(np.int64) - self.offset, 0, self.bins - 1)
+        flat = (bucket + np.arange(self.series) * self.bins)[~small]
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+
+    def merge(self, other: QuantileSketch) -> QuantileSketch:
+        if (other.series, other.bins, other.alpha) != (self.series, self.bins, self.alpha):
+            raise ValueError("Only sketches with the same layout can be merged")
+        self.counts += other.counts
+        self.zeros += other.zeros
+        return self
+
+    def quantiles(self, q: Sequence[float]) -> np.ndarray:
+        """Quantiles q in [0, 1] of every series, shape [len(q), series]."""
+        q = np.asarray(q, dtype=float)
+        rank = q[:, None] * np.maximum(self.count - 1, 0)[None, :]  # [q, series]
+        cumulative = np.cumsum(self.counts, axis=1) + self.zeros[:, None]  # [series, bins]
+        # first bucket whose cumulative count exceeds the rank
+        bucket = (cumulative[None, :, :] <= rank[:, :, None]).sum(axis=2)
+        bucket = np.minimum(bucket, self.bins - 1)
+        value = 2 * self.gamma ** (bucket + self.offset) / (self.gamma + 1)
+        return np.where(rank < self.zeros[None, :], 0.0, value)
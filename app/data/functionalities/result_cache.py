@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Hashable, Iterator, Optional
+
+# Result cache with speculative precomputation.
+#
+# After answering a request the API schedules the scenarios a user is likely to try
+# next (e.g. retirement age +-1-2 years, the next delay option). They are computed by
+# a small background pool only while no foreground request is running; as soon as load
+# rises, queued speculative work is cancelled. Entries remember whether they were
+# computed speculatively so we can measure how often speculation actually pays off.
+
+
+@dataclass
+class CacheMetrics:
+    hits: int = 0
+    misses: int = 0
+    speculative_scheduled: int = 0
+    speculative_computed: int = 0
+    speculative_hits: int = 0  # speculative entries later requested by a user
+    speculative_cancelled: int = 0  # dropped because foreground load rose
+    speculative_evicted_unused: int = 0
+
+    def as_dict(self) -> dict:
+        metrics = asdict(self)
+        computed = self.speculative_computed
+        metrics["speculative_hit_rate"] = self.speculative_hits / computed if computed else 0.0
+        return metrics
+
+
+@dataclass
+class _Entry:
+    value: object
+    speculative: bool
+    used: bool = False
+
+
+class ResultCache:
+    """Thread-safe LRU cache of computed results keyed by the normalized request."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.metrics = CacheMetrics()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[object]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.metrics.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.metrics.hits += 1
+            if entry.speculative and not entry.used:
+                self.metrics.speculative_hits += 1
+            entry.used = True
+            return entry.value
+
+    def put(self, key: Hashable, value: object, speculative: bool = False):
+        with self._lock:
+            if speculative and key in self._entries:
+                return  # never overwrite a result computed for a real request
+            self._entries[key] = _Entry(value, speculative)
+            self._entries.move_to_end(key)
+            if speculative:
+                self.metrics.speculative_computed += 1
+            while len(self._entries) > self.maxsize:
+                _, evicted = self._entries.popitem(last=False)
+                if evicted.speculative and not evicted.used:
+                    self.metrics.speculative_evicted_unused += 1
+
+
+class SpeculativeScheduler:
+    """
+    Low-priority background computation into a `ResultCache`.
+
+    Foreground requests are wrapped in `foreground()`. Speculative tasks only start while
+    the number of requests in flight is at most `max_load`; when it is exceeded, every
+    queued task is cancelled (tasks already running finish - they are short).
+    """
+
+    def __init__(self, cache: ResultCache, workers: int = 1, max_load: int = 0):
+        self.cache = cache
+        self.max_load = max_load
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="speculative")
+        self._pending: Dict[Hashable, Future] = {}
+        self._load = 0
+        self._lock = threading.Lock()
+
+    @property
+    def load(self) -> int:
+        return self._load
+
+    @contextmanager
+    def foreground(self) -> Iterator[None]:
+        with self._lock:
+            self._load += 1
+            busy = self._load > self.max_load
+        if busy:
+            self.cancel_pending()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._load -= 1
+
+    def schedule(self, key: Hashable, compute: Callable[[], object]) -> bool:
+        """Queue `compute` for `key` unless it is cached, queued, or the service is busy."""
+        with self._lock:
+            if self._load > self.max_load or key in self._pending or key in self.cache:
+                return False
+            self.cache.metrics.speculative_scheduled += 1
+            future = self._executor.submit(self._run, key, compute)
+            self._pending[key] = future
+        future.add_done_callback(lambda _: self._pending.pop(key, None))
+        return True
+
+    def _run(self, key: Hashable, compute: Callable[[], object]):
+        if self._load > self.max_load:  # load rose after scheduling
+            self.cache.metrics.speculative_cancelled += 1
+            return
+        self.cache.put(key, compute(), speculative=True)
+
+    def cancel_pending(self) -> int:
+        with self._lock:
+            futures = list(self._pending.values())
+        cancelled = sum(future.cancel() for future in futures)
+        self.cache.metrics.speculative_cancelled += cancelled
+        return cancelled
+
+    def wait(self):
+        """Block until all queued speculative work has finished (used by tests and scripts)."""
+        for future in list(self._pending.values()):
+            try:
+                future.result()
+            except Exception:
+                pass
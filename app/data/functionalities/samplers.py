@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import math
+from typing import Literal
+
+import numpy as np
+
+# Normal draws for the Monte Carlo shocks.
+#
+#   pseudo      - plain NumPy generator
+#   antithetic  - every draw z is paired with -z (rows i and i + n/2 of a block)
+#   halton      - randomized quasi-Monte Carlo: scrambled Halton points mapped through
+#                 the inverse normal CDF. Dimension d uses the d-th prime as base and an
+#                 independent random permutation of the digits at every position (random
+#                 digit scrambling), which removes the correlation between high dimensions
+#                 of the plain sequence and makes every point uniform on (0, 1).
+#                 The sequence continues across chunks, so chunking does not change it.
+#                 Only the first QMC_DIMS dimensions are quasi-random: callers order their
+#                 dimensions by importance, and the low-variance tail is left pseudo-random,
+#                 where large-base Halton coordinates would cost time and add nothing.
+
+SamplingMethod = Literal["pseudo", "antithetic", "halton"]
+SAMPLING_METHODS = ("pseudo", "antithetic", "halton")
+MAX_INDEX_BITS = 40  # Halton points per sampler: up to 2**40
+QMC_DIMS = 32  # leading dimensions taken from Halton, the rest pseudo-random
+
+
+def primes(count: int) -> np.ndarray:
+    """First `count` primes."""
+    limit = max(16, int(count * (math.log(count + 1) + math.log(math.log(count + 2))) + 10))
+    sieve = np.ones(limit + 1, dtype=bool)
+    sieve[:2] = False
+    for p in range(2, int(limit**0.5) + 1):
+        if sieve[p]:
+            sieve[p * p :: p] = False
+    return np.flatnonzero(sieve)[:count]
+
+
+def inverse_normal_cdf(u: np.ndarray) -> np.ndarray:
+    """Standard normal quantile (Acklam's rational approximation, relative error < 1.2e-9)."""
+    a = (
+        -39.69683028665376,
+        220.9460984245205,
+        -275.9285104469687,
+        138.3577518672690,
+        -30.66479806614716,
+        2.506628277459239,
+    )
+    b = (
+        -54.47609879822406,
+        161.5858368580409,
+        -155.6989798598866,
+        66.80131188771972,
+        -13.28068155288572,
+    )
+    c = (
+        -7.784894002430293e-03,
+        -3.223964580411365e-01,
+        -2.400758277161838,
+        -2.549732539343734,
+        4.374664141464968,
+        2.938163982698783,
+    )
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996,
+         3.754408661907416)  # fmt: skip
+    u = np.asarray(u, dtype=float)
+    low = 0.02425
+    x = np.empty_like(u)
+
+    central = (u >= low) & (u <= 1 - low)
+    q = u[central] - 0.5
+    r = q * q
+    x[central] = (
+        (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5])
+        * q
+        / (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+    )
+    tail = ~central
+    q = np.sqrt(-2 * np.log(np.where(u[tail] < 0.5, u[tail], 1 - u[tail])))
+    value = (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / (
+        (((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1
+    )
+    x[tail] = np.where(u[tail] < 0.5, value, -value)
+    return x
+
+
+class ScrambledHalton:
+    """Randomly digit-permuted Halton sequence in `dims` dimensions."""
+
+    def __init__(self, dims: int, rng: np.random.Generator):
+        self.bases = primes(dims)
+        self.index = 0
+        self.permutations, self.tails = [], []
+        for base in self.bases:
+            levels = math.ceil(MAX_INDEX_BITS * math.log(2) / math.log(base))
+            perms = np.stack([rng.permutation(base) for _ in range(levels)])
+            # digits past the last non-zero one are 0 but permute to perm[0]: their sum
+            # from each level on is precomputed
+            weights = float(base) ** -np.arange(1, levels + 1)
+            tail = np.cumsum((perms[:, 0] * weights)[::-1])[::-1]
+            self.permutations.append(perms)
+            self.tails.append(np.r_[tail, 0.0])
+
+    def random(self, n: int) -> np.ndarray:
+        """Next n points, shape [n, dims], in (0, 1)."""
+        index = np.arange(self.index, self.index + n, dtype=np.int64)
+        self.index += n
+        points = np.empty((n, len(self.bases)))
+        for dim, (base, perms) in enumerate(zip(self.bases, self.permutations)):
+            remaining = index.copy()
+            value = np.zeros(n)
+            scale = 1.0 / base
+            level = 0
+            while remaining.any():
+                remaining, digit = np.divmod(remaining, base)
+                value += perms[level][digit] * scale
+                scale /= base
+                level += 1
+            points[:, dim] = value + self.tails[dim][level]
+        return np.clip(points, 1e-12, 1 - 1e-12)
+
+
+class NormalSampler:
+    """Standard normal blocks of shape [n, dims] drawn with the chosen method."""
+
+    def __init__(self, method: SamplingMethod, dims: int, rng: np.random.Generator):
+        if method not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method: {method}")
+        self.method = method
+        self.dims = dims
+        self.rng = rng
+        self.halton = ScrambledHalton(min(dims, QMC_DIMS), rng) if method == "halton" else None
+
+    def draw(self, n: int) -> np.ndarray:
+        if self.method == "halton":
+            leading = inverse_normal_cdf(self.halton.random(n))
+            rest = self.rng.standard_normal((n, self.dims - leading.shape[1]))
+            return np.concatenate([leading, rest], axis=1)
+        if self.method == "antithetic":
+            half = self.rng.standard_normal(((n + 1) // 2, self.dims))
+            return np.concatenate([half, -half])[:n]
+        return self.rng.standard_normal((n, self.dims))
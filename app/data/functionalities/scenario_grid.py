@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+
+from data.functionalities.data_snapshot import data_snapshot
+from data.functionalities.grid_interpolation import locate, multilinear
+from data.functionalities.simulation_pipeline import (
+    PIPELINE_VERSION,
+    CareerBatch,
+    SimulationPipeline,
+    default_pipeline,
+    sex_code,
+)
+from data.functionalities.valorization_engine import DataPaths, ForecastData
+
+# Precomputed scenario grid.
+#
+# Outcomes of the full pipeline over
+#   variant x sex x age x salary x retirement age
+# stored as one N-dimensional float64 array on disk (`values.npy`, opened with
+# mmap_mode="r") plus `axes.json` with the axis values and build metadata. Workers
+# share the page cache instead of each loading a copy, on-grid queries are a single
+# index and off-grid ones a multilinear interpolation over age, salary and retirement age.
+#
+# Career assumption: work starts at CAREER_START_AGE (in the past or in the future)
+# and continues until retirement, with a constant salary in current prices.
+
+DEFAULT_DIR = "data/artifacts/scenario_grid"
+CAREER_START_AGE = 25
+DELAYS = (1, 2, 5)
+OUTPUTS = ("pension", "replacement_rate") + tuple(f"pension_delay_{d}" for d in DELAYS)
+
+AXES = {
+    "variant": np.array([1, 2, 3], dtype=float),
+    "sex": np.array([0, 1], dtype=float),
+    "age": np.arange(18, 71, dtype=float),
+    "salary": np.round(np.geomspace(1_000, 50_000, 25), -1),
+    "retirement_age": np.arange(60, 71, dtype=float),
+}
+CONTINUOUS = ("age", "salary", "retirement_age")
+
+_worker_pipeline: Optional[SimulationPipeline] = None
+
+
+def _init_worker(paths: dict, current_year: int):
+    global _worker_pipeline
+    _worker_pipeline = SimulationPipeline(ForecastData(DataPaths(**paths)), current_year)
+
+
+def compute_block(variant: int, sex: int, pipeline: Optional[SimulationPipeline] = None):
+    """All outputs for one (variant, sex) slice: shape [age, salary, retirement age, output]."""
+    pipeline = pipeline or _worker_pipeline
+    age, salary, retirement_age = np.meshgrid(
+        AXES["age"], AXES["salary"], AXES["retirement_age"], indexing="ij"
+    )
+    batch = CareerBatch.build(
+        age=age.ravel(),
+        sex=sex,
+        salary=salary.ravel(),
+        start_year=pipeline.current_year - age.ravel() + CAREER_START_AGE,
+        retirement_age=retirement_age.ravel(),
+        variant=variant,
+    )
+    # base case and every delay evaluated in one stacked pipeline call
+    delays = np.array((0,) + DELAYS, dtype=float)
+    stacked = batch.repeat(len(delays))
+    stacked = stacked.with_values(
+        retirement_age=stacked.retirement_age + np.tile(delays, len(batch))
+    )
+    result = pipeline.run(stacked)
+    pension = result.pension.reshape(len(batch), len(delays))
+
+    out = np.column_stack(
+        [
+            pension[:, 0],
+            result.replacement_rate.reshape(len(batch), len(delays))[:, 0],
+            pension[:, 1:],
+        ]
+    )
+    return variant, sex, out.reshape(age.shape + (len(OUTPUTS),))
+
+
+def build_grid(
+    pipeline: SimulationPipeline, path: str = DEFAULT_DIR, workers: Optional[int] = None
+) -> "ScenarioGrid":
+    """
+    Compute the whole grid and write it as a memory-mapped array. With workers > 0 the
+    (variant, sex) slices are computed on a process pool; workers=0 runs in-process.
+    """
+    os.makedirs(path, exist_ok=True)
+    shape = tuple(len(a) for a in AXES.values()) + (len(OUTPUTS),)
+    # written next to the live files and swapped in when complete: readers that mapped
+    # the old values.npy keep their (unlinked) file, axes.json goes last
+    tmp = os.path.join(path, f"values.npy.{os.getpid()}.tmp")
+    values = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float64, shape=shape)
+    tasks = [(v, s) for v in (1, 2, 3) for s in (0, 1)]
+    if workers == 0:
+        results = (compute_block(v, s, pipeline) for v, s in tasks)
+        for variant, sex, block in results:
+            values[variant - 1, sex] = block
+    else:
+        init_args = (asdict(pipeline.data.paths), pipeline.current_year)
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init_args) as pool:
+            futures = [pool.submit(compute_block, v, s) for v, s in tasks]
+            for future in futures:
+                variant, sex, block = future.result()
+                values[variant - 1, sex] = block
+    values.flush()
+    del values
+    os.replace(tmp, os.path.join(path, "values.npy"))
+
+    meta = {
+        "axes": {name: axis.tolist() for name, axis in AXES.items()},
+        "outputs": list(OUTPUTS),
+        "career_start_age": CAREER_START_AGE,
+        "snapshot": data_snapshot(os.path.dirname(pipeline.data.paths.revenues)),
+        "pipeline_version": PIPELINE_VERSION,
+        "current_year": pipeline.current_year,
+    }
+    tmp = os.path.join(path, f"axes.json.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, os.path.join(path, "axes.json"))
+    return ScenarioGrid.open(path)
+
+
+class ScenarioGrid:
+    def __init__(self, values: np.ndarray, meta: dict):
+        self.values = values  # [variant, sex, age, salary, retirement age, output]
+        self.meta = meta
+        self.axes = {name: np.asarray(axis, dtype=float) for name, axis in meta["axes"].items()}
+        self.outputs = tuple(meta["outputs"])
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_DIR) -> Optional[ScenarioGrid]:
+        meta_path = os.path.join(path, "axes.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return cls(np.load(os.path.join(path, "values.npy"), mmap_mode="r"), meta)
+
+    def is_current(self, pipeline: SimulationPipeline) -> bool:
+        return (
+            self.meta.get("snapshot")
+            == data_snapshot(os.path.dirname(pipeline.data.paths.revenues))
+            and self.meta.get("pipeline_version") == PIPELINE_VERSION
+            and self.meta.get("current_year") == pipeline.current_year
+        )
+
+    def lookup(self, age, sex, salary, retirement_age, variant=2) -> Dict[str, np.ndarray]:
+        """
+        Outputs for a batch of queries. Points lying exactly on the grid are read with a
+        single index; the rest are interpolated (coordinates are clamped to the grid).
+        """
+        prefix = np.broadcast_arrays(np.asarray(variant) - 1, sex_code(sex))
+        coords = np.broadcast_arrays(
+            *(np.asarray(c, dtype=float) for c in (age, salary, retirement_age))
+        )
+        located = [locate(self.axes[name], c) for name, c in zip(CONTINUOUS, coords)]
+        # locate() puts the last axis point at left = n - 2 with weight 1
+        index = [np.where(w == 1.0, left + 1, left) for left, w in located]
+        on_grid = np.logical_and.reduce([(w == 0.0) | (w == 1.0) for _, w in located])
+        for i, name, c in zip(index, CONTINUOUS, coords):
+            on_grid &= self.axes[name][i] == c
+
+        if on_grid.all():
+            result = self.values[tuple(prefix) + tuple(index)]
+        else:
+            result = multilinear(
+                self.values,
+                [self.axes[name] for name in CONTINUOUS],
+                coords,
+                prefix=tuple(prefix),
+            )
+        return {name: result[..., k] for k, name in enumerate(self.outputs)} | {"on_grid": on_grid}
+
+
+@lru_cache(maxsize=1)
+def default_scenario_grid() -> ScenarioGrid:
+    """Grid built by `scripts/build_scenario_grid.py`; rebuilt in-process if stale or missing."""
+    pipeline = default_pipeline()
+    grid = ScenarioGrid.open()
+    if grid is None or not grid.is_current(pipeline):
+        grid = build_grid(pipeline, workers=0)
+    return grid
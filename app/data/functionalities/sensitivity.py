@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from data.functionalities.simulation_pipeline import (
+    CareerBatch,
+    PathAdjustments,
+    Prices,
+    SimulationPipeline,
+    default_pipeline,
+)
+from data.functionalities.valorization_engine import DATA_DIR
+
+# Tornado chart of a user's pension under the parameter changes of the official
+# sensitivity analysis (analiza_wrazliwosci_*.csv, analiza_smiertelnosci.csv).
+#
+# The tables give the % change of contribution revenues (wplywy) and expenditure
+# (wydatki) and the change of the fund balance (saldo, bn PLN) in selected years after a
+# parameter moves by 1pp (mortality: by 5%). They are interpolated to yearly arrays once
+# at load. The change is assumed to start next year, so the effect k years later is read
+# from the column of the first table year + k.
+#
+# How a change reaches the user's account:
+#   - the revenue response drives account valorization (the index follows contribution
+#     revenues): the valorization factor of year t is scaled by L_t / L_{t-1}, L being the
+#     revenue level relative to the baseline - this carries unemployment and collection,
+#   - inflation: nominal wage, price and valorization growth move by ~1pp,
+#   - real wage growth: the user's wage growth moves by ~1pp,
+#   - valorization: the account index moves by ~1pp,
+#   - mortality: with Gompertz mortality, scaling all death rates by (1 + d) ages the
+#     survival curve by ln(1 + d) / GOMPERTZ_SLOPE years, so the divisor is the one of
+#     that much older retiree.
+#
+# All changes are rows of one batch with `PathAdjustments`, so the whole tornado costs a
+# single `SimulationPipeline.run`.
+
+PARAMETERS = (
+    "inflation",
+    "wage_growth",
+    "unemployment",
+    "collection",
+    "valorization",
+    "mortality",
+)
+SOURCE_ROWS = {
+    "inflation": ("stopa_inflacji_+1pp", "stopa_inflacji_-1pp"),
+    "wage_growth": ("realny_wzrost_wynagrodzen_+1pp", "realny_wzrost_wynagrodzen_-1pp"),
+    "unemployment": ("stopa_bezrobocia_+1pp", "stopa_bezrobocia_-1pp"),
+    "collection": ("sciagalnosc_skladek_+1pp", "sciagalnosc_skladek_-1pp"),
+    "valorization": ("waloryzacja_+1pp", "waloryzacja_-1pp"),
+    "mortality": ("wzrost_o_5proc", "spadek_o_5proc"),
+}
+CHANGES = {name: "5%" if name == "mortality" else "1pp" for name in PARAMETERS}
+IMPACTS = ("wplywy_proc", "wydatki_proc", "saldo_mld_zl")
+SENSITIVITY_FILES = {impact: f"analiza_wrazliwosci_{impact}.csv" for impact in IMPACTS}
+MORTALITY_FILE = "analiza_smiertelnosci.csv"
+PP = 0.01
+MORTALITY_CHANGE = 0.05
+GOMPERTZ_SLOPE = 0.1  # growth rate of old-age mortality per year of age
+
+
+def load_impacts(years: np.ndarray, data_dir: str = DATA_DIR) -> tuple:
+    """
+    System impacts [impact, parameter, +/-, year] interpolated onto `years` (flat outside
+    the tables), and the first table year.
+    """
+    mortality = pd.read_csv(f"{data_dir}/{MORTALITY_FILE}")
+    impacts = np.zeros((len(IMPACTS), len(PARAMETERS), 2, len(years)))
+    first_year = None
+    for i, impact in enumerate(IMPACTS):
+        tables = {
+            "table": pd.read_csv(f"{data_dir}/{SENSITIVITY_FILES[impact]}").set_index(
+                "zmiana_parametru"
+            ),
+            "mortality": mortality[mortality["typ"] == impact]
+            .drop(columns="typ")
+            .set_index("zmiana_wspolczynnikow"),
+        }
+        for p, name in enumerate(PARAMETERS):
+            table = tables["mortality" if name == "mortality" else "table"]
+            table_years = table.columns.astype(int).to_numpy()
+            first_year = int(table_years[0])
+            for s, row in enumerate(SOURCE_ROWS[name]):
+                impacts[i, p, s] = np.interp(years, table_years, table.loc[row].to_numpy(float))
+    return impacts, first_year
+
+
+@dataclass
+class TornadoBar:
+    parameter: str
+    change: str  # size of the change, e.g. "1pp"
+    pension: Dict[str, float]  # "+" / "-" -> monthly pension (PLN, in the requested prices)
+    pension_real: Dict[str, float]  # same in current-year prices
+    fund_balance_bn: Dict[str, float]  # change of the fund balance in the retirement year
+
+    @property
+    def swing(self) -> float:
+        return abs(self.pension_real["+"] - self.pension_real["-"])
+
+
+@dataclass
+class Tornado:
+    pension: float  # baseline monthly pension (PLN, in the requested prices)
+    pension_real: float
+    retirement_year: int
+    bars: List[TornadoBar]  # widest swing first
+
+
+class SensitivityAnalyzer:
+    """
+    Elasticities and the path multipliers of every parameter change are prepared once;
+    `tornado` evaluates a career under all of them in one batched run.
+    """
+
+    def __init__(self, pipeline: SimulationPipeline, data_dir: str = DATA_DIR):
+        self.pipeline = pipeline
+        self.impacts, self.first_year = load_impacts(pipeline.years, data_dir)
+        self.adjustments = self._path_adjustments()
+
+    def _path_adjustments(self) -> PathAdjustments:
+        """Multipliers of rows [baseline, p1 +, p1 -, p2 +, ...] (divisor set per career)."""
+        pipeline = self.pipeline
+        years = pipeline.years
+        future = years > pipeline.current_year
+        lagged = pipeline._year_pos(self.first_year + years - pipeline.current_year - 1)
+        revenue = 1 + self.impacts[IMPACTS.index("wplywy_proc")][:, :, lagged] / 100
+        revenue = np.where(future, revenue, 1.0)  # [parameter, +/-, year]
+        revenue_growth = revenue / np.concatenate([revenue[..., :1], revenue[..., :-1]], axis=-1)
+
+        rows = 1 + 2 * len(PARAMETERS)
+        wage, valorization, prices = np.ones((3, rows, len(years)))
+        for p, name in enumerate(PARAMETERS):
+            for s, sign in enumerate((1, -1)):
+                row = 1 + 2 * p + s
+                step = np.where(future, 1 + sign * PP, 1.0)
+                valorization[row] = revenue_growth[p, s]
+                if name in ("inflation", "wage_growth"):
+                    wage[row] = step
+                if name in ("inflation", "valorization"):
+                    valorization[row] *= step
+                if name == "inflation":
+                    prices[row] = step
+        return PathAdjustments(wage_growth=wage, valorization=valorization, price_growth=prices)
+
+    def _divisor(self, batch: CareerBatch) -> np.ndarray:
+        shift = np.log1p(MORTALITY_CHANGE) / GOMPERTZ_SLOPE  # years the survival curve moves
+        divisor = np.ones(1 + 2 * len(PARAMETERS))
+        time = self.pipeline.retirement_time(batch)
+        base = self.pipeline.divisor_months(batch.sex, batch.retirement_age, time)
+        row = 1 + 2 * PARAMETERS.index("mortality")
+        for s, sign in enumerate((1, -1)):
+            age = batch.retirement_age + sign * shift
+            older = self.pipeline.divisor_months(batch.sex, age, time)
+            divisor[row + s] = (older / base)[0]
+        return divisor
+
+    def tornado(self, batch: CareerBatch, prices: Prices = "nominal") -> Tornado:
+        if len(batch) != 1:
+            raise ValueError("Sensitivity analysis takes a single career")
+        adjustments = replace(self.adjustments, divisor=self._divisor(batch))
+        rows = batch.repeat(len(adjustments.divisor))
+        result = self.pipeline.run(rows, adjustments, prices)
+
+        year = int(result.retirement_year[0])
+        saldo = self.impacts[IMPACTS.index("saldo_mld_zl"), :, :, self.pipeline._year_pos(year)]
+        bars = []
+        for p, name in enumerate(PARAMETERS):
+            rows = (1 + 2 * p, 2 + 2 * p)
+            bars.append(
+                TornadoBar(
+                    parameter=name,
+                    change=CHANGES[name],
+                    pension=dict(zip("+-", map(float, result.pension[list(rows)]))),
+                    pension_real=dict(zip("+-", map(float, result.pension_real[list(rows)]))),
+                    fund_balance_bn={k: round(float(v), 2) for k, v in zip("+-", saldo[p])},
+                )
+            )
+        bars.sort(key=lambda bar: bar.swing, reverse=True)
+        return Tornado(
+            pension=float(result.pension[0]),
+            pension_real=float(result.pension_real[0]),
+            retirement_year=year,
+            bars=bars,
+        )
+
+
+@lru_cache(maxsize=1)
+def default_sensitivity() -> SensitivityAnalyzer:
+    return SensitivityAnalyzer(default_pipeline())
@@ -0,0 +1,13 @@
+import numpy as np
+
+MALE, FEMALE = 0, 1
+
+
+def sex_code(sex) -> np.ndarray:
+    """Encode sex as MALE/FEMALE; 'f' and 'k' mean female, like in the API endpoints."""
+    if isinstance(sex, str):
+        return np.array([FEMALE if sex.lower() in ("f", "k") else MALE], dtype=np.int8)
+    arr = np.atleast_1d(np.asarray(sex))
+    if arr.dtype.kind in "iub":
+        return arr.astype(np.int8)
+    return np.isin(np.char.lower(arr.astype(str)), ["f", "k"]).astype(np.int8)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from typing import Callable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from data.functionalities.microsimulation import (
+    CHUNK_SIZE,
+    CohortTotals,
+    MicrosimulationReport,
+    PopulationModel,
+)
+from data.functionalities.monte_carlo import (
+    MAX_MEMORY_BYTES,
+    PERCENTILES,
+    FanChart,
+    FanSketches,
+    MonteCarloEngine,
+)
+from data.functionalities.samplers import SamplingMethod
+from data.functionalities.simulation_pipeline import (
+    CareerBatch,
+    SimulationPipeline,
+    SimulationResult,
+)
+
+# Shard-and-reduce execution on every core.
+#
+# Work is cut into shards of a fixed size (never "one shard per worker"), every shard of a
+# Monte Carlo run draws from its own `SeedSequence` child, and partial results are reduced
+# in shard order. The output is therefore bit-for-bit the same for 1 or 64 workers.
+#
+# Workers attach to the parent's pipeline through the pool initializer: with the fork
+# start method the forecast tables are inherited copy-on-write, with spawn they are
+# pickled once per worker - never re-read from the CSVs and never sent with each shard.
+
+_worker_pipeline: Optional[SimulationPipeline] = None
+
+
+def _attach(pipeline: SimulationPipeline):
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def _monte_carlo_shard(
+    batch: CareerBatch,
+    paths: int,
+    seed: np.random.SeedSequence,
+    sampling: SamplingMethod,
+    variant_weights,
+    max_memory_bytes: int,
+) -> FanSketches:
+    engine = MonteCarloEngine(_worker_pipeline, sampling=sampling)
+    rng = np.random.default_rng(seed)
+    return engine.fan_sketches(batch, paths, rng, variant_weights, max_memory_bytes)
+
+
+def _microsimulation_shard(
+    model: PopulationModel, persons: int, seed: np.random.SeedSequence
+) -> CohortTotals:
+    return model.simulate_chunk(_worker_pipeline, persons, seed)
+
+
+def _batch_shard(batch: CareerBatch) -> SimulationResult:
+    return _worker_pipeline.run(batch)
+
+
+def _take(batch: CareerBatch, rows: slice) -> CareerBatch:
+    return CareerBatch(**{f.name: getattr(batch, f.name)[rows] for f in fields(batch)})
+
+
+class ShardedRunner:
+    """
+    Runs Monte Carlo paths, batches of persons or a synthetic population on a process
+    pool. `workers=0` runs the shards in-process, which gives the same results and is
+    handy in tests.
+    """
+
+    def __init__(self, pipeline: SimulationPipeline, workers: Optional[int] = None):
+        self.pipeline = pipeline
+        self.workers = os.cpu_count() if workers is None else workers
+
+    def _imap(self, fn: Callable, shards: Sequence[tuple]) -> Iterator:
+        """Shard results in shard order, yielded as they complete so callers reduce on the fly."""
+        if self.workers == 0 or len(shards) == 1:
+            _attach(self.pipeline)
+            yield from (fn(*shard) for shard in shards)
+            return
+        workers = min(self.workers, len(shards))
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(self.pipeline,)) as pool:
+            yield from pool.map(fn, *zip(*shards))
+
+    def _map(self, fn: Callable, shards: Sequence[tuple]) -> List:
+        return list(self._imap(fn, shards))
+
+    def monte_carlo(
+        self,
+        batch: CareerBatch,
+        paths: int,
+        seed=None,
+        sampling: SamplingMethod = "pseudo",
+        variant_weights: Optional[Sequence[float]] = None,
+        shard_paths: int = 25_000,
+        max_memory_bytes: int = MAX_MEMORY_BYTES,
+        q: Sequence[float] = PERCENTILES,
+    ) -> FanChart:
+        """Fan chart over `paths` paths; memory per worker is capped by `max_memory_bytes`."""
+        sizes = [min(shard_paths, paths - lo) for lo in range(0, paths, shard_paths)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        shards = [
+            (batch, n, child, sampling, variant_weights, max_memory_bytes)
+            for n, child in zip(sizes, seeds)
+        ]
+        partials = self._map(_monte_carlo_shard, shards)
+        merged = partials[0]
+        for partial in partials[1:]:
+            merged.merge(partial)
+        return merged.chart(q)
+
+    def microsimulate(
+        self, model: PopulationModel, persons: int, seed=None, chunk_size: int = CHUNK_SIZE
+    ) -> MicrosimulationReport:
+        """
+        Per-year totals of `persons` synthetic insured drawn from `model`, `chunk_size`
+        persons per shard. Only one chunk per worker and the running totals are in memory.
+        """
+        start = time.perf_counter()
+        sizes = [min(chunk_size, persons - lo) for lo in range(0, persons, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        partials = self._imap(_microsimulation_shard, [(model, *s) for s in zip(sizes, seeds)])
+        totals = next(partials)
+        for partial in partials:
+            totals.merge(partial)
+        return MicrosimulationReport(totals, time.perf_counter() - start, self.workers)
+
+    def run(self, batch: CareerBatch, shard_rows: int = 100_000) -> SimulationResult:
+        """`SimulationPipeline.run` over a large batch of persons, rows kept in order."""
+        shards = [
+            (_take(batch, slice(lo, lo + shard_rows)),) for lo in range(0, len(batch), shard_rows)
+        ]
+        results = self._map(_batch_shard, shards)
+        return SimulationResult(
+            **{
+                f.name: np.concatenate([getattr(r, f.name) for r in results])
+                for f in fields(SimulationResult)
+            }
+        )
@@ -1,8 +1,45 @@
 from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from data.functionalities.sex_codes import FEMALE, MALE
+
+# Career-level sick leave: absence curves by sex and age.
+#
+# During sick leave (wynagrodzenie / zasiłek chorobowy) no pension contributions are paid,
+# so a year with a share a of working days lost to sickness contributes (1 - a) of the
+# usual amount. ABSENCE_DAYS holds yearly days of absence at anchor ages - shaped after
+# ZUS absence statistics (rising with age, higher for women of working age) - and is
+# interpolated once into a dense [sex, age] array of shares of the year.
+# `SimulationPipeline.contribution_timeline` multiplies the timeline by 1 - curve at the
+# age in each year for rows with `CareerBatch.sick_leave`, so the career model costs one
+# gather and one multiply. `SickLeaveAdjustment` keeps the flat reduction of a final
+# pension for callers without a contribution history.
+
+MAX_AGE = 100
+ANCHOR_AGES = (18, 25, 30, 40, 50, 60, 65)
+ABSENCE_DAYS = {  # calendar days of sick leave a year at ANCHOR_AGES
+    MALE: (7, 8, 9, 11, 15, 22, 25),
+    FEMALE: (9, 13, 15, 15, 18, 22, 22),
+}
+
+
+@lru_cache(maxsize=1)
+def absence_curves() -> np.ndarray:
+    """Share of the year on sick leave, [sex, age 0..MAX_AGE]; flat outside the anchors."""
+    ages = np.arange(MAX_AGE + 1)
+    curves = np.empty((2, len(ages)))
+    for sex, days in ABSENCE_DAYS.items():
+        curves[sex] = np.interp(ages, ANCHOR_AGES, days) / 365.0
+    curves.setflags(write=False)
+    return curves
+
 
 @dataclass
 class SickLeaveResult:
     """Stores comparison between normal and sick-leave-adjusted pension."""
+
     base_pension: float
     adjusted_pension: float
     difference: float
@@ -35,9 +72,7 @@ class SickLeaveAdjustment:
         diff = round(pension_amount - adjusted, 2)
 
         return SickLeaveResult(
-            base_pension=round(pension_amount, 2),
-            adjusted_pension=adjusted,
-            difference=diff
+            base_pension=round(pension_amount, 2), adjusted_pension=adjusted, difference=diff
         )
 
 
@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from functools import lru_cache
+from typing import Literal, Optional
+
+import numpy as np
+
+from data.functionalities.annuity_divisor import projected_divisors
+from data.functionalities.initial_capital import REFORM_YEAR, convert_pre_reform_service
+from data.functionalities.pension_calculator import PensionCalculator
+from data.functionalities.sex_codes import FEMALE, MALE, sex_code
+from data.functionalities.sick_leave_adjustment import absence_curves
+from data.functionalities.valorization_engine import (
+    DataPaths,
+    ForecastData,
+    ValorizationEngine,
+    ValorizationIndexBuilder,
+    _interpolate_yearly_factors,
+)
+from data.functionalities.wage_indexation import WageIndexationEngine
+
+# Vectorized career simulation: salary path -> contributions -> valorization -> annuity.
+#
+# Every step works on whole batches of people as [people, years] arrays, so evaluating
+# one person or ten thousand candidate scenarios costs a single pass through NumPy.
+#
+# Assumptions (on top of the ones in valorization_engine.py):
+#
+# 1) Salary path:
+#    The user's salary is given in current-year PLN and moves with the average wage:
+#       salary_t = salary * W_t / W_{current_year}
+#    W is the cumulative nominal wage index of `WageIndexationEngine`: history from
+#    `wynagrodzenia_historyczne.csv`, forecast from realny_wzrost_wynagrodzen * inflacja_ogolna
+#    of the chosen variant.
+#
+# 2) Account valorization:
+#    Revenue-based account index where the forecast has it, nominal wage growth
+#    (floored at 1.0) before that. Contributions paid in year t are valorized with the
+#    indices of years t..R-1, R being the retirement year. Initial capital for service
+#    before REFORM_YEAR (`initial_capital.py`) is valorized with those of REFORM_YEAR..R-1.
+#
+# 3) Time is continuous:
+#    Career start and retirement may fall inside a year (age in months / 12); the year's
+#    contribution is weighted by the fraction of the year actually worked. Rows with
+#    `sick_leave` also lose the share of the year spent on sick leave at their age in that
+#    year (`sick_leave_adjustment.absence_curves`), as no contributions are paid on sick pay.
+#
+# 4) Annuity divisor:
+#    Remaining life expectancy in months from the (projected) life table of the retirement
+#    year, at the retirement age in whole months (`annuity_divisor.DivisorTable`), with the
+#    60-month floor of `PensionCalculator`. Without a life tables path in `DataPaths` the
+#    flat LIFE_EXPECTANCY_YEARS are used.
+#
+# 5) Real values:
+#    Prices move with inflacja_ogolna of the variant; `pension_real` is the pension in
+#    current-year prices, deflated with the CPI up to the last working year.
+#    `run(..., prices="real")` returns all money columns in current-year prices: the
+#    deflator [variant, year] is built once and applied to whole result arrays.
+#
+# `run` optionally takes `PathAdjustments`: per-row multipliers on the wage, valorization
+# and price growth paths and on the divisor, so what-if scenarios of one career are
+# evaluated as extra rows of the same batch.
+
+# Bump whenever a change alters pipeline results, so precomputed tables get rebuilt.
+PIPELINE_VERSION = 3
+
+FIRST_YEAR = 1950
+LAST_YEAR = 2100
+
+CONTRIBUTION_RATE = 0.1952  # 19.52% składka emerytalna
+RETIREMENT_AGE = {MALE: 65, FEMALE: 60}
+LIFE_EXPECTANCY_YEARS = {MALE: 78, FEMALE: 82}  # fallback without life tables
+
+Prices = Literal["nominal", "real"]  # "real" = current-year prices
+
+
+@dataclass
+class CareerBatch:
+    """Column-wise description of many careers (one row per person or scenario)."""
+
+    age: np.ndarray  # current age (years)
+    sex: np.ndarray  # MALE / FEMALE
+    salary: np.ndarray  # current monthly gross salary (PLN, current-year prices)
+    start_year: np.ndarray  # first year of contributions (may be fractional)
+    retirement_age: np.ndarray  # age at retirement (may be fractional, months / 12)
+    variant: np.ndarray  # macro variant 1, 2, 3
+    contribution_rate: np.ndarray  # share of the gross salary going to the account
+    extra_contribution: np.ndarray  # extra monthly contribution from now on (PLN, current prices)
+    funds: np.ndarray  # capital already accumulated (PLN)
+    end_year: np.ndarray  # end of contributions (inf = until retirement)
+    sick_leave: np.ndarray  # weight of the sick-leave absence curves (0 = none, 1 = average)
+    initial_capital: np.ndarray  # kapitał początkowy as of Jan 1 REFORM_YEAR (PLN)
+
+    @classmethod
+    def build(
+        cls,
+        age,
+        sex,
+        salary,
+        start_year,
+        retirement_age=None,
+        variant=2,
+        contribution_rate=CONTRIBUTION_RATE,
+        extra_contribution=0.0,
+        funds=0.0,
+        end_year=np.inf,
+        sick_leave=0.0,
+        initial_capital=0.0,
+    ) -> CareerBatch:
+        """Broadcast scalar / array inputs into a batch; default retirement age is statutory."""
+        sex = sex_code(sex)
+        if retirement_age is None:
+            retirement_age = np.where(sex == FEMALE, RETIREMENT_AGE[FEMALE], RETIREMENT_AGE[MALE])
+        values = (
+            age, sex, salary, start_year, retirement_age, variant,
+            contribution_rate, extra_contribution, funds, end_year, sick_leave, initial_capital,
+        )  # fmt: skip
+        columns = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=float)) for x in values))
+        columns = [c.copy() for c in columns]
+        columns[1] = columns[1].astype(np.int8)
+        columns[5] = columns[5].astype(np.int8)
+        return cls(*columns)
+
+    def __len__(self) -> int:
+        return len(self.age)
+
+    def with_values(self, **changes) -> CareerBatch:
+        """Copy of the batch with some columns replaced (scalars are broadcast)."""
+        values = {f.name: getattr(self, f.name) for f in fields(self)}
+        for name, value in changes.items():
+            if name not in values:
+                raise ValueError(f"Unknown CareerBatch column: {name}")
+            dtype = values[name].dtype
+            values[name] = np.broadcast_to(np.asarray(value, dtype=dtype), (len(self),)).copy()
+        return CareerBatch(**values)
+
+    def repeat(self, k: int) -> CareerBatch:
+        """Each row repeated k times in place: rows [0,0,..,1,1,..] - used to stack candidates."""
+        return CareerBatch(**{f.name: np.repeat(getattr(self, f.name), k) for f in fields(self)})
+
+
+@dataclass
+class SimulationResult:
+    capital: np.ndarray  # capital at retirement (PLN, nominal)
+    pension: np.ndarray  # monthly pension (PLN, nominal)
+    divisor_months: np.ndarray  # annuity divisor used
+    retirement_year: np.ndarray  # calendar year of retirement
+    last_wage: np.ndarray  # monthly salary in the last working year (PLN, nominal)
+    replacement_rate: np.ndarray  # pension / last wage (%)
+    pension_real: np.ndarray  # monthly pension in current-year prices
+
+
+@dataclass
+class PathAdjustments:
+    """
+    Per-row multipliers on the yearly paths, each of shape [rows, grid years] (None = as
+    forecast). A growth factor scaled in year t changes every later level of the path.
+    """
+
+    wage_growth: Optional[np.ndarray] = None  # nominal wage growth
+    valorization: Optional[np.ndarray] = None  # account valorization (still floored at 1.0)
+    price_growth: Optional[np.ndarray] = None  # CPI
+    divisor: Optional[np.ndarray] = None  # annuity divisor, shape [rows]
+
+
+def _relative_cumprod(factors: np.ndarray, base_col: int) -> np.ndarray:
+    index = np.cumprod(factors, axis=1)
+    return index / index[:, [base_col]]
+
+
+class SimulationPipeline:
+    """
+    Yearly wage and valorization indices for all variants are built once in the
+    constructor; `run` is then pure array arithmetic over the batch.
+    """
+
+    def __init__(self, data: ForecastData, current_year: Optional[int] = None):
+        self.data = data
+        self.current_year = current_year or datetime.now().year
+        self.years = np.arange(FIRST_YEAR, LAST_YEAR + 1)
+        self.wages = WageIndexationEngine(data.paths.wages_history, data, FIRST_YEAR, LAST_YEAR)
+        self.wage_growth = self.wages.growth  # [variant, year]
+        self.wage_index = self.wages.relative_index(self.current_year)
+        self.valorization = self._build_valorization()  # [variant, year]
+        self.valorization_index = np.cumprod(self.valorization, axis=1)
+        self.valorization_before = self.valorization_index / self.valorization  # up to year t-1
+        self.price_growth = self.macro_series("cpi_factor")  # [variant, year]
+        self.price_index = _relative_cumprod(self.price_growth, self._year_pos(self.current_year))
+        self.deflator = 1.0 / self.price_index  # nominal PLN of year t -> current-year prices
+        self.absence = absence_curves()  # [sex, age] share of the year on sick leave
+        tables = data.paths.life_tables
+        self.divisors = projected_divisors(tables) if tables else None
+
+    def _year_pos(self, year):
+        return np.clip(np.asarray(year) - FIRST_YEAR, 0, len(self.years) - 1).astype(np.intp)
+
+    def macro_series(self, column: str) -> np.ndarray:
+        """Yearly series of a `load_macro` column on the grid, [variant, year]."""
+        series = np.empty((3, len(self.years)))
+        for v in (1, 2, 3):
+            macro = self.data.load_macro(v)
+            df = _interpolate_yearly_factors(macro[["rok", column]], "rok", (column,))
+            series[v - 1] = np.interp(self.years, df["rok"].to_numpy(), df[column].to_numpy())
+        return series
+
+    def _build_valorization(self) -> np.ndarray:
+        engine = ValorizationEngine(ValorizationIndexBuilder(self.data))
+        valorization = np.maximum(self.wage_growth, 1.0)
+        for v in (1, 2, 3):
+            idx = engine.idx_builder.build_account_and_initial_capital_indices(v)
+            # first row has no previous year (index defaults to 1.0) - keep the proxy there
+            idx = idx.iloc[1:]
+            rows = self._year_pos(idx["rok"].to_numpy())
+            valorization[v - 1, rows] = idx["account_index"].to_numpy()
+            valorization[v - 1, rows.max() + 1 :] = idx["account_index"].iloc[-1]
+        return valorization
+
+    # --- building blocks -------------------------------------------------
+
+    def retirement_time(self, batch: CareerBatch) -> np.ndarray:
+        """Calendar time of retirement (e.g. 2051.5 = mid-2051)."""
+        return self.current_year - batch.age + batch.retirement_age
+
+    def timeline_window(self, batch: CareerBatch) -> slice:
+        """Grid columns touched by any career in the batch - the rest is skipped."""
+        first = np.floor(batch.start_year.min())
+        last = np.ceil(np.minimum(batch.end_year, self.retirement_time(batch)).max())
+        return slice(int(self._year_pos(first)), int(self._year_pos(last)) + 1)
+
+    def contribution_timeline(
+        self,
+        batch: CareerBatch,
+        window: Optional[slice] = None,
+        adjustments: Optional[PathAdjustments] = None,
+    ) -> np.ndarray:
+        """Yearly contributions paid into the account, shape [people, years in window] (PLN, nominal)."""
+        window = window or slice(None)
+        retire = self.retirement_time(batch)
+        end = np.minimum(batch.end_year, retire)
+        years = self.years[window][None, :]
+
+        worked = np.clip(
+            np.minimum(end[:, None], years + 1) - np.maximum(batch.start_year[:, None], years),
+            0.0,
+            1.0,
+        )
+        wage_index = self.row_wage_index(batch, adjustments, window)
+        monthly = batch.salary[:, None] * batch.contribution_rate[:, None]
+        if batch.sick_leave.any():
+            # no contributions on sick pay: scale by the days worked at the age of each year
+            age = np.floor(batch.age[:, None] + (years - self.current_year)).astype(np.intp)
+            absent = self.absence[batch.sex[:, None], np.clip(age, 0, self.absence.shape[1] - 1)]
+            monthly = monthly * (1.0 - batch.sick_leave[:, None] * absent)
+        monthly = monthly + batch.extra_contribution[:, None] * (years >= self.current_year)
+        return monthly * wage_index * 12.0 * worked
+
+    def sick_leave_factor(self, batch: CareerBatch) -> np.ndarray:
+        """
+        Mean of 1 - absence over each row's career, weighted by the valorized contributions:
+        the share of the contribution capital left with sick leave (weight 1), for estimates
+        that never build the timeline themselves.
+        """
+        window = self.timeline_window(batch)
+        before = self.valorization_before[batch.variant - 1][:, window]
+        healthy = self.contribution_timeline(batch.with_values(sick_leave=0.0), window)
+        sick = self.contribution_timeline(batch.with_values(sick_leave=1.0), window)
+        healthy, sick = (healthy / before).sum(axis=1), (sick / before).sum(axis=1)
+        return np.divide(sick, healthy, out=np.ones_like(healthy), where=healthy > 0)
+
+    def row_wage_index(
+        self,
+        batch: CareerBatch,
+        adjustments: Optional[PathAdjustments] = None,
+        window: slice = slice(None),
+    ) -> np.ndarray:
+        """Wage index of each row relative to the current year, [rows, years in window]."""
+        index = self.wage_index[:, window][batch.variant - 1]
+        if adjustments is not None and adjustments.wage_growth is not None:
+            now = self._year_pos(self.current_year)
+            index = index * _relative_cumprod(adjustments.wage_growth, now)[:, window]
+        return index
+
+    def row_price_index(
+        self, batch: CareerBatch, adjustments: Optional[PathAdjustments] = None
+    ) -> np.ndarray:
+        """Price level of each row relative to the current year, [rows, grid years]."""
+        if adjustments is None or adjustments.price_growth is None:
+            return self.price_index[batch.variant - 1]
+        growth = self.price_growth[batch.variant - 1] * adjustments.price_growth
+        return _relative_cumprod(growth, self._year_pos(self.current_year))
+
+    def capital(
+        self,
+        batch: CareerBatch,
+        adjustments: Optional[PathAdjustments] = None,
+        groups: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Valorized capital at retirement; service before REFORM_YEAR is initial capital."""
+        batch = convert_pre_reform_service(self, batch, groups)
+        window = self.timeline_window(batch)
+        timeline = self.contribution_timeline(batch, window, adjustments)
+        rows = batch.variant - 1
+        last = self._last_year_pos(batch)
+        now = self._year_pos(self.current_year)
+
+        index, before = self.valorization_index, self.valorization_before
+        if adjustments is not None and adjustments.valorization is not None:
+            valorization = np.maximum(self.valorization[rows] * adjustments.valorization, 1.0)
+            index = np.cumprod(valorization, axis=1)
+            before = index / valorization
+            rows = np.arange(len(batch))
+
+        at_retirement = index[rows, last]
+        # contribution of year t grows by the indices of years t..R-1
+        contributions = (timeline / before[:, window][rows]).sum(axis=1) * at_retirement
+        funds = batch.funds * at_retirement / before[rows, now]
+        # initial capital is valorized with the account index from REFORM_YEAR on
+        initial = batch.initial_capital * at_retirement / before[rows, self._year_pos(REFORM_YEAR)]
+        return contributions + funds + initial
+
+    def divisor_months(self, sex, retirement_age, retirement_time) -> np.ndarray:
+        """
+        Remaining life expectancy at retirement (months), floored like PensionCalculator.
+        The life table is the one of the last valorized year, ceil(retirement time) - 1:
+        the year before retirement for a retirement on January 1st (ZUS also applies the
+        table published for the previous year).
+        """
+        sex = sex_code(sex)
+        if self.divisors is not None:
+            table_year = np.ceil(np.asarray(retirement_time, dtype=float)) - 1
+            months = self.divisors.months(sex, retirement_age, table_year)
+        else:
+            life_expectancy = np.where(
+                sex == FEMALE, LIFE_EXPECTANCY_YEARS[FEMALE], LIFE_EXPECTANCY_YEARS[MALE]
+            )
+            months = (life_expectancy - np.asarray(retirement_age, dtype=float)) * 12
+        return np.maximum(PensionCalculator.MIN_LIFE_EXPECTANCY_MONTHS, months)
+
+    def price_factor(
+        self, variant, retirement_time, prices: Prices = "nominal", years_after=0
+    ) -> np.ndarray:
+        """
+        Multiplier from nominal PLN of the last working year (plus `years_after`, e.g.
+        retirement delays) to the requested prices: 1 for nominal, the deflator for real.
+        Arguments broadcast, so a whole delay table is converted in one multiply.
+        """
+        year = np.ceil(np.asarray(retirement_time, dtype=float)) - 1 + np.asarray(years_after)
+        variant = np.asarray(variant)
+        if prices == "nominal":
+            return np.ones(np.broadcast_shapes(variant.shape, year.shape))
+        return self.deflator[variant - 1, self._year_pos(year)]
+
+    def average_wage(self) -> np.ndarray:
+        """Average monthly wage of the current year per variant: last known wage, indexed."""
+        history = self.wages.df_history
+        last_year = int(history["year"].iloc[-1])
+        return float(history["wage"].iloc[-1]) / self.wage_index[:, self._year_pos(last_year)]
+
+    def _last_year_pos(self, batch: CareerBatch) -> np.ndarray:
+        return self._year_pos(np.ceil(self.retirement_time(batch)) - 1)
+
+    def last_wage(
+        self, batch: CareerBatch, adjustments: Optional[PathAdjustments] = None
+    ) -> np.ndarray:
+        last = self._last_year_pos(batch)
+        if adjustments is None or adjustments.wage_growth is None:
+            return batch.salary * self.wage_index[batch.variant - 1, last]
+        index = self.row_wage_index(batch, adjustments)
+        return batch.salary * index[np.arange(len(batch)), last]
+
+    def blocks_to_batch(
+        self,
+        person,
+        age,
+        sex,
+        years,
+        salary,
+        contribution_rate=CONTRIBUTION_RATE,
+        retirement_age=None,
+        variant=2,
+        sick_leave=0.0,
+    ) -> CareerBatch:
+        """
+        One row per work block; blocks of a person are consecutive rows in chronological
+        order, laid back to back so that the last one ends at retirement. Service before
+        REFORM_YEAR is converted to the blocks' initial capital, per person.
+        """
+        person = np.asarray(person)
+        batch = CareerBatch.build(
+            age=age,
+            sex=sex,
+            salary=salary,
+            start_year=0.0,
+            retirement_age=retirement_age,
+            variant=variant,
+            contribution_rate=contribution_rate,
+            sick_leave=sick_leave,
+        )
+        years = np.broadcast_to(np.asarray(years, dtype=float), (len(batch),))
+        # years worked after each block = person's total - running total including the block
+        running = np.cumsum(years)
+        first = np.r_[0, np.flatnonzero(np.diff(person)) + 1]
+        offsets = np.repeat(running[first] - years[first], np.diff(np.r_[first, len(person)]))
+        later = np.bincount(person, years)[person] - (running - offsets)
+
+        end = self.retirement_time(batch) - later
+        batch = batch.with_values(start_year=end - years, end_year=end)
+        # the social part of the initial capital is shared by the blocks of a person
+        return convert_pre_reform_service(self, batch, person)
+
+    def run_grouped(
+        self, batch: CareerBatch, groups, prices: Prices = "nominal"
+    ) -> SimulationResult:
+        """Like `run`, but rows sharing a group id (e.g. work blocks of a person) are summed."""
+        groups = np.asarray(groups)
+        last_row = np.r_[np.flatnonzero(np.diff(groups)), len(groups) - 1]
+        capital = np.bincount(groups, self.capital(batch, groups=groups))[groups[last_row]]
+        return self._result(batch, capital, last_row, prices=prices)
+
+    def run(
+        self,
+        batch: CareerBatch,
+        adjustments: Optional[PathAdjustments] = None,
+        prices: Prices = "nominal",
+    ) -> SimulationResult:
+        """Capital, pension and last wage in `prices`; `pension_real` is always real."""
+        capital = self.capital(batch, adjustments)
+        return self._result(batch, capital, slice(None), adjustments, prices)
+
+    def _result(
+        self,
+        batch: CareerBatch,
+        capital: np.ndarray,
+        rows,
+        adjustments: Optional[PathAdjustments] = None,
+        prices: Prices = "nominal",
+    ) -> SimulationResult:
+        retirement_time = self.retirement_time(batch)[rows]
+        divisor = self.divisor_months(batch.sex[rows], batch.retirement_age[rows], retirement_time)
+        if adjustments is not None and adjustments.divisor is not None:
+            divisor = divisor * adjustments.divisor[rows]
+        pension = capital / divisor
+        last_wage = self.last_wage(batch, adjustments)[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            replacement = np.where(last_wage > 0, pension / last_wage * 100, 0.0)
+        last = self._last_year_pos(batch)[rows]
+        if adjustments is None or adjustments.price_growth is None:
+            deflator = self.deflator[batch.variant[rows] - 1, last]
+        else:
+            prices_at = self.row_price_index(batch, adjustments)[rows]
+            deflator = 1.0 / prices_at[np.arange(len(last)), last]
+        factor = deflator if prices == "real" else 1.0
+        return SimulationResult(
+            capital=capital * factor,
+            pension=pension * factor,
+            divisor_months=divisor,
+            retirement_year=np.floor(retirement_time).astype(int),
+            last_wage=last_wage * factor,
+            replacement_rate=replacement,
+            pension_real=pension * deflator,
+        )
+
+
+@lru_cache(maxsize=1)
+def default_pipeline() -> SimulationPipeline:
+    """Pipeline over the shipped CSVs, shared by the API endpoints."""
+    return SimulationPipeline(ForecastData(DataPaths.default()))
@@ -56,12 +56,29 @@ def _interpolate_yearly_factors(df: pd.DataFrame, year_col: str, factor_cols: Tu
 
 
 # Data loaders
+DATA_DIR = "data/dane_emerytalne"
+
+
 @dataclass
 class DataPaths:
     macro_variant_1: str  # parametry_makroekonomiczne_wariant_1.csv
     macro_variant_2: str  # parametry_makroekonomiczne_wariant_2.csv
     macro_variant_3: str  # parametry_makroekonomiczne_wariant_3.csv
     revenues: str         # wplywy_skladkowe_mln_zl.csv
+    wages_history: Optional[str] = None  # wynagrodzenia_historyczne.csv
+    life_tables: Optional[str] = None  # tablice_trwania_zycia_w_latach_1990-2022.xlsx
+
+    @classmethod
+    def default(cls, data_dir: str = DATA_DIR) -> "DataPaths":
+        """Paths to the CSVs shipped in `dane_emerytalne` (relative to the app directory)."""
+        return cls(
+            macro_variant_1=f"{data_dir}/parametry_makroekonomiczne_wariant_1.csv",
+            macro_variant_2=f"{data_dir}/parametry_makroekonomiczne_wariant_2.csv",
+            macro_variant_3=f"{data_dir}/parametry_makroekonomiczne_wariant_3.csv",
+            revenues=f"{data_dir}/wplywy_skladkowe_mln_zl.csv",
+            wages_history=f"{data_dir}/wynagrodzenia_historyczne.csv",
+            life_tables=f"{data_dir}/tablice_trwania_zycia_w_latach_1990-2022.xlsx",
+        )
 
 
 class ForecastData:
@@ -69,6 +86,7 @@ class ForecastData:
         self.paths = paths
         self._macro: Dict[Variant, pd.DataFrame] = {}
         self._revenues: Optional[pd.DataFrame] = None
+        self._wages_history: Optional[pd.DataFrame] = None
 
     def load_macro(self, variant: Variant) -> pd.DataFrame:
         if variant in self._macro:
@@ -89,9 +107,20 @@ class ForecastData:
         df["real_gdp_factor"] = df["realny_wzrost_PKB"] / 100.0
         # Nominal GDP factor proxy
         df["nominal_gdp_factor"] = df["cpi_factor"] * df["real_gdp_factor"]
+        # Nominal wage growth drives the users' salary paths
+        df["real_wage_factor"] = df["realny_wzrost_wynagrodzen"] / 100.0
+        df["nominal_wage_factor"] = df["cpi_factor"] * df["real_wage_factor"]
+        # Share of due contributions actually collected
+        df["collection_rate"] = df["sciagalnosc_skladek"] / 100.0
+        df["pensioner_cpi_factor"] = df["inflacja_emeryci"] / 100.0
+        df["unemployment_rate"] = df["stopa_bezrobocia"] / 100.0
 
         # Keep only needed columns
-        df = df[["rok", "cpi_factor", "real_gdp_factor", "nominal_gdp_factor"]].copy()
+        df = df[
+            ["rok", "cpi_factor", "real_gdp_factor", "nominal_gdp_factor",
+             "real_wage_factor", "nominal_wage_factor", "collection_rate",
+             "pensioner_cpi_factor", "unemployment_rate"]
+        ].copy()
         self._macro[variant] = df
         return df
 
@@ -103,6 +132,16 @@ class ForecastData:
         self._revenues = df
         return df
 
+    def load_wages_history(self) -> pd.DataFrame:
+        if self._wages_history is not None:
+            return self._wages_history
+        if self.paths.wages_history is None:
+            raise ValueError("DataPaths.wages_history is not set")
+        # columns: wage, year (average monthly gross wage in PLN)
+        df = pd.read_csv(self.paths.wages_history).sort_values("year").reset_index(drop=True)
+        self._wages_history = df
+        return df
+
 
 # Valorization index builders
 class ValorizationIndexBuilder:
@@ -126,6 +165,12 @@ class ValorizationIndexBuilder:
         rev = rev[["rok", col]].rename(columns={col: "revenues"})
         rev = rev.sort_values("rok").reset_index(drop=True)
 
+        # The table jumps 2032 -> 2035 -> 2040...; a ratio across such a gap would be a
+        # multi-year growth booked as a single year, so fill the gaps geometrically first.
+        rev["revenues"] = np.log(rev["revenues"])
+        rev = _interpolate_yearly_factors(rev, "rok", ("revenues",))
+        rev["revenues"] = np.exp(rev["revenues"])
+
         rev["prev_revenues"] = rev["revenues"].shift(1)
         rev["account_index"] = (rev["revenues"] / rev["prev_revenues"]).fillna(1.0)
         rev["account_index"] = rev["account_index"].apply(lambda x: max(1.0, float(x)))
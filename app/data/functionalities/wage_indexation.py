@@ -1,6 +1,10 @@
 import pandas as pd
+import numpy as np
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional, Tuple
+
+from data.functionalities.valorization_engine import ForecastData, _interpolate_yearly_factors
+
 
 @dataclass
 class WageIndexation:
@@ -10,49 +14,128 @@ class WageIndexation:
 
 
 class WageIndexationEngine:
-    def __init__(self, history_path: str):
-        """
-        Engine for wage indexation using historical data.
-        """
+    """
+    Yearly nominal wage growth on a fixed grid of years, for all macro variants:
+
+    - before the history: long-run geometric mean of the historical growth,
+    - history (`wynagrodzenia_historyczne.csv`): observed year-to-year growth,
+    - after the history: realny_wzrost_wynagrodzen * inflacja_ogolna of each variant
+      (only when forecast data is given, otherwise wages are not projected past the history).
+
+    Growth factors and their cumulative products are built once; salary paths for whole
+    batches are then ratios of the cached index, both backwards and forwards in time.
+    """
+
+    def __init__(
+        self,
+        history_path: str,
+        data: Optional[ForecastData] = None,
+        first_year: int = 1950,
+        last_year: int = 2100,
+    ):
         self.history_path = history_path # path to historical wages CSV (columns: year, wage)
         self.df_history = pd.read_csv(history_path)
 
         # ensure proper ordering
         self.df_history = self.df_history.sort_values("year").reset_index(drop=True)
 
+        self.data = data
+        self.years = np.arange(first_year, last_year + 1)
+        self.last_known_year = int(self.years[-1] if data else self.df_history["year"].iloc[-1])
+        self.growth = self._build_growth()  # [variant, year]
+        self.index = np.cumprod(self.growth, axis=1)
+        self.floored_index = np.cumprod(np.maximum(self.growth, 1.0), axis=1)
+
+    def _year_pos(self, year):
+        return np.clip(np.asarray(year) - self.years[0], 0, len(self.years) - 1).astype(np.intp)
+
+    def _build_growth(self) -> np.ndarray:
+        wages = self.df_history["wage"].to_numpy(dtype=float)
+        hist_years = self.df_history["year"].to_numpy()[1:]
+        hist_growth = wages[1:] / wages[:-1]
+        growth = np.full((3, len(self.years)), float(np.exp(np.log(hist_growth).mean())))
+        growth[:, self.years > hist_years.max()] = 1.0
+
+        if self.data is not None:
+            future = self.years > hist_years.max()
+            for v in (1, 2, 3):
+                macro = _interpolate_yearly_factors(
+                    self.data.load_macro(v)[["rok", "nominal_wage_factor"]],
+                    "rok",
+                    ("nominal_wage_factor",),
+                )
+                forecast = np.interp(
+                    self.years, macro["rok"].to_numpy(), macro["nominal_wage_factor"].to_numpy()
+                )
+                growth[v - 1, future] = forecast[future]
+        inside = (hist_years >= self.years[0]) & (hist_years <= self.years[-1])
+        growth[:, self._year_pos(hist_years[inside])] = hist_growth[inside]
+        return growth
+
     def build_indices(self) -> pd.DataFrame:
         """
         Compute wage growth indices year to year.
         """
         df = self.df_history.copy()
-        df["prev_wage"] = df["wage"].shift(1)
-        df["wage_index"] = (df["wage"] / df["prev_wage"]).fillna(1.0)
+        wages = df["wage"].to_numpy(dtype=float)
+        index = np.ones(len(df))
+        index[1:] = wages[1:] / wages[:-1]
 
         # floor at 1.0 (no negative or <1 growth in simulation)
-        df["wage_index"] = df["wage_index"].apply(lambda x: max(x, 1.0))
+        df["wage_index"] = np.maximum(index, 1.0)
 
         return df[["year", "wage", "wage_index"]]
 
-    def project_user_wages(self, start_year: int, base_wage: float, end_year: int) -> Dict[int, float]:
+    def relative_index(self, base_year: int, floor: bool = False) -> np.ndarray:
+        """Cumulative wage index normalized to 1.0 in `base_year`, shape [variant, year]."""
+        index = self.floored_index if floor else self.index
+        return index / index[:, [int(self._year_pos(base_year))]]
+
+    def salary_paths(
+        self,
+        salary,
+        base_year,
+        start_year,
+        end_year,
+        variant=2,
+        floor: bool = False,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Full salary histories for a batch of people, each earning `salary` in `base_year`:
+        back-cast to `start_year` and projected to `end_year` with the wage index.
+        Returns (years, wages [people, years]); wages are 0 outside each person's span
+        and after the last year covered by the data.
         """
-        Project user wages using historical indices.
-        If end_year > max(year in history), the projection stops at last historical year.
+        salary, base_year, start_year, end_year, variant = (
+            np.atleast_1d(np.asarray(x)) for x in (salary, base_year, start_year, end_year, variant)
+        )
+        salary, base_year, start_year, end_year, variant = np.broadcast_arrays(
+            salary.astype(float), base_year, start_year, end_year, variant.astype(np.intp)
+        )
+        end_year = np.minimum(end_year, self.last_known_year)
+        window = slice(
+            int(self._year_pos(start_year.min())), int(self._year_pos(end_year.max())) + 1
+        )
+        years = self.years[window]
+
+        index = self.floored_index if floor else self.index
+        rows = variant - 1
+        base = index[rows, self._year_pos(base_year)]
+        wages = salary[:, None] * index[rows][:, window] / base[:, None]
+        active = (years[None, :] >= start_year[:, None]) & (years[None, :] <= end_year[:, None])
+        return years, np.where(active, wages, 0.0)
+
+    def project_user_wages(self, start_year: int, base_wage: float, end_year: int, variant: int = 2) -> Dict[int, float]:
+        """
+        Project user wages using wage indices floored at 1.0.
+        Without forecast data the projection stops at the last historical year.
         :param start_year: year when user starts
         :param base_wage: current wage (user input)
         :param end_year: last year for projection
         :return: dict {year: projected_wage}
         """
-        df_idx = self.build_indices()
-        df_idx = df_idx[df_idx["year"] >= start_year]
-
-        wages = {}
-        wage = base_wage
-
-        for _, row in df_idx.iterrows():
-            if row["year"] > end_year:
-                break
-            factor = row["wage_index"]
-            wage = round(wage * factor, 2)
-            wages[int(row["year"])] = wage
-
-        return wages
+        years, wages = self.salary_paths(
+            base_wage, start_year, start_year, end_year, variant, floor=True
+        )
+        active = wages[0] > 0
+        return dict(zip(years[active].tolist(), np.round(wages[0, active], 2).tolist()))
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+from typing import Iterator, List, Literal, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.functionalities.simulation_pipeline import (
+    CONTRIBUTION_RATE,
+    FEMALE,
+    MALE,
+    RETIREMENT_AGE,
+    CareerBatch,
+    SimulationPipeline,
+)
+
+# Synthetic workloads: careers with multi-block work histories, shaped like
+# `RetirementCalcInput` (age, sex, include_sick, work_blocks[years, gross_income,
+# contribution_rate]), for the batch simulator, load tests and report-table tests.
+#
+# Records are long format, one row per work block (COLUMNS); the blocks of a person are
+# consecutive rows in chronological order, as `SimulationPipeline.blocks_to_batch` expects.
+# Persons are generated in chunks of `chunk_size`, each chunk from its own SeedSequence
+# child, and every chunk is written to its own part file right away - memory does not grow
+# with the number of persons and the same (persons, seed, chunk_size) always give the same
+# files. Parts are Parquet when pyarrow is installed, CSV otherwise; `workload.json` records
+# the parameters and the parts, so readers never have to guess.
+
+WORKLOAD_VERSION = 1  # bump when the generated records change
+MANIFEST = "workload.json"
+COLUMNS = ("person", "age", "sex", "include_sick", "years", "gross_income", "contribution_rate")
+ENTRY_AGE = 18
+MAX_BLOCKS = 6
+MEDIAN_INCOME = 7_000.0  # PLN a month
+INCOME_SIGMA = 0.5  # dispersion of log income between persons
+BLOCK_SIGMA = 0.2  # and between the blocks of one person
+SICK_SHARE = 0.3  # persons asking for the sick-leave adjustment
+REDUCED_RATE_SHARE = 0.1  # blocks with a lower contribution rate (e.g. reduced base)
+HAS_PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+Format = Literal["parquet", "csv"]
+
+
+def generate_chunk(first_person: int, persons: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Block rows of persons first_person .. first_person + persons - 1."""
+    female = rng.random(persons) < 0.5
+    retirement_age = np.where(female, RETIREMENT_AGE[FEMALE], RETIREMENT_AGE[MALE])
+    age = rng.integers(ENTRY_AGE, retirement_age)
+    blocks = np.minimum(1 + rng.poisson(1.5, persons), MAX_BLOCKS)
+    career = (retirement_age - ENTRY_AGE) * rng.uniform(0.5, 1.0, persons)
+    income = MEDIAN_INCOME * np.exp(rng.normal(0.0, INCOME_SIGMA, persons))
+
+    person = np.repeat(np.arange(persons), blocks)
+    rows = len(person)
+    # a person's career split into blocks at Dirichlet(1, .., 1) shares
+    shares = rng.exponential(1.0, rows)
+    shares /= np.bincount(person, shares)[person]
+    years = np.maximum(np.round(career[person] * shares, 1), 0.1)
+    reduced = rng.random(rows) < REDUCED_RATE_SHARE
+    rate = np.where(
+        reduced, np.round(rng.uniform(0.05, CONTRIBUTION_RATE, rows), 4), CONTRIBUTION_RATE
+    )
+    return pd.DataFrame(
+        {
+            "person": first_person + person,
+            "age": age[person],
+            "sex": np.where(female, "f", "m")[person],
+            "include_sick": (rng.random(persons) < SICK_SHARE)[person],
+            "years": years,
+            "gross_income": np.round(
+                income[person] * np.exp(rng.normal(0.0, BLOCK_SIGMA, rows)), 2
+            ),
+            "contribution_rate": rate,
+        }
+    )
+
+
+def generate(persons: int, seed=0, chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+    """Chunks of the workload in person order; only one chunk is alive at a time."""
+    sizes = [min(chunk_size, persons - lo) for lo in range(0, persons, chunk_size)]
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(len(sizes))):
+        yield generate_chunk(i * chunk_size, sizes[i], np.random.default_rng(child))
+
+
+def write_workload(
+    out_dir: str,
+    persons: int,
+    seed=0,
+    chunk_size: int = 100_000,
+    fmt: Optional[Format] = None,
+) -> dict:
+    """Streams the workload into `out_dir` as one part file per chunk; returns the manifest."""
+    fmt = fmt or ("parquet" if HAS_PARQUET else "csv")
+    if fmt == "parquet" and not HAS_PARQUET:
+        raise ValueError("Parquet output needs pyarrow - install it or use fmt='csv'")
+    os.makedirs(out_dir, exist_ok=True)
+    parts, rows = [], 0
+    for i, chunk in enumerate(generate(persons, seed, chunk_size)):
+        name = f"part-{i:05d}.{fmt}"
+        if fmt == "parquet":
+            chunk.to_parquet(os.path.join(out_dir, name), index=False)
+        else:
+            chunk.to_csv(os.path.join(out_dir, name), index=False)
+        parts.append(name)
+        rows += len(chunk)
+    manifest = {
+        "version": WORKLOAD_VERSION,
+        "persons": persons,
+        "blocks": rows,
+        "seed": seed,
+        "chunk_size": chunk_size,
+        "format": fmt,
+        "parts": parts,
+    }
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_workload(out_dir: str) -> Iterator[pd.DataFrame]:
+    """Part files of a written workload, one chunk at a time."""
+    with open(os.path.join(out_dir, MANIFEST)) as f:
+        manifest = json.load(f)
+    for name in manifest["parts"]:
+        path = os.path.join(out_dir, name)
+        if manifest["format"] == "parquet":
+            yield pd.read_parquet(path)
+        else:
+            yield pd.read_csv(path)
+
+
+# --- consumers ---------------------------------------------------------
+
+
+def to_batch(pipeline: SimulationPipeline, chunk: pd.DataFrame) -> Tuple[CareerBatch, np.ndarray]:
+    """Block batch and 0-based person groups of a chunk, for `SimulationPipeline.run_grouped`."""
+    person = chunk["person"].to_numpy()
+    groups = person - person[0]
+    batch = pipeline.blocks_to_batch(
+        person=groups,
+        age=chunk["age"].to_numpy(),
+        sex=chunk["sex"].to_numpy(),
+        years=chunk["years"].to_numpy(),
+        salary=chunk["gross_income"].to_numpy(),
+        contribution_rate=chunk["contribution_rate"].to_numpy(),
+        sick_leave=chunk["include_sick"].to_numpy(),
+    )
+    return batch, groups
+
+
+def to_requests(chunk: pd.DataFrame) -> List[dict]:
+    """`RetirementCalcInput` bodies, one per person - payloads for load tests."""
+    requests = []
+    for _, rows in chunk.groupby("person", sort=False):
+        first = rows.iloc[0]
+        requests.append(
+            {
+                "age": int(first["age"]),
+                "sex": first["sex"],
+                "include_sick": bool(first["include_sick"]),
+                "work_blocks": rows[["years", "gross_income", "contribution_rate"]].to_dict(
+                    "records"
+                ),
+            }
+        )
+    return requests
+
+
+def to_report_rows(chunk: pd.DataFrame) -> pd.DataFrame:
+    """One `reports` row per person (PENSION_CALC, salary = year-weighted block income)."""
+    earned = chunk["gross_income"] * chunk["years"]
+    people = chunk.assign(earned=earned).groupby("person", sort=False)
+    rows = people[["age", "sex", "include_sick"]].first()
+    rows["salary"] = (people["earned"].sum() / people["years"].sum()).round(2)
+    rows = rows.rename(columns={"include_sick": "sick_leave"}).reset_index(drop=True)
+    rows.insert(0, "sim_type", "PENSION_CALC")
+    return rows
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Throughput of the Monte Carlo engine (paths / second) on a single core.
+Usage (from the `app` directory): python -m data.scripts.benchmark_monte_carlo [paths ...]
+"""
+
+import os
+
+# pin BLAS / OpenMP to one thread before NumPy is imported
+for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ[var] = "1"
+
+import sys
+import time
+
+from data.functionalities.monte_carlo import MonteCarloEngine
+from data.functionalities.simulation_pipeline import CareerBatch, default_pipeline
+
+if __name__ == "__main__":
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+    sizes = [int(n) for n in sys.argv[1:]] or [10_000, 50_000, 100_000]
+    pipeline = default_pipeline()
+    engine = MonteCarloEngine(pipeline)
+    # 25-year-old starting now: the longest forecast horizon the API sees
+    career = CareerBatch.build(
+        age=25, sex="m", salary=7000, start_year=pipeline.current_year, variant=2
+    )
+    engine.simulate(career, 1_000, seed=0)  # warm-up
+
+    for paths in sizes:
+        start = time.perf_counter()
+        result = engine.simulate(career, paths, seed=0, variant_weights=(1 / 3, 1 / 3, 1 / 3))
+        elapsed = time.perf_counter() - start
+        median = result.percentiles((50,))["pension"][50]
+        print(
+            f"{paths:>7} paths: {elapsed:.3f}s, {paths / elapsed:,.0f} paths/s "
+            f"(median pension {median:,.0f} PLN)"
+        )
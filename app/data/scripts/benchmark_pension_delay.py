@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Vectorized delay grid against the former per-delay loop.
+Usage (from the `app` directory): python -m data.scripts.benchmark_pension_delay [people]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from data.functionalities.pension_delay import PensionDelayCalculator
+from data.functionalities.simulation_pipeline import default_pipeline
+
+
+def loop_delays(base_capital, monthly_contribution, months, delays, valorization=0.03):
+    """The former implementation: a Python loop per delay and per year of delay."""
+    pensions = []
+    for d in delays:
+        capital = base_capital
+        for _ in range(d):
+            capital += monthly_contribution * 12
+            capital *= 1 + valorization
+        left = months - 12 * d
+        pensions.append(capital / left if left > 0 else 0)
+    return pensions
+
+
+if __name__ == "__main__":
+    people = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    pipeline = default_pipeline()
+    rng = np.random.default_rng(0)
+    capital = rng.uniform(100_000, 1_500_000, people)
+    contribution = rng.uniform(500, 3_000, people)
+    sex = rng.choice(["f", "m"], people)
+    retirement_age = np.where(sex == "f", 60, 65)
+    retirement_time = pipeline.current_year + rng.integers(0, 40, people)
+
+    whole_years = list(range(11))
+    start = time.perf_counter()
+    for k in range(people):
+        loop_delays(capital[k], contribution[k], 240, whole_years)
+    loop = time.perf_counter() - start
+    print(f"loop, {len(whole_years)} whole-year delays: {loop:.3f}s")
+
+    calculator = PensionDelayCalculator(pipeline)
+    for name, delays in (("whole-year", whole_years), ("monthly", np.arange(121) / 12)):
+        start = time.perf_counter()
+        grid = calculator.delay_grid(
+            capital, contribution, sex, retirement_age, retirement_time, delays
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"vectorized, {len(delays)} {name} delays: {elapsed:.3f}s "
+            f"({grid.pension.size / elapsed:,.0f} pensions/s)"
+        )
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Convergence of the Monte Carlo percentiles under each sampling method.
+
+For every method and path count the simulation is repeated with independent seeds and
+the relative RMSE of the pension percentiles against a large reference run is measured.
+A power law error = c * paths^-a fitted per method gives the path count (and CPU time)
+needed for the target accuracy.
+Usage (from the `app` directory):
+    python -m data.scripts.benchmark_sampling [target_rel_error] [repeats]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from data.functionalities.monte_carlo import MonteCarloEngine
+from data.functionalities.samplers import SAMPLING_METHODS
+from data.functionalities.simulation_pipeline import CareerBatch, default_pipeline
+
+PATH_COUNTS = (500, 1_000, 2_000, 4_000, 8_000)
+QUANTILES = (5, 50, 95)
+REFERENCE_PATHS = 500_000
+
+if __name__ == "__main__":
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 0.005
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    pipeline = default_pipeline()
+    career = CareerBatch.build(
+        age=30, sex="m", salary=8000, start_year=pipeline.current_year - 8, variant=2
+    )
+
+    reference_run = MonteCarloEngine(pipeline, sampling="halton").simulate(
+        career, REFERENCE_PATHS, seed=12345
+    )
+    reference = np.percentile(reference_run.pension, QUANTILES)
+    print(
+        f"Reference ({REFERENCE_PATHS} halton paths): "
+        + ", ".join(f"p{q} {v:,.0f}" for q, v in zip(QUANTILES, reference))
+    )
+    print(f"Target: {target:.2%} relative RMSE on p{QUANTILES}, {repeats} repeats per point\n")
+
+    for method in SAMPLING_METHODS:
+        engine = MonteCarloEngine(pipeline, sampling=method)
+        errors, seconds = [], 0.0
+        for paths in PATH_COUNTS:
+            start = time.perf_counter()
+            estimates = np.array(
+                [
+                    np.percentile(engine.simulate(career, paths, seed=seed).pension, QUANTILES)
+                    for seed in range(repeats)
+                ]
+            )
+            seconds += time.perf_counter() - start
+            errors.append(np.sqrt(((estimates / reference - 1) ** 2).mean(axis=0)))
+        errors = np.array(errors)  # [path count, quantile]
+        per_path = seconds / (repeats * sum(PATH_COUNTS))
+
+        print(f"{method}:")
+        for paths, row in zip(PATH_COUNTS, errors):
+            print(
+                f"  {paths:>6} paths  "
+                + "  ".join(f"p{q} {e:.3%}" for q, e in zip(QUANTILES, row))
+            )
+        # error = c * n^-a  ->  n = (c / target)^(1 / a), for the worst quantile
+        slope, intercept = np.polyfit(np.log(PATH_COUNTS), np.log(errors.max(axis=1)), 1)
+        needed = (np.exp(intercept) / target) ** (-1 / slope)
+        print(
+            f"  convergence rate n^{slope:.2f}; ~{needed:,.0f} paths for {target:.2%} "
+            f"= {needed * per_path * 1000:,.0f} ms CPU\n"
+        )
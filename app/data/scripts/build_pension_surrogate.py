@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Fits the approximate-mode pension table and measures its error bounds.
+Usage (from the `app` directory): python -m data.scripts.build_pension_surrogate [samples]
+"""
+
+import sys
+import time
+
+from data.functionalities.pension_surrogate import DEFAULT_PATH, PensionSurrogate
+from data.functionalities.simulation_pipeline import default_pipeline
+
+if __name__ == "__main__":
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    pipeline = default_pipeline()
+
+    start = time.perf_counter()
+    surrogate = PensionSurrogate.fit(pipeline)
+    print(f"Fitted {surrogate.table.size} grid points in {time.perf_counter() - start:.2f}s")
+
+    bounds = surrogate.measure_error(pipeline, samples=samples)
+    print(
+        f"Relative error on {bounds['samples']} off-grid points: "
+        f"max {bounds['max']:.2e}, p99 {bounds['p99']:.2e}, mean {bounds['mean']:.2e}"
+    )
+
+    surrogate.save(DEFAULT_PATH)
+    print(f"Saved to {DEFAULT_PATH}")
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Evaluates the typical pensioner profiles for every variant, sex and retirement year.
+Usage (from the `app` directory): python -m data.scripts.build_profile_table
+"""
+
+import time
+
+from data.functionalities.pension_profiles import DEFAULT_PATH, PensionProfiles
+from data.functionalities.simulation_pipeline import default_pipeline
+
+if __name__ == "__main__":
+    pipeline = default_pipeline()
+
+    start = time.perf_counter()
+    table = PensionProfiles().evaluate(pipeline)
+    print(f"Evaluated {table.pension.size} profile pensions in {time.perf_counter() - start:.3f}s")
+
+    table.save(DEFAULT_PATH)
+    print(f"Saved to {DEFAULT_PATH}")
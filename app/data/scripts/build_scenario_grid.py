@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Precomputes pension, replacement rate and delay outcomes over the scenario grid
+and writes them as a memory-mapped array with axis metadata.
+Usage (from the `app` directory): python -m data.scripts.build_scenario_grid [workers]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from data.functionalities.scenario_grid import DEFAULT_DIR, build_grid
+from data.functionalities.simulation_pipeline import default_pipeline
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    start = time.perf_counter()
+    grid = build_grid(default_pipeline(), DEFAULT_DIR, workers=workers)
+    elapsed = time.perf_counter() - start
+
+    points = int(np.prod(grid.values.shape[:-1]))
+    print(
+        f"Built {points} scenarios x {len(grid.outputs)} outputs in {elapsed:.2f}s ({workers} workers)"
+    )
+    print(f"Axes: { {name: len(axis) for name, axis in grid.axes.items()} }")
+    print(f"Saved to {DEFAULT_DIR}")
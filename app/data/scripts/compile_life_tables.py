@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Compiles the GUS life tables workbook into dense [year, age, sex] arrays.
+Usage (from the `app` directory): python -m data.scripts.compile_life_tables
+"""
+
+import time
+
+from data.functionalities.life_tables import DEFAULT_PATH, LifeTables
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    tables = LifeTables.compile()
+    print(
+        f"Compiled {len(tables.years)} years x {len(tables.ages)} ages "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    tables.save(DEFAULT_PATH)
+    print(f"Saved to {DEFAULT_PATH}")
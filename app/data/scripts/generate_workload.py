@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Streams a synthetic workload of multi-block careers to partitioned Parquet (CSV without
+pyarrow) for the batch simulator, load tests and report-table tests.
+Usage (from the `app` directory):
+    python -m data.scripts.generate_workload [out_dir] [persons] [seed] [parquet|csv]
+"""
+
+import sys
+import time
+
+from data.functionalities.workload import write_workload
+
+if __name__ == "__main__":
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else "data/artifacts/workload"
+    persons = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    fmt = sys.argv[4] if len(sys.argv) > 4 else None
+
+    start = time.perf_counter()
+    manifest = write_workload(out_dir, persons, seed=seed, fmt=fmt)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{manifest['persons']:,} persons ({manifest['blocks']:,} work blocks) in "
+        f"{len(manifest['parts'])} {manifest['format']} parts: {elapsed:.2f}s "
+        f"({manifest['persons'] / elapsed:,.0f} persons/s)"
+    )
+    print(f"Written to {out_dir}")
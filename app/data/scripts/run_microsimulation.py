@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Synthetic cohort of today's insured pushed through the career pipeline on all cores,
+compared with the FUS tables.
+Usage (from the `app` directory):
+    python -m data.scripts.run_microsimulation [persons] [workers] [seed]
+"""
+
+import os
+import sys
+
+from data.functionalities.fund_balance import FundTables
+from data.functionalities.microsimulation import PopulationModel
+from data.functionalities.sharded_runner import ShardedRunner
+from data.functionalities.simulation_pipeline import default_pipeline
+
+if __name__ == "__main__":
+    persons = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    pipeline = default_pipeline()
+    fund = FundTables.load()
+    model = PopulationModel.calibrate(pipeline, persons, fund=fund)
+
+    report = ShardedRunner(pipeline, workers).microsimulate(model, persons, seed=seed)
+    print(
+        f"{report.totals.persons:,} persons on {workers} workers: {report.elapsed:.2f}s "
+        f"({report.persons_per_second:,.0f} persons/s)"
+    )
+
+    checks = model.validate(report.totals, fund)
+    print("year  contributors/insured  contributions/revenues  expenditure share")
+    for i, year in enumerate(checks["years"]):
+        if year % 5 == 0:
+            print(
+                f"{year}  {checks['contributors_to_insured'][i]:20.3f}"
+                f"  {checks['contributions_to_revenues'][i]:22.3f}"
+                f"  {checks['expenditure_share'][i]:17.3f}"
+            )
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Large Monte Carlo run on all cores through the shard-and-reduce layer.
+Usage (from the `app` directory):
+    python -m data.scripts.run_sharded_monte_carlo [paths] [workers] [seed]
+"""
+
+import os
+import sys
+import time
+
+from data.functionalities.sharded_runner import ShardedRunner
+from data.functionalities.simulation_pipeline import CareerBatch, default_pipeline
+
+if __name__ == "__main__":
+    paths = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    pipeline = default_pipeline()
+    career = CareerBatch.build(
+        age=30, sex="m", salary=8000, start_year=pipeline.current_year - 8, variant=2
+    )
+
+    start = time.perf_counter()
+    fan = ShardedRunner(pipeline, workers).monte_carlo(
+        career, paths, seed=seed, sampling="halton", variant_weights=(1 / 3, 1 / 3, 1 / 3)
+    )
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{fan.paths} paths on {workers} workers: {elapsed:.2f}s ({fan.paths / elapsed:,.0f} paths/s)"
+    )
+    print(f"Peak working set per worker: {fan.peak_bytes / 2**20:.1f} MB")
+    print(
+        "Pension percentiles: "
+        + ", ".join(f"p{p} {v:,.0f}" for p, v in fan.outcomes["pension"].items())
+    )
+    print(f"Mean pension: {fan.mean['pension']:,.2f}")
@@ -0,0 +1,24 @@
+import os
+from functools import lru_cache
+
+from data.functionalities.simulation_pipeline import SimulationPipeline
+from data.functionalities.valorization_engine import DataPaths, ForecastData
+
+# Shared fixtures: the shipped data directory and a pipeline over it with a fixed
+# current year, so expected values do not move with the calendar.
+
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dane_emerytalne"
+)
+CURRENT_YEAR = 2025
+
+
+def make_pipeline() -> SimulationPipeline:
+    """A fresh pipeline, for tests that modify its arrays."""
+    return SimulationPipeline(ForecastData(DataPaths.default(DATA_DIR)), current_year=CURRENT_YEAR)
+
+
+@lru_cache(maxsize=1)
+def shared_pipeline() -> SimulationPipeline:
+    """One pipeline for all read-only tests; building it reads every CSV."""
+    return make_pipeline()
@@ -0,0 +1,57 @@
+import os
+import unittest
+
+import numpy as np
+
+from data.functionalities.annuity_divisor import projected_divisors
+from data.functionalities.life_tables import compiled_life_tables
+from data.functionalities.simulation_pipeline import FEMALE, MALE, CareerBatch
+from data.tests import DATA_DIR, shared_pipeline
+
+EXCEL_PATH = os.path.join(DATA_DIR, "tablice_trwania_zycia_w_latach_1990-2022.xlsx")
+
+
+class TestDivisorTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = projected_divisors(EXCEL_PATH)
+        cls.tables = compiled_life_tables(EXCEL_PATH)
+
+    def test_covers_retirements_to_2080(self):
+        self.assertEqual(self.table.years[[0, -1]].tolist(), [1990, 2080])
+        self.assertEqual(self.table.divisor.shape, (91, 1201, 2))
+
+    def test_whole_ages_match_life_tables(self):
+        months = self.table.months([MALE, FEMALE], [65, 60], [2022, 2022])
+        np.testing.assert_allclose(months, [15.32 * 12, 23.59 * 12])
+
+    def test_months_interpolate_between_ages(self):
+        ex = self.tables.life_expectancy(2022, [65, 66], MALE)
+        half = self.table.months(MALE, 65.5, 2022)
+        self.assertAlmostEqual(float(half), 12 * ex.mean())
+        # ages are counted in whole months
+        self.assertEqual(
+            self.table.months(MALE, 65 + 1.5 / 12, 2022),
+            self.table.months(MALE, 65 + 1 / 12, 2022),
+        )
+
+    def test_years_outside_the_table_are_clamped(self):
+        self.assertEqual(self.table.months(MALE, 65, 2100), self.table.months(MALE, 65, 2080))
+        self.assertEqual(self.table.months(MALE, 65, 1980), self.table.months(MALE, 65, 1990))
+
+    def test_pipeline_uses_table_of_last_valorized_year(self):
+        pipeline = shared_pipeline()
+        batch = CareerBatch.build(
+            age=[40, 40], sex=["m", "f"], salary=5000, start_year=2010, retirement_age=[65, 62.5]
+        )
+        result = pipeline.run(batch)
+        expected = self.table.months([MALE, FEMALE], [65, 62.5], [2049, 2047])
+        np.testing.assert_allclose(result.divisor_months, expected)
+
+    def test_later_retirement_years_have_longer_divisors(self):
+        divisor = self.table.months(FEMALE, 60, np.arange(2025, 2081))
+        self.assertTrue((np.diff(divisor) > 0).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data.functionalities.demography import GROUPS, DemographicProjection, demography
+from data.tests import DATA_DIR
+
+
+class TestDemographicProjection(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.projection = DemographicProjection.load(DATA_DIR)
+
+    def test_both_vintages_on_one_yearly_grid(self):
+        self.assertEqual(self.projection.vintages, (2019, 2022))
+        self.assertEqual(self.projection.years.tolist(), list(range(2022, 2081)))
+        self.assertEqual(self.projection.values.shape, (2, 59, len(GROUPS)))
+
+    def test_milestones_match_csvs(self):
+        mf2019 = pd.read_csv(os.path.join(DATA_DIR, "prognoza_demograficzna_MF_2019.csv"))
+        mf2022 = pd.read_csv(os.path.join(DATA_DIR, "prognoza_demograficzna_MF_2022.csv"))
+        row2019 = mf2019.set_index("rok").loc[2040]
+        row2022 = mf2022.set_index("rok").loc[2040]
+        self.assertEqual(self.projection.population("working", 2040, 2019), row2019["produkcyjny"])
+        self.assertEqual(
+            self.projection.population("post_working", 2040), row2022["wiek_poprodukcyjny_tys"]
+        )
+
+    def test_years_between_milestones_are_interpolated(self):
+        total = self.projection.population("total", [2030, 2035, 2040])
+        self.assertAlmostEqual(total[1], (total[0] + total[2]) / 2)
+
+    def test_ratios_and_shares(self):
+        post = self.projection.population("post_working", 2050)
+        working = self.projection.population("working", 2050)
+        self.assertAlmostEqual(self.projection.ratio("old_age_dependency", 2050), post / working)
+        # shares reproduce the published ones (rounded to 0.1pp)
+        mf2022 = pd.read_csv(os.path.join(DATA_DIR, "prognoza_demograficzna_MF_2022.csv"))
+        published = mf2022[
+            ["udzial_przedprodukcyjny", "udzial_produkcyjny", "udzial_poprodukcyjny"]
+        ]
+        rows = mf2022["rok"].to_numpy() - 2022
+        np.testing.assert_allclose(
+            self.projection.shares[1, rows, 1:] * 100, published.to_numpy(), atol=0.11
+        )
+
+    def test_revision_between_vintages(self):
+        revision = self.projection.revision("total", 2060)
+        expected = self.projection.population("total", 2060, 2022) - self.projection.population(
+            "total", 2060, 2019
+        )
+        self.assertAlmostEqual(revision, expected)
+        self.assertGreater(self.projection.revision("old_age_dependency", 2060), 0)
+
+    def test_years_are_clamped_and_vintage_checked(self):
+        self.assertEqual(
+            self.projection.population("total", 2100), self.projection.population("total", 2080)
+        )
+        with self.assertRaises(ValueError):
+            self.projection.population("total", 2030, vintage=2015)
+
+    def test_cached_per_snapshot(self):
+        self.assertIs(demography(DATA_DIR), demography(DATA_DIR))
+
+
+if __name__ == "__main__":
+    unittest.main()
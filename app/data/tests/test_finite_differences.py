@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from data.functionalities.finite_differences import career_sensitivities
+from data.tests import shared_pipeline
+
+
+class TestCareerSensitivities(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = shared_pipeline()
+        cls.career = dict(age=40, sex="m", years=[10, 5, 3], salary=[4000, 6000, 8000])
+        cls.result = career_sensitivities(cls.pipeline, **cls.career)
+
+    def pension(self, **changes):
+        career = {**self.career, **changes}
+        blocks = len(career["years"])
+        batch = self.pipeline.blocks_to_batch(person=np.zeros(blocks, dtype=int), **career)
+        return self.pipeline.run_grouped(batch, np.zeros(blocks, dtype=int)).pension[0]
+
+    def test_base_pension_matches_pipeline(self):
+        self.assertAlmostEqual(self.result.pension, self.pension())
+
+    def test_pension_is_linear_in_block_incomes(self):
+        incomes = np.array(self.career["salary"], dtype=float)
+        self.assertAlmostEqual(self.result.block_income @ incomes, self.result.pension, places=6)
+        self.assertAlmostEqual(self.result.block_income.sum(), self.result.salary, places=8)
+
+    def test_salary_derivative(self):
+        bumped = self.pension(salary=[4100, 6100, 8100])
+        self.assertAlmostEqual((bumped - self.result.pension) / 100, self.result.salary, places=8)
+
+    def test_contribution_rate_per_percentage_point(self):
+        bumped = self.pension(contribution_rate=0.2052)
+        self.assertAlmostEqual(bumped - self.result.pension, self.result.contribution_rate, 6)
+
+    def test_later_retirement_extends_last_block(self):
+        later = self.pension(years=[10, 5, 4], retirement_age=66)
+        self.assertAlmostEqual(later - self.result.pension, self.result.retirement_age)
+        self.assertGreater(self.result.retirement_age, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data.functionalities.demography import DemographicProjection
+from data.functionalities.fund_balance import (
+    METRICS,
+    TABLES,
+    FundBalanceEngine,
+    FundTables,
+    fund_engine,
+    fund_payload,
+)
+from data.tests import DATA_DIR
+
+
+class TestFundBalanceEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tables = FundTables.load(DATA_DIR)
+        cls.demography = DemographicProjection.load(DATA_DIR)
+        cls.engine = FundBalanceEngine(cls.tables, cls.demography)
+
+    def test_tables_are_aligned_yearly(self):
+        self.assertEqual(self.tables.years[0], 2023)
+        self.assertEqual(self.tables.years[-1], 2080)
+        self.assertEqual(self.tables.values.shape, (len(TABLES), 3, 58))
+        self.assertFalse(np.isnan(self.tables.values).any())
+
+    def test_gap_years_are_interpolated(self):
+        csv = pd.read_csv(os.path.join(DATA_DIR, TABLES["pensioners"])).set_index("rok")
+        pensioners = self.tables["pensioners"][1]
+        self.assertEqual(pensioners[2035 - 2023], csv.loc[2035, "wariant_2"])
+        expected = (
+            csv.loc[2035, "wariant_2"]
+            + (csv.loc[2040, "wariant_2"] - csv.loc[2035, "wariant_2"]) * 0.4
+        )
+        self.assertAlmostEqual(pensioners[2037 - 2023], expected)
+
+    def test_average_pension(self):
+        expected = 292655 / 6755 * 1000 / 12  # 2024, variant 2
+        self.assertAlmostEqual(self.engine.average_pension(2024), expected)
+        self.assertAlmostEqual(
+            self.engine.average_pension(1990), self.engine.average_pension(2023)
+        )
+
+    def test_balance_metrics_are_consistent(self):
+        coverage = self.engine.metric("coverage_ratio", variant=1)
+        deficit = self.engine.metric("deficit_ratio", variant=1)
+        # balance = revenues - expenditure in the tables (up to rounding)
+        np.testing.assert_allclose(coverage + deficit, 1.0, atol=0.01)
+
+    def test_insured_share_uses_working_age_population(self):
+        working = self.demography.population("working", 2050)
+        insured = self.tables["insured"][1, 2050 - 2023]
+        self.assertAlmostEqual(self.engine.metric("insured_share", 2, 2050), insured / working)
+
+    def test_unknown_metric_raises(self):
+        with self.assertRaises(ValueError):
+            self.engine.metric("average_wage")
+
+    def test_payload(self):
+        payload = self.engine.payload("test")
+        self.assertEqual(payload["version"], "test")
+        self.assertEqual(set(payload["variants"]), {1, 2, 3})
+        self.assertTrue(set(METRICS) <= set(payload["variants"][2]))
+        self.assertEqual(len(payload["variants"][2]["balance"]), len(payload["years"]))
+
+    def test_cached_per_snapshot(self):
+        self.assertIs(fund_engine(DATA_DIR), fund_engine(DATA_DIR))
+        self.assertIs(fund_payload(DATA_DIR), fund_payload(DATA_DIR))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+
+from data.functionalities.goal_solver import GoalSolver
+from data.functionalities.simulation_pipeline import CareerBatch
+from data.tests import shared_pipeline
+
+
+class TestGoalSolver(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = shared_pipeline()
+        self.solver = GoalSolver(self.pipeline)
+        self.batch = CareerBatch.build(
+            age=[30, 45, 50],
+            sex=["m", "f", "m"],
+            salary=[6000, 7000, 5000],
+            start_year=[2018, 2003, 1998],
+        )
+        self.base = self.pipeline.run(self.batch).pension
+
+    def test_required_retirement_age_reaches_target(self):
+        target = self.base * 1.2
+        ages = self.solver.required_retirement_age(self.batch, target)
+        reached = self.pipeline.run(self.batch.with_values(retirement_age=ages)).pension
+        month_earlier = self.pipeline.run(
+            self.batch.with_values(retirement_age=ages - 1 / 12)
+        ).pension
+        self.assertTrue(np.all(reached >= target))
+        self.assertTrue(np.all(month_earlier < target))
+
+    def test_age_solve_uses_few_batched_evaluations(self):
+        self.solver.required_retirement_age(self.batch, self.base * 1.2)
+        self.assertLessEqual(self.solver.evaluations, 3)
+
+    def test_statutory_age_when_target_already_met(self):
+        ages = self.solver.required_retirement_age(self.batch, self.base * 0.5)
+        self.assertEqual(ages.tolist(), [65.0, 60.0, 65.0])
+
+    def test_unreachable_target_is_nan(self):
+        ages = self.solver.required_retirement_age(self.batch, self.base * 100)
+        self.assertTrue(np.all(np.isnan(ages)))
+
+    def test_required_extra_contribution(self):
+        target = self.base * 1.5
+        extra = self.solver.required_extra_contribution(self.batch, target)
+        reached = self.pipeline.run(self.batch.with_values(extra_contribution=extra)).pension
+        np.testing.assert_allclose(reached, target, rtol=1e-3)
+
+    def test_real_target(self):
+        solver = GoalSolver(self.pipeline, prices="real")
+        target = self.pipeline.run(self.batch).pension_real * 1.5
+        extra = solver.required_extra_contribution(self.batch, target)
+        reached = self.pipeline.run(self.batch.with_values(extra_contribution=extra))
+        np.testing.assert_allclose(reached.pension_real, target, rtol=1e-3)
+
+    def test_required_salary(self):
+        target = self.base * 2.0
+        salary = self.solver.required_salary(self.batch, target)
+        reached = self.pipeline.run(self.batch.with_values(salary=salary)).pension
+        np.testing.assert_allclose(reached, target, rtol=1e-3)
+        # post-reform careers are linear in the salary; the 1998 start has initial capital
+        np.testing.assert_allclose(salary[:2], self.batch.salary[:2] * 2.0, rtol=1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
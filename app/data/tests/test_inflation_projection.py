@@ -1,7 +1,12 @@
 import unittest
+import numpy as np
 import pandas as pd
 from unittest.mock import patch
-from data.src.inflation_projection import InflationProjection
+from data.functionalities.inflation_projection import (
+    InflationProjection,
+    default_inflation_projection,
+)
+
 
 class TestInflationProjection(unittest.TestCase):
 
@@ -9,18 +14,20 @@ class TestInflationProjection(unittest.TestCase):
         self.macro_paths = {
             1: "data/dane_emerytalne/parametry_makroekonomiczne_wariant_1.csv",
             2: "data/dane_emerytalne/parametry_makroekonomiczne_wariant_2.csv",
-            3: "data/dane_emerytalne/parametry_makroekonomiczne_wariant_3.csv"
+            3: "data/dane_emerytalne/parametry_makroekonomiczne_wariant_3.csv",
         }
         self.projection = InflationProjection(self.macro_paths)
 
     @patch.object(InflationProjection, "load_data")
     def test_cumulative_inflation_correct(self, mock_load):
         # Dane testowe: inflacja 105%, 103%, 104%
-        mock_load.return_value = pd.DataFrame({
-            "rok": [2024, 2025, 2026],
-            "inflacja_ogolna": [105, 103, 104],
-            "inflation_factor": [1.05, 1.03, 1.04]
-        })
+        mock_load.return_value = pd.DataFrame(
+            {
+                "rok": [2024, 2025, 2026],
+                "inflacja_ogolna": [105, 103, 104],
+                "inflation_factor": [1.05, 1.03, 1.04],
+            }
+        )
 
         result = self.projection.cumulative_inflation(1, 2024, 2026)
         expected = 1.05 * 1.03 * 1.04
@@ -28,11 +35,9 @@ class TestInflationProjection(unittest.TestCase):
 
     @patch.object(InflationProjection, "load_data")
     def test_project_price_returns_correct_value(self, mock_load):
-        mock_load.return_value = pd.DataFrame({
-            "rok": [2024, 2025],
-            "inflacja_ogolna": [105, 103],
-            "inflation_factor": [1.05, 1.03]
-        })
+        mock_load.return_value = pd.DataFrame(
+            {"rok": [2024, 2025], "inflacja_ogolna": [105, 103], "inflation_factor": [1.05, 1.03]}
+        )
 
         result = self.projection.project_price(1, 2024, 2025, 1000)
         expected = round(1000 * 1.05 * 1.03, 2)
@@ -40,20 +45,15 @@ class TestInflationProjection(unittest.TestCase):
 
     @patch.object(InflationProjection, "load_data")
     def test_raises_error_for_missing_years(self, mock_load):
-        mock_load.return_value = pd.DataFrame({
-            "rok": [2020, 2021],
-            "inflacja_ogolna": [102, 101],
-            "inflation_factor": [1.02, 1.01]
-        })
+        mock_load.return_value = pd.DataFrame(
+            {"rok": [2020, 2021], "inflacja_ogolna": [102, 101], "inflation_factor": [1.02, 1.01]}
+        )
         with self.assertRaises(ValueError):
             self.projection.cumulative_inflation(1, 2024, 2026)
 
     def test_load_data_reads_and_transforms_properly(self):
         # Symulacja danych z CSV
-        df_mock = pd.DataFrame({
-            "rok": [2024, 2025],
-            "inflacja_ogolna": [105, 103]
-        })
+        df_mock = pd.DataFrame({"rok": [2024, 2025], "inflacja_ogolna": [105, 103]})
         with patch("pandas.read_csv", return_value=df_mock):
             df_loaded = self.projection.load_data(1)
             self.assertIn("inflation_factor", df_loaded.columns)
@@ -61,15 +61,63 @@ class TestInflationProjection(unittest.TestCase):
 
     @patch.object(InflationProjection, "load_data")
     def test_multiple_variants_handled(self, mock_load):
-        mock_load.return_value = pd.DataFrame({
-            "rok": [2024, 2025, 2026],
-            "inflacja_ogolna": [102, 103, 104],
-            "inflation_factor": [1.02, 1.03, 1.04]
-        })
+        mock_load.return_value = pd.DataFrame(
+            {
+                "rok": [2024, 2025, 2026],
+                "inflacja_ogolna": [102, 103, 104],
+                "inflation_factor": [1.02, 1.03, 1.04],
+            }
+        )
         for variant in [1, 2, 3]:
             result = self.projection.cumulative_inflation(variant, 2024, 2026)
             self.assertGreater(result, 1.0)
 
+    @patch.object(InflationProjection, "load_data")
+    def test_gap_years_are_interpolated(self, mock_load):
+        # luka 2030 -> 2035: lata pośrednie interpolowane liniowo, nie pomijane
+        mock_load.return_value = pd.DataFrame(
+            {"rok": [2030, 2035], "inflacja_ogolna": [105, 100], "inflation_factor": [1.05, 1.00]}
+        )
+        result = self.projection.cumulative_inflation(1, 2030, 2035)
+        expected = 1.05 * 1.04 * 1.03 * 1.02 * 1.01 * 1.00
+        self.assertAlmostEqual(result, expected, places=10)
+
+    def test_real_data_covers_every_year(self):
+        factors = [self.projection.cumulative_inflation(2, y, y) for y in range(2029, 2042)]
+        self.assertTrue(all(f > 1.0 for f in factors))
+        whole = self.projection.cumulative_inflation(2, 2029, 2041)
+        self.assertAlmostEqual(whole, np.prod(factors), places=10)
+
+    @patch.object(InflationProjection, "load_data")
+    def test_batch_matches_single_queries(self, mock_load):
+        mock_load.return_value = pd.DataFrame(
+            {
+                "rok": [2024, 2025, 2026, 2030],
+                "inflacja_ogolna": [105, 103, 104, 102],
+                "inflation_factor": [1.05, 1.03, 1.04, 1.02],
+            }
+        )
+        starts = np.array([2024, 2025, 2020, 2027])
+        ends = np.array([2026, 2030, 2025, 2040])
+        batch = self.projection.cumulative_inflation_batch(1, starts, ends)
+        single = [self.projection.cumulative_inflation(1, s, e) for s, e in zip(starts, ends)]
+        np.testing.assert_allclose(batch, single)
+        self.assertAlmostEqual(batch[2], 1.05 * 1.03)  # przycięte do pierwszego roku danych
+
+    @patch.object(InflationProjection, "load_data")
+    def test_batch_raises_for_range_without_data(self, mock_load):
+        mock_load.return_value = pd.DataFrame(
+            {"rok": [2024, 2025], "inflacja_ogolna": [105, 103], "inflation_factor": [1.05, 1.03]}
+        )
+        with self.assertRaises(ValueError):
+            self.projection.cumulative_inflation_batch(1, [2024, 2030], [2025, 2031])
+
+    def test_default_projection_is_shared(self):
+        projection = default_inflation_projection()
+        self.assertIs(projection, default_inflation_projection())
+        projection.cumulative_inflation(2, 2025, 2030)
+        self.assertIn(2, projection._prefix)  # prefix products kept for the next request
+
 
 if __name__ == "__main__":
     unittest.main()
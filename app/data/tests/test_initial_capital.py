@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+from data.functionalities.initial_capital import (
+    BASE_AMOUNT,
+    LIFE_EXPECTANCY_MONTHS,
+    convert_pre_reform_service,
+    initial_capital,
+)
+from data.functionalities.simulation_pipeline import REFORM_YEAR, CareerBatch
+from data.tests import shared_pipeline
+
+
+class TestInitialCapital(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = shared_pipeline()
+
+    def test_formula(self):
+        # 25 years at the average wage: full social part + 1.3% per year
+        expected = (0.24 + 0.013 * 25) * BASE_AMOUNT * LIFE_EXPECTANCY_MONTHS
+        self.assertAlmostEqual(initial_capital("m", 25, 1.0)[0], expected, places=6)
+        # the social part is proportional below the required service (20 years for women)
+        social = 0.24 * BASE_AMOUNT * LIFE_EXPECTANCY_MONTHS
+        self.assertAlmostEqual(initial_capital("f", 10, 0.0)[0], social / 2, places=6)
+        # the wage ratio is capped at 250%
+        self.assertEqual(initial_capital("m", 20, 4.0), initial_capital("m", 20, 2.5))
+
+    def test_vectorized(self):
+        capital = initial_capital(
+            np.array(["m", "f", "m"]), np.array([5.0, 15.0, 30.0]), np.array([0.8, 1.0, 1.5])
+        )
+        self.assertEqual(capital.shape, (3,))
+        self.assertTrue((np.diff(capital) > 0).all())
+
+    def test_rows_of_a_person_add_up(self):
+        # 40-year career of a 60-year-old man in two blocks, from 1990, 9 years before the reform
+        # blocks_to_batch converts the pre-reform service of each person on its own
+        converted = self.pipeline.blocks_to_batch(
+            person=[0, 0], age=60, sex="m", years=[10, 30], salary=[6_000, 9_000]
+        )
+        start = converted.end_year - np.array([10, 30])
+        pre = np.clip(np.minimum(converted.end_year, REFORM_YEAR) - start, 0, None)
+        self.assertAlmostEqual(pre.sum(), 9.0)
+        ratio = converted.salary / self.pipeline.average_wage()[1]
+        social = initial_capital("m", 9, 0.0)[0]
+        expected = social + (0.013 * BASE_AMOUNT * ratio * pre).sum() * LIFE_EXPECTANCY_MONTHS
+        self.assertAlmostEqual(converted.initial_capital.sum() / expected, 1.0, places=12)
+        self.assertTrue((converted.start_year >= REFORM_YEAR).all())
+
+    def test_capital_is_valorized_from_reform_year(self):
+        batch = CareerBatch.build(age=55, sex="f", salary=7_000, start_year=1990)
+        converted = convert_pre_reform_service(self.pipeline, batch)
+        only_initial = converted.with_values(salary=0.0)
+        capital = self.pipeline.run(only_initial).capital[0]
+        v = self.pipeline.valorization[1, REFORM_YEAR - 1950 : 2030 - 1950]
+        self.assertAlmostEqual(capital / (converted.initial_capital[0] * v.prod()), 1.0)
+        # post-reform contributions are unchanged
+        np.testing.assert_allclose(
+            self.pipeline.run(converted.with_values(initial_capital=0.0)).capital,
+            self.pipeline.run(batch.with_values(start_year=REFORM_YEAR)).capital,
+        )
+
+    def test_every_run_converts_pre_reform_service(self):
+        batch = CareerBatch.build(age=55, sex="f", salary=7_000, start_year=1990)
+        converted = convert_pre_reform_service(self.pipeline, batch)
+        np.testing.assert_allclose(
+            self.pipeline.run(batch).capital, self.pipeline.run(converted).capital
+        )
+        self.assertIs(convert_pre_reform_service(self.pipeline, converted), converted)
+
+    def test_post_reform_careers_are_untouched(self):
+        batch = CareerBatch.build(age=30, sex="m", salary=8_000, start_year=2017)
+        self.assertIs(convert_pre_reform_service(self.pipeline, batch), batch)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from data.functionalities.life_tables import (
+    LifeTables,
+    compiled_life_tables,
+    life_table_from_qx,
+)
+from data.functionalities.simulation_pipeline import FEMALE, MALE
+from data.tests import DATA_DIR
+
+EXCEL_PATH = os.path.join(DATA_DIR, "tablice_trwania_zycia_w_latach_1990-2022.xlsx")
+
+
+class TestLifeTables(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tables = LifeTables.compile(EXCEL_PATH)
+
+    def test_dense_shape(self):
+        self.assertEqual(self.tables.ex.shape, (33, 101, 2))
+        self.assertEqual(self.tables.years[[0, -1]].tolist(), [1990, 2022])
+        self.assertTrue((self.tables.lx[:, 0] == 100_000).all())
+
+    def test_known_values(self):
+        self.assertAlmostEqual(float(self.tables.life_expectancy(2022, 65, "m")), 15.32)
+        self.assertAlmostEqual(float(self.tables.life_expectancy(2022, 0, FEMALE)), 81.06)
+        self.assertAlmostEqual(float(self.tables.death_probability(1990, 0, MALE)), 0.02163)
+
+    def test_batch_lookup(self):
+        ex = self.tables.life_expectancy([1990, 2022, 2022], [0, 0, 65], [MALE, FEMALE, MALE])
+        np.testing.assert_allclose(ex, [66.23, 81.06, 15.32])
+
+    def test_out_of_range(self):
+        with self.assertRaises(ValueError):
+            self.tables.life_expectancy(2023, 65, MALE)
+        with self.assertRaises(ValueError):
+            self.tables.life_expectancy(2022, 101, MALE)
+
+    def test_compiled_cache_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "life_tables.npz")
+            first = compiled_life_tables(EXCEL_PATH, path)
+            compiled_life_tables.cache_clear()
+            loaded = LifeTables.load(path)
+            self.assertEqual(loaded.source, first.source)
+            np.testing.assert_array_equal(loaded.ex, self.tables.ex)
+
+    def test_life_table_from_qx_reproduces_observed_ex(self):
+        lx, ex = life_table_from_qx(self.tables.qx)
+        np.testing.assert_allclose(ex[:, 50:90], self.tables.ex[:, 50:90], atol=0.05)
+        np.testing.assert_allclose(lx, self.tables.lx, rtol=1e-3, atol=10)
+
+    def test_projection_extends_to_2080_with_improving_mortality(self):
+        projected = self.tables.project()
+        self.assertEqual(projected.years[-1], 2080)
+        np.testing.assert_array_equal(projected.ex[:33], self.tables.ex)
+        e65 = projected.life_expectancy(np.arange(2023, 2081), 65, MALE)
+        self.assertTrue((np.diff(e65) > 0).all())
+        self.assertTrue((projected.qx <= 1).all() and (projected.qx > 0).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
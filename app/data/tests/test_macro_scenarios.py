@@ -1,17 +1,25 @@
 import unittest
-import pandas as pd
 from unittest.mock import MagicMock
-from data.src.macro_scenarios import MacroScenarioAnalyzer
+
+import numpy as np
+import pandas as pd
+
+from data.functionalities.macro_scenarios import MacroScenarioAnalyzer, macro_analyzer
+from data.functionalities.valorization_engine import DataPaths, ForecastData
+from data.tests import DATA_DIR
+
 
 class TestMacroScenarioAnalyzer(unittest.TestCase):
 
     def setUp(self):
-        df_base = pd.DataFrame({
-            "rok": [2024, 2025, 2026],
-            "cpi_factor": [1.05, 1.03, 1.02],
-            "real_gdp_factor": [1.02, 1.01, 1.00],
-            "nominal_gdp_factor": [1.07, 1.04, 1.02]
-        })
+        df_base = pd.DataFrame(
+            {
+                "rok": [2024, 2025, 2026],
+                "cpi_factor": [1.05, 1.03, 1.02],
+                "real_gdp_factor": [1.02, 1.01, 1.00],
+                "nominal_gdp_factor": [1.07, 1.04, 1.02],
+            }
+        )
 
         self.mock_forecast = MagicMock()
         self.mock_forecast.load_macro.side_effect = lambda v: df_base.copy()
@@ -34,7 +42,7 @@ class TestMacroScenarioAnalyzer(unittest.TestCase):
             "cpi_factor_mean",
             "real_gdp_factor_min",
             "real_gdp_factor_max",
-            "real_gdp_factor_mean"
+            "real_gdp_factor_mean",
         }
         self.assertEqual(set(summary.columns), expected_cols)
 
@@ -48,5 +56,49 @@ class TestMacroScenarioAnalyzer(unittest.TestCase):
         self.assertGreaterEqual(len(summary), 3)
         self.assertTrue((summary["rok"] == [2024, 2025, 2026]).any())
 
+    def test_unknown_indicator_raises(self):
+        with self.assertRaises(ValueError):
+            self.analyzer.summarize_by_year(["inflacja"])
+
+
+class TestMacroCube(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = MacroScenarioAnalyzer(ForecastData(DataPaths.default(DATA_DIR)))
+
+    def test_cube_covers_every_year_and_indicator(self):
+        cube = self.analyzer.cube
+        self.assertEqual(cube.years[0], 2022)
+        self.assertEqual(cube.years[-1], 2080)
+        self.assertEqual(cube.values.shape, (3, len(cube.years), len(cube.indicators)))
+        self.assertIn("unemployment_rate", cube.indicators)
+        self.assertFalse(np.isnan(cube.values).any())
+
+    def test_gap_years_are_interpolated(self):
+        df = self.analyzer.compare_inflation_scenarios(["cpi_factor"])
+        cpi = df[df["variant"] == 2].set_index("rok")["cpi_factor"]
+        self.assertIn(2032, cpi.index)
+        self.assertAlmostEqual(cpi[2032], cpi[2030] + (cpi[2035] - cpi[2030]) * 2 / 5)
+
+    def test_statistics_are_axis_reductions(self):
+        values = self.analyzer.cube.values
+        i = self.analyzer.cube.indicators.index("real_wage_factor")
+        np.testing.assert_allclose(
+            self.analyzer.spread("real_wage_factor"), np.ptp(values[:, :, i], axis=0)
+        )
+        self.assertTrue((self.analyzer.spread("real_wage_factor") >= 0).all())
+
+    def test_summary_payload(self):
+        payload = self.analyzer.summary(["cpi_factor"], first_year=2030, last_year=2040)
+        self.assertEqual(payload["years"], list(range(2030, 2041)))
+        cpi = payload["indicators"]["cpi_factor"]
+        self.assertEqual(set(cpi), {"variants", "min", "max", "mean", "spread"})
+        self.assertEqual(len(cpi["variants"][1]), 11)
+
+    def test_analyzer_is_cached_per_snapshot(self):
+        self.assertIs(macro_analyzer(DATA_DIR), macro_analyzer(DATA_DIR))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+from data.functionalities.fund_balance import FundTables
+from data.functionalities.microsimulation import PopulationModel
+from data.functionalities.sharded_runner import ShardedRunner
+from data.tests import DATA_DIR, shared_pipeline
+
+
+class TestMicrosimulation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = shared_pipeline()
+        cls.fund = FundTables.load(DATA_DIR)
+        cls.model = PopulationModel.calibrate(cls.pipeline, 20_000, fund=cls.fund)
+        cls.report = ShardedRunner(cls.pipeline, 0).microsimulate(
+            cls.model, 20_000, seed=3, chunk_size=6_000
+        )
+
+    def test_reproducible_across_worker_counts(self):
+        pooled = ShardedRunner(self.pipeline, 2).microsimulate(
+            self.model, 20_000, seed=3, chunk_size=6_000
+        )
+        np.testing.assert_array_equal(pooled.totals.values, self.report.totals.values)
+        self.assertEqual(pooled.totals.persons, 20_000)
+        self.assertGreater(pooled.persons_per_second, 0)
+
+    def test_draws_match_calibration(self):
+        batch = self.model.draw(50_000, np.random.default_rng(0))
+        self.assertAlmostEqual(batch.salary.mean() / self.model.mean_wage, 1.0, delta=0.02)
+        self.assertTrue((batch.start_year <= self.pipeline.current_year).all())
+        self.assertTrue((batch.age < batch.retirement_age).all())
+
+    def test_totals_against_fund_tables(self):
+        totals = self.report.totals
+        checks = self.model.validate(totals, self.fund)
+        # the whole insured population contributes in the base year
+        self.assertAlmostEqual(checks["contributors_to_insured"][0], 1.0, delta=0.01)
+        self.assertAlmostEqual(checks["contributions_to_revenues"][0], 1.0, delta=0.05)
+        # closed cohort: contributors only leave, pensioners only join before dying out
+        self.assertTrue((np.diff(totals["contributors"]) <= 1e-6).all())
+        self.assertEqual(totals["pensioners"][0], 0)
+        # everybody retires by LAST_YEAR
+        self.assertAlmostEqual(
+            totals["retirees"].sum() / (self.model.weight * totals.persons), 1.0
+        )
+        self.assertTrue((checks["expenditure_share"] < 1.0).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+
+import numpy as np
+
+from data.functionalities.monte_carlo import INDICATORS, MonteCarloEngine
+from data.functionalities.simulation_pipeline import CareerBatch
+from data.tests import shared_pipeline
+
+
+class TestMonteCarloEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = shared_pipeline()
+        cls.engine = MonteCarloEngine(cls.pipeline, chunk_size=1_000)
+        cls.career = CareerBatch.build(
+            age=35, sex="f", salary=8000, start_year=2012, funds=40_000, variant=2
+        )
+
+    def test_zero_volatility_reproduces_pipeline(self):
+        engine = MonteCarloEngine(self.pipeline, sigma=dict.fromkeys(INDICATORS, 0.0))
+        result = engine.simulate(self.career, 300, seed=0, variant_weights=(0.2, 0.5, 0.3))
+        for v in (1, 2, 3):
+            exact = self.pipeline.run(self.career.with_values(variant=v))
+            np.testing.assert_allclose(result.pension[result.variant == v], exact.pension[0])
+            np.testing.assert_allclose(
+                result.replacement_rate[result.variant == v], exact.replacement_rate[0]
+            )
+            np.testing.assert_allclose(
+                result.pension_real[result.variant == v], exact.pension_real[0]
+            )
+
+    def test_zero_volatility_includes_initial_capital(self):
+        engine = MonteCarloEngine(self.pipeline, sigma=dict.fromkeys(INDICATORS, 0.0))
+        career = CareerBatch.build(age=55, sex="m", salary=7000, start_year=1992, variant=2)
+        result = engine.simulate(career, 10, seed=0)
+        exact = self.pipeline.run(career)
+        np.testing.assert_allclose(result.capital, exact.capital[0])
+        fan = engine.simulate_fan(career, 10, seed=0)
+        self.assertAlmostEqual(fan.balance[50][-1], fan.outcomes["capital"][50], delta=1.0)
+
+    def test_seed_is_reproducible_across_chunks(self):
+        a = self.engine.simulate(self.career, 2_500, seed=7)
+        b = self.engine.simulate(self.career, 2_500, seed=7)
+        self.assertEqual(len(a), 2_500)
+        np.testing.assert_array_equal(a.pension, b.pension)
+
+    def test_percentile_bands_are_ordered_around_deterministic_value(self):
+        bands = self.engine.simulate(self.career, 5_000, seed=1).percentiles()
+        pension = list(bands["pension"].values())
+        self.assertEqual(pension, sorted(pension))
+        deterministic = self.pipeline.run(self.career).pension[0]
+        self.assertLess(bands["pension"][5], deterministic)
+        self.assertGreater(bands["pension"][95], deterministic)
+        self.assertLess(bands["pension_real"][50], bands["pension"][50])
+
+    def test_streaming_fan_matches_full_simulation(self):
+        full = self.engine.simulate(self.career, 4_000, seed=3).percentiles()
+        fan = self.engine.simulate_fan(self.career, 4_000, seed=3, max_memory_bytes=4 * 2**20)
+        self.assertLess(fan.chunk_size, 4_000)
+        self.assertLessEqual(fan.peak_bytes, 4 * 2**20)
+        self.assertEqual(fan.years[0], 2025)
+        # last year of the fan is the capital at retirement
+        self.assertAlmostEqual(fan.balance[50][-1], fan.outcomes["capital"][50], delta=1.0)
+        for name in ("pension", "capital"):
+            for p in (10, 50, 90):
+                self.assertAlmostEqual(fan.outcomes[name][p] / full[name][p], 1.0, delta=0.03)
+        self.assertTrue(np.all(np.diff(fan.balance[50]) > 0))
+
+    def test_real_prices(self):
+        engine = MonteCarloEngine(self.pipeline, chunk_size=1_000, prices="real")
+        nominal = self.engine.simulate(self.career, 500, seed=4)
+        real = engine.simulate(self.career, 500, seed=4)
+        np.testing.assert_allclose(real.pension, nominal.pension_real)
+        np.testing.assert_allclose(real.capital / nominal.capital, real.pension / nominal.pension)
+        fan = engine.simulate_fan(self.career, 500, seed=4)
+        np.testing.assert_allclose(fan.balance[50], fan.balance_real[50])
+
+    def test_shock_construction_matches_ar1_law(self):
+        factors, _ = self.engine.shock_factors(6)
+        lag = np.abs(np.subtract.outer(np.arange(6), np.arange(6)))
+        np.testing.assert_allclose(factors @ factors.T, 0.6**lag, atol=1e-12)
+
+    def test_quasi_random_sampling_beats_pseudo_random(self):
+        reference = np.median(
+            MonteCarloEngine(self.pipeline, sampling="halton")
+            .simulate(self.career, 100_000, seed=0)
+            .pension
+        )
+        errors = {}
+        for method in ("pseudo", "antithetic", "halton"):
+            engine = MonteCarloEngine(self.pipeline, sampling=method)
+            medians = [
+                np.median(engine.simulate(self.career, 1_000, seed=s).pension) for s in range(8)
+            ]
+            errors[method] = np.sqrt(np.mean((np.array(medians) / reference - 1) ** 2))
+        self.assertLess(errors["halton"], errors["pseudo"])
+        self.assertLess(errors["antithetic"], errors["pseudo"])
+
+    def test_rejects_batches(self):
+        with self.assertRaises(ValueError):
+            self.engine.simulate(self.career.repeat(2), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
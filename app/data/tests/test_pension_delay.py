@@ -1,6 +1,9 @@
 import unittest
 
-from functionalities.pension_delay import PensionDelayCalculator
+import numpy as np
+
+from data.functionalities.pension_delay import PensionDelayCalculator
+from data.tests import shared_pipeline
 
 
 class TestPensionDelayCalculator(unittest.TestCase):
@@ -52,6 +55,72 @@ class TestPensionDelayCalculator(unittest.TestCase):
         for pension in result.pensions.values():
             self.assertEqual(pension, 0)
 
+    def test_matches_yearly_loop(self):
+        result = PensionDelayCalculator.calculate_pension_delay(
+            base_capital=self.base_capital,
+            monthly_contribution=self.monthly_contribution,
+            annual_valorization=self.annual_valorization,
+            life_expectancy_months=self.life_expectancy_months,
+            delays=[0, 1, 2, 5, 7],
+        )
+        for d, pension in result.pensions.items():
+            capital = self.base_capital
+            for _ in range(d):
+                capital = (capital + self.monthly_contribution * 12) * 1.03
+            expected = capital / (self.life_expectancy_months - 12 * d)
+            self.assertAlmostEqual(pension, round(expected, 2), places=2)
+
+
+class TestDelayGrid(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pipeline = shared_pipeline()
+        cls.pipeline = pipeline
+        cls.calculator = PensionDelayCalculator(pipeline)
+        cls.monthly = np.arange(121) / 12  # monthly steps over 0-10 years
+        cls.grid = cls.calculator.delay_grid(
+            base_capital=[400_000, 650_000, 900_000],
+            monthly_contribution=[1_200, 1_800, 2_500],
+            sex=["f", "m", "f"],
+            retirement_age=[60, 65, 60],
+            retirement_time=2040,
+            delays=cls.monthly,
+        )
+
+    def test_shapes_and_monotonicity(self):
+        self.assertEqual(self.grid.pension.shape, (3, 121))
+        self.assertTrue((np.diff(self.grid.capital, axis=1) > 0).all())
+        self.assertTrue((np.diff(self.grid.pension[:, ::12], axis=1) > 0).all())
+
+    def test_no_delay_uses_life_table_divisor(self):
+        divisor = self.pipeline.divisor_months(["f", "m", "f"], [60, 65, 60], 2040)
+        np.testing.assert_allclose(self.grid.divisor_months[:, 0], divisor)
+        np.testing.assert_allclose(
+            self.grid.pension[:, 0], np.array([400_000, 650_000, 900_000]) / divisor
+        )
+
+    def test_whole_years_match_yearly_recursion(self):
+        pipeline = self.pipeline
+        capital = 650_000.0
+        for year in range(2040, 2043):
+            pos = pipeline._year_pos(year)
+            contribution = 12 * 1_800 * pipeline.wage_index[1, pos]
+            capital = (capital + contribution) * pipeline.valorization[1, pos]
+        self.assertAlmostEqual(self.grid.capital[1, 36] / capital, 1.0, places=12)
+
+    def test_monthly_steps_are_continuous(self):
+        steps = np.diff(self.grid.capital, axis=1) / self.grid.capital[:, 1:]
+        self.assertLess(steps.max(), 0.02)
+
+    def test_real_prices(self):
+        real = self.calculator.delay_grid(400_000, 1_200, "f", 60, 2040, [0, 5], prices="real")
+        factor = self.pipeline.price_factor(2, 2040, "real", years_after=[0, 5])
+        nominal = self.calculator.delay_grid(400_000, 1_200, "f", 60, 2040, [0, 5])
+        np.testing.assert_allclose(real.pension[0], nominal.pension[0] * factor)
+        self.assertEqual(
+            real.as_dict(), {0: round(real.pension[0, 0], 2), 5: round(real.pension[0, 1], 2)}
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,25 @@
+import os
+import tempfile
 import unittest
-from data.functionalities.pension_profiles import PensionProfile, PensionProfiles
+from dataclasses import replace
+
+import numpy as np
+
+from data.functionalities.pension_profiles import (
+    PROFILES,
+    VARIANTS,
+    PensionProfile,
+    PensionProfiles,
+    ProfileTable,
+)
+from data.functionalities.simulation_pipeline import (
+    CONTRIBUTION_RATE,
+    FEMALE,
+    MALE,
+    CareerBatch,
+)
+from data.tests import shared_pipeline
+
 
 class TestPensionProfiles(unittest.TestCase):
 
@@ -27,8 +47,12 @@ class TestPensionProfiles(unittest.TestCase):
     def test_profiles_contain_expected_keys(self):
         """Sprawdza, czy wszystkie klucze są zgodne z oczekiwaniem."""
         expected_keys = {
-            "below_minimum", "minimum", "below_average",
-            "average", "above_average", "top"
+            "below_minimum",
+            "minimum",
+            "below_average",
+            "average",
+            "above_average",
+            "top",
         }
         actual_keys = set(self.profiles.profiles.keys())
         self.assertSetEqual(expected_keys, actual_keys)
@@ -40,6 +64,72 @@ class TestPensionProfiles(unittest.TestCase):
             self.assertLessEqual(profile.wage_factor, 3.0)
             self.assertGreater(profile.wage_factor, 0.1)
 
+    def test_columns_follow_profiles(self):
+        """Kolumny rejestru odpowiadają definicjom profili."""
+        self.assertEqual(list(self.profiles.keys), self.profiles.list_profiles())
+        average = self.profiles.list_profiles().index("average")
+        self.assertEqual(self.profiles.years_worked[average], 35)
+        self.assertEqual(self.profiles.wage_factor[average], 1.0)
+        self.assertTrue(((self.profiles.stability > 0) & (self.profiles.stability <= 1)).all())
+
+    def test_get_profile_raises_for_unknown_key(self):
+        with self.assertRaises(ValueError):
+            self.profiles.get_profile("top_earners")
+
+
+class TestProfileTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = shared_pipeline()
+        cls.profiles = PensionProfiles()
+        cls.table = cls.profiles.evaluate(cls.pipeline, retirement_years=[2025, 2040, 2060])
+
+    def test_table_shape(self):
+        self.assertEqual(self.table.pension.shape, (len(PROFILES), len(VARIANTS), 2, 3))
+        self.assertTrue((self.table.pension > 0).all())
+
+    def test_matches_single_career(self):
+        """Komórka tablicy = ta sama kariera policzona osobno."""
+        profile = self.profiles.get_profile("average")
+        wage = self.pipeline.average_wage()[1]
+        career = CareerBatch.build(
+            age=60 - 15,
+            sex="k",
+            salary=wage,
+            start_year=2040 - profile.years_worked,
+            variant=2,
+            contribution_rate=CONTRIBUTION_RATE * profile.stability,
+        )
+        expected = self.pipeline.run(career)
+        nominal, real = self.table.pensions(2, FEMALE, 2040)["average"]
+        self.assertAlmostEqual(nominal, expected.pension[0], places=6)
+        self.assertAlmostEqual(real, expected.pension_real[0], places=6)
+
+    def test_profiles_are_ordered(self):
+        """Wyższe zarobki, dłuższy staż i stabilniejsza kariera = wyższa emerytura."""
+        pensions = self.table.pensions(2, MALE, 2060)
+        values = [pensions[key][0] for key in self.profiles.list_profiles()]
+        self.assertEqual(values, sorted(values))
+
+    def test_years_outside_table_are_clipped(self):
+        self.assertEqual(self.table.clip_year(2100), 2060)
+        self.assertEqual(self.table.pensions(1, "m", 2100), self.table.pensions(1, MALE, 2060))
+
+    def test_save_and_load_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profiles.npz")
+            self.table.save(path)
+            loaded = ProfileTable.load(path)
+        np.testing.assert_array_equal(loaded.pension, self.table.pension)
+        self.assertTrue(loaded.is_current(self.pipeline, self.profiles))
+
+    def test_changed_profiles_make_table_stale(self):
+        changed = PensionProfiles([replace(PROFILES[0], wage_factor=0.5), *PROFILES[1:]])
+        self.assertFalse(self.table.is_current(self.pipeline, changed))
+
+    def test_load_missing_file_returns_none(self):
+        self.assertIsNone(ProfileTable.load("does/not/exist.npz"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from data.functionalities.pension_surrogate import PensionSurrogate
+from data.functionalities.simulation_pipeline import CareerBatch
+from data.tests import shared_pipeline
+
+
+class TestPensionSurrogate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = shared_pipeline()
+        cls.surrogate = PensionSurrogate.fit(cls.pipeline)
+
+    def test_error_bounds_are_measured_and_within_one_percent(self):
+        bounds = self.surrogate.measure_error(self.pipeline, samples=2000)
+        self.assertEqual(bounds["samples"], 2000)
+        self.assertLess(bounds["max"], 0.01)
+        self.assertLessEqual(bounds["p99"], bounds["max"])
+
+    def test_predict_matches_exact_pipeline(self):
+        age, sex, variant = np.array([25, 40]), np.array(["m", "f"]), np.array([2, 3])
+        salary, years_worked = np.array([4321.0, 9876.0]), np.array([3.5, 22.25])
+        exact = PensionSurrogate._exact(self.pipeline, age, sex, salary, years_worked, variant)
+        approx = self.surrogate.predict(age, sex, salary, years_worked, variant).pension
+        np.testing.assert_allclose(approx, exact, rtol=0.01)
+
+    def test_covers_single_salary_post_reform_careers(self):
+        def covers(*career):
+            return PensionSurrogate.covers(self.pipeline, *career)
+
+        self.assertTrue(covers(30, "m", [3, 5], [6000, 6000], [0.1952, 0.1952]))
+        self.assertFalse(covers(30, "m", [3, 5], [6000, 8000], [0.1952, 0.1952]))
+        self.assertFalse(covers(30, "m", [8], [6000], [0.1]))
+        # a 60-year-old woman retiring in 2025 after 30 years started in 1995
+        self.assertFalse(covers(60, "f", [30], [6000], [0.1952]))
+        self.assertTrue(covers(60, "f", [26], [6000], [0.1952]))
+
+    def test_sick_leave_factor_matches_the_pipeline(self):
+        age, sex, years_worked = np.array([25, 40]), np.array(["m", "f"]), np.array([3.5, 22.25])
+        batch = CareerBatch.build(age=age, sex=sex, salary=5000.0, start_year=0.0)
+        batch = batch.with_values(start_year=self.pipeline.retirement_time(batch) - years_worked)
+        exact = self.pipeline.sick_leave_factor(batch)
+        approx = self.surrogate.predict(age, sex, 5000.0, years_worked).sick_leave_factor
+        np.testing.assert_allclose(approx, exact, rtol=1e-3)
+
+    def test_save_and_load_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "surrogate.npz")
+            self.surrogate.save(path)
+            loaded = PensionSurrogate.load(path)
+        np.testing.assert_array_equal(loaded.table, self.surrogate.table)
+        self.assertEqual(loaded.meta["current_year"], 2025)
+        self.assertTrue(loaded.is_current(self.pipeline))
+
+    def test_load_table_without_sick_leave_output_returns_none(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "surrogate.npz")
+            PensionSurrogate(self.surrogate.table[..., 0], self.surrogate.meta).save(path)
+            self.assertIsNone(PensionSurrogate.load(path))
+
+    def test_load_missing_file_returns_none(self):
+        self.assertIsNone(PensionSurrogate.load("does/not/exist.npz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from data.functionalities.quantile_sketch import QuantileSketch
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.values = rng.lognormal(mean=[8.0, 12.0], sigma=0.5, size=(50_000, 2))
+        self.q = np.array([0.05, 0.5, 0.95])
+
+    def test_quantiles_within_relative_accuracy(self):
+        sketch = QuantileSketch(2, alpha=0.005)
+        for chunk in np.array_split(self.values, 7):
+            sketch.add(chunk)
+        exact = np.quantile(self.values, self.q, axis=0, method="lower")
+        np.testing.assert_allclose(sketch.quantiles(self.q), exact, rtol=0.0051)
+        self.assertEqual(sketch.count.tolist(), [50_000, 50_000])
+
+    def test_merge_equals_single_pass(self):
+        whole, left, right = (QuantileSketch(2) for _ in range(3))
+        whole.add(self.values)
+        left.add(self.values[:20_000])
+        right.add(self.values[20_000:])
+        np.testing.assert_array_equal(left.merge(right).counts, whole.counts)
+
+    def test_memory_does_not_grow_with_observations(self):
+        sketch = QuantileSketch(2)
+        size = sketch.nbytes
+        sketch.add(self.values)
+        self.assertEqual(sketch.nbytes, size)
+
+    def test_zeros_and_merge_layout(self):
+        sketch = QuantileSketch(1)
+        sketch.add(np.array([0.0, 0.0, 0.0, 100.0]))
+        self.assertEqual(sketch.quantiles([0.5])[0, 0], 0.0)
+        self.assertAlmostEqual(sketch.quantiles([1.0])[0, 0], 100.0, delta=0.5)
+        with self.assertRaises(ValueError):
+            sketch.merge(QuantileSketch(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import threading
+import unittest
+
+from data.functionalities.result_cache import ResultCache, SpeculativeScheduler
+
+
+class TestResultCache(unittest.TestCase):
+    def test_lru_eviction_counts_unused_speculative_entries(self):
+        cache = ResultCache(maxsize=2)
+        cache.put("a", 1, speculative=True)
+        cache.put("b", 2)
+        cache.put("c", 3)
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.metrics.speculative_evicted_unused, 1)
+
+    def test_speculative_hit_is_counted_once(self):
+        cache = ResultCache()
+        cache.put("a", 1, speculative=True)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        metrics = cache.metrics.as_dict()
+        self.assertEqual((metrics["hits"], metrics["misses"]), (2, 1))
+        self.assertEqual(metrics["speculative_hits"], 1)
+        self.assertEqual(metrics["speculative_hit_rate"], 1.0)
+
+    def test_speculative_put_does_not_overwrite(self):
+        cache = ResultCache()
+        cache.put("a", "real")
+        cache.put("a", "speculative", speculative=True)
+        self.assertEqual(cache.get("a"), "real")
+
+
+class TestSpeculativeScheduler(unittest.TestCase):
+    def test_idle_scheduler_fills_cache(self):
+        cache = ResultCache()
+        scheduler = SpeculativeScheduler(cache)
+        self.assertTrue(scheduler.schedule("a", lambda: 42))
+        scheduler.wait()
+        self.assertEqual(cache.get("a"), 42)
+        self.assertFalse(scheduler.schedule("a", lambda: 0))  # already cached
+
+    def test_nothing_is_scheduled_under_load(self):
+        scheduler = SpeculativeScheduler(ResultCache())
+        with scheduler.foreground():
+            self.assertFalse(scheduler.schedule("a", lambda: 42))
+        self.assertEqual(scheduler.load, 0)
+
+    def test_rising_load_cancels_queued_work(self):
+        cache = ResultCache()
+        scheduler = SpeculativeScheduler(cache, workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+            return "running"
+
+        scheduler.schedule("running", blocking)
+        started.wait(5)
+        scheduler.schedule("queued", lambda: "queued")
+        with scheduler.foreground():
+            release.set()
+        scheduler.wait()
+
+        self.assertIn("running", cache)
+        self.assertNotIn("queued", cache)
+        self.assertEqual(cache.metrics.speculative_cancelled, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
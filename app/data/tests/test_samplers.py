@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from data.functionalities.samplers import (
+    NormalSampler,
+    ScrambledHalton,
+    inverse_normal_cdf,
+    primes,
+)
+
+
+class TestSamplers(unittest.TestCase):
+    def test_primes(self):
+        self.assertEqual(primes(8).tolist(), [2, 3, 5, 7, 11, 13, 17, 19])
+
+    def test_inverse_normal_cdf(self):
+        u = np.array([0.001, 0.025, 0.5, 0.8413447460685429, 0.999])
+        expected = [-3.090232306167814, -1.959963984540054, 0.0, 1.0, 3.090232306167814]
+        np.testing.assert_allclose(inverse_normal_cdf(u), expected, atol=1e-8)
+
+    def test_scrambled_halton_is_stratified(self):
+        points = ScrambledHalton(4, np.random.default_rng(0)).random(1024)
+        self.assertTrue(np.all((points > 0) & (points < 1)))
+        # base 2: every interval of width 1/1024 holds exactly one point
+        counts = np.bincount((points[:, 0] * 1024).astype(int), minlength=1024)
+        self.assertTrue(np.all(counts == 1))
+
+    def test_halton_continues_across_chunks(self):
+        whole = ScrambledHalton(3, np.random.default_rng(1)).random(100)
+        chunked = ScrambledHalton(3, np.random.default_rng(1))
+        parts = np.vstack([chunked.random(30), chunked.random(70)])
+        np.testing.assert_array_equal(whole, parts)
+
+    def test_antithetic_pairs(self):
+        draws = NormalSampler("antithetic", 5, np.random.default_rng(0)).draw(10)
+        np.testing.assert_array_equal(draws[:5], -draws[5:])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            NormalSampler("sobol", 2, np.random.default_rng(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from data.functionalities.scenario_grid import (
+    AXES,
+    CAREER_START_AGE,
+    ScenarioGrid,
+    build_grid,
+)
+from data.functionalities.simulation_pipeline import CareerBatch
+from data.tests import shared_pipeline
+
+
+class TestScenarioGrid(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = shared_pipeline()
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.grid = build_grid(cls.pipeline, cls.tmp.name, workers=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.grid
+        cls.tmp.cleanup()
+
+    def _exact(self, age, sex, salary, retirement_age, variant):
+        batch = CareerBatch.build(
+            age=age,
+            sex=sex,
+            salary=salary,
+            start_year=2025 - np.asarray(age, dtype=float) + CAREER_START_AGE,
+            retirement_age=retirement_age,
+            variant=variant,
+        )
+        return self.pipeline.run(batch).pension
+
+    def test_values_are_memory_mapped(self):
+        self.assertIsInstance(self.grid.values, np.memmap)
+        self.assertEqual(self.grid.values.shape[:-1], tuple(len(a) for a in AXES.values()))
+        self.assertTrue(self.grid.is_current(self.pipeline))
+
+    def test_on_grid_lookup_is_exact(self):
+        salary = AXES["salary"][10]
+        found = self.grid.lookup([30, 50], ["m", "f"], salary, 65, variant=[1, 3])
+        self.assertTrue(found["on_grid"].all())
+        exact = self._exact([30, 50], ["m", "f"], salary, 65, [1, 3])
+        np.testing.assert_allclose(found["pension"], exact)
+
+    def test_last_axis_points_are_on_grid(self):
+        salary = AXES["salary"][-1]
+        found = self.grid.lookup(AXES["age"][-1], "f", salary, AXES["retirement_age"][-1])
+        self.assertTrue(found["on_grid"].all())
+        np.testing.assert_allclose(found["pension"], self.grid.values[1, 1, -1, -1, -1, 0])
+
+    def test_rebuild_replaces_files_atomically(self):
+        with tempfile.TemporaryDirectory() as path:
+            old = build_grid(self.pipeline, path, workers=0)
+            before = np.array(old.values)
+            new = build_grid(self.pipeline, path, workers=0)
+            # the old mapping still reads its own, complete file
+            np.testing.assert_array_equal(old.values, before)
+            np.testing.assert_array_equal(new.values, before)
+            self.assertEqual(sorted(os.listdir(path)), ["axes.json", "values.npy"])
+            del old, new
+
+    def test_off_grid_lookup_interpolates(self):
+        found = self.grid.lookup(40, "m", 7321.0, 65, variant=2)
+        self.assertFalse(found["on_grid"].any())
+        # pension is linear in salary, so interpolation along that axis alone is exact
+        np.testing.assert_allclose(found["pension"], self._exact(40, "m", 7321.0, 65, 2))
+
+    def test_delays_increase_pension(self):
+        found = self.grid.lookup(45, "f", AXES["salary"][5], 62, variant=2)
+        self.assertGreater(found["pension_delay_1"][0], found["pension"][0])
+        self.assertGreater(found["pension_delay_5"][0], found["pension_delay_2"][0])
+
+    def test_open_missing_directory_returns_none(self):
+        self.assertIsNone(ScenarioGrid.open("does/not/exist"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,9 @@ import os
 import sys
 import unittest
 
-from functionalities.pension_scenarios import ForecastVariant, PensionCalculator
+import numpy as np
+
+from data.functionalities.pension_scenarios import ForecastVariant, PensionCalculator
 
 
 class TestPensionCalculator(unittest.TestCase):
@@ -12,10 +14,10 @@ class TestPensionCalculator(unittest.TestCase):
     def test_init(self):
         """Test that PensionCalculator initializes correctly."""
         self.assertIsInstance(self.calculator, PensionCalculator)
-        # Verify alpha_coefficients are set as class variables
-        self.assertIn(ForecastVariant.REALISTIC, PensionCalculator.alpha_coefficients)
-        self.assertIn(ForecastVariant.PESSIMISTIC, PensionCalculator.alpha_coefficients)
-        self.assertIn(ForecastVariant.OPTIMISTIC, PensionCalculator.alpha_coefficients)
+        # Verify alpha_coefficients are loaded for every variant
+        self.assertIn(ForecastVariant.REALISTIC, self.calculator.alpha_coefficients)
+        self.assertIn(ForecastVariant.PESSIMISTIC, self.calculator.alpha_coefficients)
+        self.assertIn(ForecastVariant.OPTIMISTIC, self.calculator.alpha_coefficients)
 
     def test_year_validation_before_2023(self):
         """Test that years before 2023 raise ValueError."""
@@ -40,15 +42,15 @@ class TestPensionCalculator(unittest.TestCase):
         # Test exact years for each variant
         for variant in ForecastVariant:
             for year in [2030, 2040, 2050, 2060, 2070, 2080]:
-                expected_alpha = PensionCalculator.alpha_coefficients[variant][year]
+                expected_alpha = self.calculator.alpha_coefficients[variant][year]
                 actual_alpha = self.calculator._interpolate_alpha(variant, year)
                 self.assertAlmostEqual(actual_alpha, expected_alpha, places=4)
 
     def test_interpolation_between_years(self):
         """Test interpolation between known years."""
         # Test interpolation between 2030 and 2040
-        alpha_2030 = PensionCalculator.alpha_coefficients[ForecastVariant.REALISTIC][2030]
-        alpha_2040 = PensionCalculator.alpha_coefficients[ForecastVariant.REALISTIC][2040]
+        alpha_2030 = self.calculator.alpha_coefficients[ForecastVariant.REALISTIC][2030]
+        alpha_2040 = self.calculator.alpha_coefficients[ForecastVariant.REALISTIC][2040]
         expected_2035 = alpha_2030 + (alpha_2040 - alpha_2030) * 0.5
 
         actual_2035 = self.calculator._interpolate_alpha(ForecastVariant.REALISTIC, 2035)
@@ -57,8 +59,8 @@ class TestPensionCalculator(unittest.TestCase):
     def test_extrapolation_beyond_2080(self):
         """Test extrapolation beyond 2080 with bounds."""
         # Test that we can extrapolate beyond 2080
-        alpha_2080 = PensionCalculator.alpha_coefficients[ForecastVariant.REALISTIC][2080]
-        alpha_2070 = PensionCalculator.alpha_coefficients[ForecastVariant.REALISTIC][2070]
+        alpha_2080 = self.calculator.alpha_coefficients[ForecastVariant.REALISTIC][2080]
+        alpha_2070 = self.calculator.alpha_coefficients[ForecastVariant.REALISTIC][2070]
 
         # The trend should continue upward
         alpha_2090 = self.calculator._interpolate_alpha(ForecastVariant.REALISTIC, 2090)
@@ -86,7 +88,7 @@ class TestPensionCalculator(unittest.TestCase):
             pension_amount, year, variant
         )
 
-        expected_alpha = PensionCalculator.alpha_coefficients[variant][year]
+        expected_alpha = self.calculator.alpha_coefficients[variant][year]
         expected_pension = pension_amount * expected_alpha
 
         self.assertAlmostEqual(forecasted_pension, expected_pension, places=2)
@@ -122,15 +124,15 @@ class TestPensionCalculator(unittest.TestCase):
 
     def test_before_first_year(self):
         """Test that years before first year use first year's alpha."""
-        alpha = self.calculator._interpolate_alpha(ForecastVariant.REALISTIC, 2025)
-        expected = PensionCalculator.alpha_coefficients[ForecastVariant.REALISTIC][2030]
+        alpha = self.calculator._interpolate_alpha(ForecastVariant.REALISTIC, 2020)
+        expected = self.calculator.alpha_coefficients[ForecastVariant.REALISTIC][2023]
         self.assertEqual(alpha, expected)
 
     def test_all_variants_have_data(self):
         """Test that all forecast variants have complete data."""
         for variant in ForecastVariant:
-            self.assertIn(variant, PensionCalculator.alpha_coefficients)
-            coefficients = PensionCalculator.alpha_coefficients[variant]
+            self.assertIn(variant, self.calculator.alpha_coefficients)
+            coefficients = self.calculator.alpha_coefficients[variant]
             for year in [2030, 2040, 2050, 2060, 2070, 2080]:
                 self.assertIn(year, coefficients)
                 self.assertIsInstance(coefficients[year], float)
@@ -147,6 +149,31 @@ class TestPensionCalculator(unittest.TestCase):
         for i in range(1, len(alphas)):
             self.assertGreaterEqual(alphas[i], alphas[i - 1])
 
+    def test_dense_table_covers_2023_to_2150(self):
+        """Test that alphas are precomputed for every year and variant."""
+        self.assertEqual(self.calculator.alphas.shape, (3, 2150 - 2023 + 1))
+        self.assertAlmostEqual(self.calculator._interpolate_alpha(ForecastVariant.REALISTIC, 2023), 0.71)
+        self.assertAlmostEqual(self.calculator._interpolate_alpha(ForecastVariant.PESSIMISTIC, 2027), 0.60)
+
+    def test_vectorized_forecast_matches_scalar_calls(self):
+        """Test that arrays of amounts and years give the same results as single calls."""
+        amounts = np.array([2500.0, 3000.0, 4200.0, 5100.0])
+        years = np.array([2023, 2041, 2080, 2120])
+        forecast = self.calculator.forecast_pension(amounts, years, ForecastVariant.OPTIMISTIC)
+        single = [
+            self.calculator.forecast_pension(a, y, ForecastVariant.OPTIMISTIC)
+            for a, y in zip(amounts, years)
+        ]
+        np.testing.assert_allclose(forecast.pension, [f.pension for f in single])
+        self.assertEqual(forecast.interpretation, [f.interpretation for f in single])
+
+    def test_vectorized_validation(self):
+        """Test that one invalid entry rejects the whole batch."""
+        with self.assertRaises(ValueError):
+            self.calculator.forecast_pension([3000, 3000], [2030, 2020], ForecastVariant.REALISTIC)
+        with self.assertRaises(ValueError):
+            self.calculator.forecast_pension([3000, 0], 2030, ForecastVariant.REALISTIC)
+
 
 if __name__ == "__main__":
     unittest.main()
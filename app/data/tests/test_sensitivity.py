@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from data.functionalities.sensitivity import (
+    PARAMETERS,
+    SensitivityAnalyzer,
+    load_impacts,
+)
+from data.functionalities.simulation_pipeline import CareerBatch
+from data.tests import DATA_DIR, shared_pipeline
+
+
+class TestSensitivityAnalyzer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = shared_pipeline()
+        cls.analyzer = SensitivityAnalyzer(cls.pipeline, DATA_DIR)
+        cls.career = CareerBatch.build(age=35, sex="f", salary=8000, start_year=2012)
+        cls.tornado = cls.analyzer.tornado(cls.career)
+
+    def test_impacts_are_interpolated_yearly(self):
+        impacts, first_year = load_impacts(np.arange(2023, 2031), DATA_DIR)
+        self.assertEqual(first_year, 2023)
+        wage = impacts[0, PARAMETERS.index("wage_growth"), 0]  # wplywy, +1pp
+        self.assertAlmostEqual(wage[0], 2.0)
+        self.assertAlmostEqual(wage[1], 2.95)
+        self.assertAlmostEqual(wage[-1], 8.8)
+
+    def test_baseline_matches_pipeline(self):
+        result = self.pipeline.run(self.career)
+        self.assertAlmostEqual(self.tornado.pension, result.pension[0])
+        self.assertAlmostEqual(self.tornado.pension_real, result.pension_real[0])
+
+    def test_bars_sorted_by_swing(self):
+        self.assertEqual({bar.parameter for bar in self.tornado.bars}, set(PARAMETERS))
+        swings = [bar.swing for bar in self.tornado.bars]
+        self.assertEqual(swings, sorted(swings, reverse=True))
+
+    def test_directions(self):
+        bars = {bar.parameter: bar for bar in self.tornado.bars}
+        for name in ("wage_growth", "valorization", "collection", "mortality"):
+            self.assertGreater(bars[name].pension["+"], bars[name].pension["-"], name)
+        self.assertLess(bars["unemployment"].pension["+"], bars["unemployment"].pension["-"])
+        # inflation moves the nominal pension far more than the real one
+        nominal = bars["inflation"].pension["+"] / bars["inflation"].pension["-"]
+        real = bars["inflation"].pension_real["+"] / bars["inflation"].pension_real["-"]
+        self.assertLess(abs(real - 1), abs(nominal - 1) / 10)
+
+    def test_single_career_only(self):
+        with self.assertRaises(ValueError):
+            self.analyzer.tornado(self.career.repeat(2))
+
+    def test_real_prices(self):
+        real = self.analyzer.tornado(self.career, prices="real")
+        self.assertAlmostEqual(real.pension, self.tornado.pension_real)
+        for bar in real.bars:
+            for sign in "+-":
+                self.assertAlmostEqual(bar.pension[sign], bar.pension_real[sign])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,15 @@
 import unittest
-from data.src.sick_leave_adjustment import SickLeaveAdjustment, SickLeaveResult
+
+import numpy as np
+
+from data.functionalities.sex_codes import FEMALE, MALE
+from data.functionalities.sick_leave_adjustment import (
+    SickLeaveAdjustment,
+    SickLeaveResult,
+    absence_curves,
+)
+from data.functionalities.simulation_pipeline import CareerBatch
+from data.tests import shared_pipeline
 
 
 class TestSickLeaveAdjustment(unittest.TestCase):
@@ -37,5 +47,49 @@ class TestSickLeaveAdjustment(unittest.TestCase):
         self.assertEqual(result.difference, 333.33)
 
 
+class TestAbsenceCurves(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = shared_pipeline()
+
+    def test_curves(self):
+        curves = absence_curves()
+        self.assertEqual(curves.shape, (2, 101))
+        self.assertTrue(((curves > 0) & (curves < 0.1)).all())
+        self.assertGreater(curves[MALE, 60], curves[MALE, 30])
+        self.assertGreater(curves[FEMALE, 30], curves[MALE, 30])
+
+    def test_timeline_reduced_by_curve_at_each_age(self):
+        batch = CareerBatch.build(
+            age=[40, 40], sex="m", salary=8_000, start_year=2010, sick_leave=[0.0, 1.0]
+        )
+        window = self.pipeline.timeline_window(batch)
+        healthy, sick = self.pipeline.contribution_timeline(batch, window)
+        years = self.pipeline.years[window]
+        worked = healthy > 0
+        age = 40 + years[worked] - 2025
+        np.testing.assert_allclose(sick[worked] / healthy[worked], 1 - absence_curves()[MALE, age])
+
+    def test_career_model_is_milder_than_flat_reduction(self):
+        batch = CareerBatch.build(
+            age=30,
+            sex=["m", "f", "m", "f"],
+            salary=7_000,
+            start_year=2018,
+            sick_leave=[0.0, 0.0, 1.0, 1.0],
+        )
+        pension = self.pipeline.run(batch).pension.reshape(2, 2)
+        ratio = pension[1] / pension[0]
+        self.assertTrue(((ratio > 0.9) & (ratio < 1.0)).all())
+
+    def test_sick_leave_factor_matches_the_pipeline(self):
+        batch = CareerBatch.build(age=30, sex=["m", "f"], salary=7_000, start_year=2018)
+        factor = self.pipeline.sick_leave_factor(batch)
+        exact = self.pipeline.run(batch.with_values(sick_leave=1.0)).capital
+        np.testing.assert_allclose(factor, exact / self.pipeline.run(batch).capital)
+        # the factor depends on the ages worked, not only on a flat rate
+        self.assertGreater(factor[0], factor[1])
+
+
 if __name__ == "__main__":
     unittest.main()
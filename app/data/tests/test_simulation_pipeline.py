@@ -0,0 +1,134 @@
+import unittest
+
+import numpy as np
+
+from data.functionalities.simulation_pipeline import (
+    FEMALE,
+    MALE,
+    CareerBatch,
+    PathAdjustments,
+    sex_code,
+)
+from data.tests import make_pipeline
+
+
+class TestSimulationPipeline(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = make_pipeline()
+
+    def test_sex_code(self):
+        self.assertEqual(sex_code(["m", "f", "k", "x"]).tolist(), [MALE, FEMALE, FEMALE, MALE])
+
+    def test_default_retirement_age_is_statutory(self):
+        batch = CareerBatch.build(age=30, sex=["m", "f"], salary=5000, start_year=2018)
+        self.assertEqual(batch.retirement_age.tolist(), [65.0, 60.0])
+
+    def test_wage_index_is_one_in_current_year(self):
+        col = 2025 - self.pipeline.years[0]
+        np.testing.assert_allclose(self.pipeline.wage_index[:, col], 1.0)
+
+    def test_pension_scales_with_salary(self):
+        batch = CareerBatch.build(age=35, sex="m", salary=[4000, 8000], start_year=2015)
+        pension = self.pipeline.run(batch).pension
+        self.assertAlmostEqual(pension[1] / pension[0], 2.0, places=6)
+
+    def test_pension_increases_with_retirement_age(self):
+        batch = CareerBatch.build(
+            age=40, sex="f", salary=6000, start_year=2010, retirement_age=[60, 60.5, 63, 67]
+        )
+        pension = self.pipeline.run(batch).pension
+        self.assertTrue(np.all(np.diff(pension) > 0))
+
+    def test_capital_matches_contribution_timeline(self):
+        """Without valorization above 1.0 the capital is just the sum of contributions."""
+        self.pipeline.valorization[:] = 1.0
+        self.pipeline.valorization_index[:] = 1.0
+        self.pipeline.valorization_before[:] = 1.0
+        batch = CareerBatch.build(age=30, sex="m", salary=5000, start_year=2020.5)
+        timeline = self.pipeline.contribution_timeline(batch)
+        self.assertAlmostEqual(self.pipeline.capital(batch)[0], timeline.sum(), places=4)
+        # half of 2020 worked
+        col = 2020 - self.pipeline.years[0]
+        expected = 5000 * 0.1952 * 12 * 0.5 * self.pipeline.wage_index[1, col]
+        self.assertAlmostEqual(timeline[0, col], expected, places=6)
+
+    def test_funds_are_valorized(self):
+        batch = CareerBatch.build(age=40, sex="m", salary=0.0, start_year=2025, funds=100_000)
+        self.assertGreater(self.pipeline.run(batch).capital[0], 100_000)
+
+    def test_blocks_end_at_retirement(self):
+        batch = self.pipeline.blocks_to_batch(
+            person=[0, 0, 1],
+            age=[40, 40, 30],
+            sex=["m", "m", "f"],
+            years=[10, 5, 8],
+            salary=[4000, 6000, 5000],
+        )
+        # man aged 40 in 2025 retires in 2050: blocks 2035-2045 and 2045-2050
+        self.assertEqual(batch.start_year.tolist(), [2035, 2045, 2047])
+        self.assertEqual(batch.end_year.tolist(), [2045, 2050, 2055])
+
+    def test_run_grouped_sums_block_capital(self):
+        batch = self.pipeline.blocks_to_batch(
+            person=[0, 0, 1],
+            age=[40, 40, 30],
+            sex=["m", "m", "f"],
+            years=[10, 5, 8],
+            salary=[4000, 6000, 5000],
+        )
+        per_block = self.pipeline.run(batch)
+        grouped = self.pipeline.run_grouped(batch, [0, 0, 1])
+        np.testing.assert_allclose(
+            grouped.capital, [per_block.capital[:2].sum(), per_block.capital[2]]
+        )
+        self.assertAlmostEqual(grouped.last_wage[0], per_block.last_wage[1])
+
+    def test_neutral_adjustments_match_plain_run(self):
+        batch = CareerBatch.build(age=[30, 45], sex=["m", "f"], salary=6000, start_year=2015)
+        ones = np.ones((2, len(self.pipeline.years)))
+        adjustments = PathAdjustments(ones, ones, ones, np.ones(2))
+        plain, adjusted = self.pipeline.run(batch), self.pipeline.run(batch, adjustments)
+        np.testing.assert_allclose(adjusted.pension, plain.pension)
+        np.testing.assert_allclose(adjusted.pension_real, plain.pension_real)
+        np.testing.assert_allclose(adjusted.last_wage, plain.last_wage)
+
+    def test_adjusted_wage_growth_raises_only_that_row(self):
+        batch = CareerBatch.build(age=30, sex="m", salary=6000, start_year=2015).repeat(2)
+        wage = np.ones((2, len(self.pipeline.years)))
+        wage[1, self.pipeline.years > 2025] = 1.01
+        result = self.pipeline.run(batch, PathAdjustments(wage_growth=wage))
+        self.assertGreater(result.pension[1], result.pension[0])
+        self.assertAlmostEqual(result.pension[0], self.pipeline.run(batch).pension[0])
+
+    def test_real_pension_is_deflated(self):
+        result = self.pipeline.run(
+            CareerBatch.build(age=30, sex="m", salary=6000, start_year=2015)
+        )
+        self.assertLess(result.pension_real[0], result.pension[0])
+
+    def test_real_prices_deflate_money_columns(self):
+        batch = CareerBatch.build(age=[30, 50], sex=["m", "f"], salary=6000, start_year=2015)
+        nominal = self.pipeline.run(batch)
+        real = self.pipeline.run(batch, prices="real")
+        np.testing.assert_allclose(real.pension, nominal.pension_real)
+        ratio = real.pension / nominal.pension
+        np.testing.assert_allclose(real.capital, nominal.capital * ratio)
+        np.testing.assert_allclose(real.last_wage, nominal.last_wage * ratio)
+        np.testing.assert_allclose(real.replacement_rate, nominal.replacement_rate)
+
+    def test_price_factor(self):
+        time = np.array([2040.0, 2060.5])
+        np.testing.assert_array_equal(self.pipeline.price_factor(2, time), [1.0, 1.0])
+        batch = CareerBatch.build(age=[40, 20], sex="m", salary=6000, start_year=2015)
+        real = self.pipeline.run(batch, prices="real")
+        nominal = self.pipeline.run(batch)
+        factor = self.pipeline.price_factor(2, self.pipeline.retirement_time(batch), "real")
+        np.testing.assert_allclose(nominal.pension * factor, real.pension)
+        table = self.pipeline.price_factor(2, time[:, None], "real", years_after=[0, 1, 5])
+        self.assertEqual(table.shape, (2, 3))
+        self.assertTrue(np.all(np.diff(table, axis=1) < 0))
+        self.assertAlmostEqual(self.pipeline.price_factor(2, 2026, "real")[()], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
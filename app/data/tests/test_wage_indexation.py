@@ -2,8 +2,12 @@ import os
 import tempfile
 import unittest
 
+import numpy as np
 import pandas as pd
-from functionalities.wage_indexation import WageIndexationEngine
+
+from data.functionalities.valorization_engine import DataPaths, ForecastData
+from data.functionalities.wage_indexation import WageIndexationEngine
+from data.tests import DATA_DIR
 
 
 class TestWageIndexationEngine(unittest.TestCase):
@@ -51,6 +55,41 @@ class TestWageIndexationEngine(unittest.TestCase):
         # 2023: increase 6000/5000 = 1.2 → 4400 * 1.2 = 5280
         self.assertAlmostEqual(projection[2023], 5280.0, places=2)
 
+    def test_projection_stops_at_last_historical_year_without_forecast(self):
+        projection = self.engine.project_user_wages(start_year=2021, base_wage=4000, end_year=2030)
+        self.assertEqual(list(projection), [2021, 2022, 2023])
+        self.assertAlmostEqual(projection[2021], 4000.0, places=2)
+        self.assertAlmostEqual(projection[2023], 4800.0, places=2)
+
+    def test_salary_paths_back_cast_batch(self):
+        years, wages = self.engine.salary_paths(
+            [6000.0, 3000.0], base_year=2023, start_year=[2020, 2022], end_year=2023
+        )
+        self.assertEqual(years.tolist(), [2020, 2021, 2022, 2023])
+        # unfloored history: wages follow the average wage exactly
+        np.testing.assert_allclose(wages[0], [5000.0, 5500.0, 5000.0, 6000.0])
+        np.testing.assert_allclose(wages[1], [0.0, 0.0, 2500.0, 3000.0])
+
+
+class TestWageIndexationForecast(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        paths = DataPaths.default(DATA_DIR)
+        cls.data = ForecastData(paths)
+        cls.engine = WageIndexationEngine(paths.wages_history, cls.data)
+
+    def test_forward_projection_uses_macro_variant(self):
+        years, wages = self.engine.salary_paths(5000.0, 2024, 2024, 2040, variant=[1, 2, 3])
+        self.assertEqual(years[-1], 2040)
+        macro = self.data.load_macro(2).set_index("rok")
+        self.assertAlmostEqual(wages[1, 1] / wages[1, 0], macro.loc[2025, "nominal_wage_factor"])
+        # optimistic variant grows faster than the pessimistic one
+        self.assertGreater(wages[2, -1], wages[1, -1])
+
+    def test_relative_index_is_one_in_base_year(self):
+        index = self.engine.relative_index(2025)
+        np.testing.assert_allclose(index[:, 2025 - self.engine.years[0]], 1.0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data.functionalities.workload import (
+    COLUMNS,
+    MAX_BLOCKS,
+    generate,
+    read_workload,
+    to_batch,
+    to_report_rows,
+    to_requests,
+    write_workload,
+)
+from data.tests import shared_pipeline
+from schemas.simulations import RetirementCalcInput
+
+
+class TestWorkload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_written_workload_is_reproducible(self):
+        first, second = (os.path.join(self.tmp.name, d) for d in ("a", "b"))
+        manifest = write_workload(first, 2_500, seed=5, chunk_size=1_000, fmt="csv")
+        write_workload(second, 2_500, seed=5, chunk_size=1_000, fmt="csv")
+        self.assertEqual(manifest["parts"], ["part-00000.csv", "part-00001.csv", "part-00002.csv"])
+        for name in manifest["parts"]:
+            with open(os.path.join(first, name)) as a, open(os.path.join(second, name)) as b:
+                self.assertEqual(a.read(), b.read())
+
+        chunks = list(read_workload(first))
+        data = pd.concat(chunks)
+        self.assertEqual(tuple(data.columns), COLUMNS)
+        self.assertEqual(len(data), manifest["blocks"])
+        np.testing.assert_array_equal(data["person"].unique(), np.arange(2_500))
+        self.assertLessEqual(data.groupby("person").size().max(), MAX_BLOCKS)
+
+    def test_chunks_are_independent_of_how_many_are_read(self):
+        head = next(generate(10_000, seed=1, chunk_size=1_000))
+        again = next(generate(2_000, seed=1, chunk_size=1_000))
+        pd.testing.assert_frame_equal(head, again)
+
+    def test_careers_fit_before_retirement(self):
+        chunk = next(generate(5_000, seed=2, chunk_size=5_000))
+        career = chunk.groupby("person").agg(years=("years", "sum"), sex=("sex", "first"))
+        limit = np.where(career["sex"] == "f", 60, 65) - 18
+        self.assertTrue((career["years"] <= limit + 0.5).all())
+        self.assertTrue((chunk["years"] > 0).all())
+        self.assertTrue(chunk["contribution_rate"].between(0, 1).all())
+
+    def test_consumers(self):
+        chunk = next(generate(300, seed=3, chunk_size=300))
+        requests = to_requests(chunk)
+        self.assertEqual(len(requests), 300)
+        for body in requests:
+            RetirementCalcInput(**body)
+
+        rows = to_report_rows(chunk)
+        self.assertEqual(len(rows), 300)
+        self.assertEqual(set(rows["sim_type"]), {"PENSION_CALC"})
+
+        pipeline = shared_pipeline()
+        batch, groups = to_batch(pipeline, chunk[chunk["person"] >= 150])
+        sick = chunk.loc[chunk["person"] >= 150, "include_sick"].to_numpy()
+        np.testing.assert_array_equal(batch.sick_leave, sick)
+        result = pipeline.run_grouped(batch, groups)
+        self.assertEqual(len(result.pension), 150)
+        self.assertTrue((result.pension > 0).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
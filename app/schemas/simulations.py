@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Optional
 from pydantic import BaseModel, ConfigDict,Field
 
 
@@ -9,11 +9,16 @@ class RetirementExpectations(BaseModel):
     funds: float = Field(..., ge=0)
     start_year: int = Field(..., ge=1900, le=2100)
     expected_retirement_age: int = Field(..., ge=0, le=120)
+    salary: Optional[float] = Field(None, gt=0)
     
 class RetirementPlan(BaseModel):
    model_config = ConfigDict(from_attributes=True)
    expected_total_funds: float = Field(..., gt=0)
    funds_left_to_collect: float = Field(..., gt=0)
+   forecasted_pension: Optional[float] = None
+   required_retirement_age: Optional[float] = None
+   required_extra_contribution: Optional[float] = None
+   required_salary: Optional[float] = None
    
    
 class WorkBlock(BaseModel):
@@ -34,4 +39,106 @@ class RetirementCalcOutput(BaseModel):
    model_config = ConfigDict(from_attributes=True)
    realistic_retirement_income: float = Field(..., gt=0)
    actual_retirement_income: float = Field(..., gt=0)
-   
\ No newline at end of file
+   
+
+class ScenarioQuery(BaseModel):
+   age: float = Field(..., ge=18, le=70)
+   sex: Literal["f", "m", "x"]
+   salary: float = Field(..., gt=0)
+   retirement_age: float = Field(..., ge=60, le=70)
+   variant: Literal[1, 2, 3] = 2
+
+
+class ScenarioLookup(BaseModel):
+   pension: float
+   replacement_rate: float
+   pension_delays: dict[int, float]
+   interpolated: bool
+
+
+class MonteCarloInput(BaseModel):
+   age: int = Field(..., ge=18, le=70)
+   sex: Literal["f", "m", "x"]
+   salary: float = Field(..., gt=0)
+   start_year: int = Field(..., ge=1950, le=2100)
+   retirement_age: Optional[float] = Field(None, ge=55, le=75)
+   funds: float = Field(0.0, ge=0)
+   variant: Optional[Literal[1, 2, 3]] = None  # None = mix all three variants
+   paths: int = Field(10_000, ge=1_000, le=100_000)
+   seed: Optional[int] = None
+   sampling: Literal["pseudo", "antithetic", "halton"] = "pseudo"
+   fan_chart: bool = False  # streaming mode: per-year balance percentiles in capped memory
+
+
+class FanChartOut(BaseModel):
+   years: list[int]
+   balance: dict[int, list[float]]
+   balance_real: dict[int, list[float]]
+   chunk_size: int
+   peak_memory_bytes: int
+
+
+class SensitivityInput(BaseModel):
+   age: int = Field(..., ge=18, le=70)
+   sex: Literal["f", "m", "x"]
+   salary: float = Field(..., gt=0)
+   start_year: int = Field(..., ge=1950, le=2100)
+   retirement_age: Optional[float] = Field(None, ge=55, le=75)
+   funds: float = Field(0.0, ge=0)
+   variant: Literal[1, 2, 3] = 2
+
+
+class SensitivityBarOut(BaseModel):
+   parameter: str
+   change: str
+   pension: dict[str, float]  # "+" / "-" -> monthly pension (PLN, `prices`)
+   pension_real: dict[str, float]
+   fund_balance_bn: dict[str, float]  # change of the FUS balance in the retirement year
+
+
+class SensitivityOutput(BaseModel):
+   pension: float
+   pension_real: float
+   retirement_year: int
+   bars: list[SensitivityBarOut]  # widest swing first
+
+
+class MonteCarloOutput(BaseModel):
+   paths: int
+   percentiles: dict[str, dict[int, float]]
+   deterministic_pension: float
+   fan_chart: Optional[FanChartOut] = None
+
+
+class ProfileComparisonInput(BaseModel):
+   pension: float = Field(..., gt=0)  # user's monthly pension (PLN, `prices`)
+   sex: Literal["f", "m", "x"]
+   retirement_year: int = Field(..., ge=2000, le=2100)
+   variant: Literal[1, 2, 3] = 2
+
+
+class ProfilePensionOut(BaseModel):
+   key: str
+   description: str
+   pension: float  # monthly pension of the profile (PLN, `prices`)
+   pension_real: float  # same in current-year prices
+   user_ratio: float  # user's pension as % of the profile's
+
+
+class ProfileComparisonOutput(BaseModel):
+   retirement_year: int
+   profiles: list[ProfilePensionOut]  # lowest pension first
+   above: list[str]  # profiles the user's pension exceeds
+
+
+class MacroIndicatorOut(BaseModel):
+   variants: dict[int, list[float]]  # variant -> yearly values
+   min: list[float]
+   max: list[float]
+   mean: list[float]
+   spread: list[float]  # max - min across variants
+
+
+class MacroScenariosOutput(BaseModel):
+   years: list[int]
+   indicators: dict[str, MacroIndicatorOut]